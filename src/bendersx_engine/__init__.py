@@ -1,14 +1,39 @@
-"""BendersX Engine main package."""
-
-from .config import BendersConfig, PlanwirtschaftParams
-from .algorithm import benders_decomposition
-from .benchmark import run_comprehensive_benchmark
-from .deploy import show_deployment_guide
-
-__all__ = [
-    "BendersConfig",
-    "PlanwirtschaftParams",
-    "benders_decomposition",
-    "run_comprehensive_benchmark",
-    "show_deployment_guide",
-]
+"""BendersX Engine main package.
+
+Public names are imported on first access so ``import bendersx_engine`` stays
+cheap for short-lived processes and spawned workers.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+_EXPORTS = {
+    "BendersConfig": "config",
+    "PlanwirtschaftParams": "config",
+    "benders_decomposition": "algorithm",
+    "run_comprehensive_benchmark": "benchmark",
+    "show_deployment_guide": "deploy",
+    "solve_scenarios": "batch",
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:  # pragma: no cover - static analysis only
+    from .config import BendersConfig, PlanwirtschaftParams
+    from .algorithm import benders_decomposition
+    from .benchmark import run_comprehensive_benchmark
+    from .deploy import show_deployment_guide
+    from .batch import solve_scenarios
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -2,15 +2,28 @@
 
 from __future__ import annotations
 
-from typing import Tuple, List, Dict
-import multiprocessing as mp
+import math
+import time
+from typing import Callable, Tuple, List, Dict
 
+from . import kernels
 from .config import BendersConfig
-from .shared_memory import csr_to_shared, cleanup_shared_memory
-from .master import solve_master_problem
-from .subproblem import solve_subproblem_worker
-from .cuts import pareto_select_cuts
-from .partitioning import repartition_blocks
+from .env_detection import probe_capabilities, report_capabilities
+from .executor import SubproblemExecutor
+from .instrumentation import (
+    IterationInfo,
+    PhaseTimer,
+    Tracer,
+    bound_gap,
+    history_dicts,
+    trace_file_name,
+)
+from .master import MasterProblem, solve_master_problem
+from .cuts import CutPool
+from .partitioning import CostPartitioner, column_costs
+from .simple_matrix import as_csr
+from .structural import structural_partition
+from .subproblem_cache import SubproblemCache
 
 
 def benders_decomposition(
@@ -21,84 +34,382 @@ def benders_decomposition(
     B_sparse,
     config: BendersConfig | None = None,
     problem_type: str = "general",
+    executor: SubproblemExecutor | None = None,
+    blocks_metadata: List[Tuple[str, int, int]] | None = None,
+    callback: Callable[[IterationInfo], bool | None] | None = None,
 ) -> Tuple[float, list, List, Dict]:
+    """Run the decomposition loop.
+
+    ``executor`` may be a :class:`SubproblemExecutor` created for the same
+    ``A_sparse``/``B_sparse`` and ``problem_type``; it is then reused instead
+    of sharing the matrices and starting worker processes for this call.
+
+    With ``problem_type="leontief"`` each subproblem computes the gross
+    output of its block by solving ``(I - A_bb) x = B_b^T r`` iteratively
+    (see :class:`~bendersx_engine.leontief.BlockLeontiefSolvers`), using
+    ``config.leontief_method`` and ``config.leontief_tol``.
+    ``blocks_metadata`` sets the initial ``(block_id, start, end)`` partition.
+    By default all ``n`` columns form one block, except with
+    ``use_parallel_subproblems`` where a :class:`CostPartitioner` creates
+    ``n_processes * blocks_per_process`` blocks of equal estimated cost and
+    rebalances them from measured solve times.
+
+    With ``config.structural_partitioning`` the sectors are first reordered
+    by :func:`~bendersx_engine.structural.structural_partition` and cut into
+    ``n_processes * blocks_per_process`` blocks with few coupling edges
+    between them. The solve runs on the permuted matrices; the returned
+    solution is mapped back to the original sector order.
+
+    ``callback`` is called after every iteration with an
+    :class:`~bendersx_engine.instrumentation.IterationInfo`; returning a true
+    value stops the loop. With ``config.instrumentation`` the returned stats
+    also contain per-phase ``timings`` and the bound/gap ``history``.
+    With ``config.trace_path`` set, driver phases and worker-side task
+    events are written there as a Chrome trace (``stats["trace_path"]``).
+    """
     if config is None:
         config = BendersConfig()
 
-    cleanup_shared_memory()
-    A_meta = csr_to_shared("A", A_sparse)
-    B_meta = csr_to_shared("B", B_sparse)
+    with kernels.jit_scope(config.use_numba_jit):
+        tracer = Tracer() if config.trace_path else None
+        A_sparse, B_sparse, blocks_metadata, structure, partitioner = _setup(
+            A_sparse, B_sparse, config, executor, blocks_metadata, problem_type
+        )
+        owns_executor = executor is None
+        if owns_executor:
+            t0 = Tracer.now()
+            executor = SubproblemExecutor.from_matrices(A_sparse, B_sparse, config, problem_type)
+            if tracer is not None:
+                tracer.complete("start_executor", t0, Tracer.now(), "driver")
+        try:
+            executor.set_tracer(tracer)
+            result = _run_benders(
+                n, m0, total_r, config, executor, blocks_metadata, callback, tracer, partitioner
+            )
+        finally:
+            executor.set_tracer(None)
+            if owns_executor:
+                t0 = Tracer.now()
+                executor.close()
+                if tracer is not None:
+                    tracer.complete("close_executor", t0, Tracer.now(), "driver")
+        if tracer is not None:
+            result[3]["trace_path"] = tracer.write(trace_file_name(config.trace_path))
+        if structure is not None:
+            result = _to_original(result, structure)
+        return result
+
+
+def _setup(A_sparse, B_sparse, config, executor=None, blocks_metadata=None, problem_type="general"):
+    """Apply structural reordering and build the partitioner for one session.
+
+    Returns ``(A, B, blocks_metadata, structure, partitioner)``; ``A``/``B``
+    are permuted when ``structure`` is not ``None``.
+    """
+    if config.verbose and config.use_highs_threading:
+        report_capabilities(probe_capabilities())
+    if executor is not None and executor.settings.problem_type != problem_type:
+        raise ValueError(
+            f"executor was built for problem_type={executor.settings.problem_type!r}, "
+            f"not {problem_type!r}"
+        )
+    structure = None
+    if config.structural_partitioning:
+        if executor is not None or blocks_metadata:
+            raise ValueError(
+                "structural_partitioning chooses the blocks and permutes A and B; "
+                "do not pass executor or blocks_metadata"
+            )
+        A_csr, B_csr = as_csr(A_sparse), as_csr(B_sparse)
+        structure = structural_partition(
+            A_csr,
+            config.n_processes * config.blocks_per_process,
+            column_costs(A_csr, B_csr),
+        )
+        A_sparse = A_csr.permuted(structure.perm, structure.perm)
+        B_sparse = B_csr.permuted(None, structure.perm)
+        blocks_metadata = structure.blocks_metadata
+    partitioner = None
+    if config.use_parallel_subproblems:
+        partitioner = CostPartitioner(
+            column_costs(as_csr(A_sparse), as_csr(B_sparse)),
+            config.n_processes,
+            config.blocks_per_process,
+            config.rebalance_tolerance,
+            config.rebalance_min_seconds,
+        )
+        if not blocks_metadata:
+            blocks_metadata = partitioner.initial()
+    return A_sparse, B_sparse, blocks_metadata, structure, partitioner
+
+
+def _to_original(result, structure):
+    obj, x_perm, cuts, stats = result
+    stats["edge_cut"] = structure.edge_cut
+    stats["components"] = structure.n_components
+    return obj, structure.to_original(x_perm), cuts, stats
+
+
+def _run_benders(
+    n, m0, total_r, config, executor, blocks_metadata=None, callback=None, tracer=None,
+    partitioner=None,
+):
+    steps = _benders_steps(
+        n, m0, total_r, config, executor, blocks_metadata, callback, tracer, partitioner
+    )
+    return _drive(steps, executor.map)
+
 
+def _drive(steps, solve):
+    """Run a :func:`_benders_steps` generator, solving its task lists with ``solve``."""
+    try:
+        tasks = next(steps)
+        while True:
+            tasks = steps.send(solve(tasks))
+    except StopIteration as stop:
+        return stop.value
+
+
+def _benders_steps(
+    n, m0, total_r, config, executor, blocks_metadata=None, callback=None, tracer=None,
+    partitioner=None, cache=None, shared_cuts=None,
+):
+    """The decomposition loop as a generator.
+
+    In synchronous mode every iteration yields its task list and expects the
+    results, in task order, to be sent back; the return value is the usual
+    ``(objective, x, cuts, stats)`` tuple. Async mode talks to ``executor``
+    directly and never yields. ``cache`` and ``shared_cuts`` may be shared
+    between several loops on the same ``A``/``B``: subproblem results do not
+    depend on ``total_r``, and optimality cuts pushed to ``shared_cuts`` are
+    imported by every loop at the start of each iteration. The cache and
+    schedule stats only count this loop's lookups and the dispatch rounds it
+    took part in, and ``dynamic_block_weights`` adapts a copy of the block
+    distribution, so interleaved loops do not see each other's state.
+    """
     x_prev = [0.0 for _ in range(n)]
-    blocks_metadata = [("block_0", 0, n)]
+    blocks_metadata = list(blocks_metadata) if blocks_metadata else [("block_0", 0, n)]
     all_cuts: List = []
+    cut_pool = CutPool(
+        max_per_type=4 * config.cut_pool_multiplier,
+        max_per_block=config.cut_max_per_block,
+        max_age=config.cut_max_age,
+    )
+
+    master = MasterProblem(m0, config)
+    if cache is None:
+        cache = SubproblemCache(config.subproblem_cache_size, config.subproblem_cache_tolerance)
+    cache_hits = 0
+    cache_misses = 0
+    block_distribution = config.matrix_gen_params.get("block_distribution")
+    cuts_imported = 0
+    shared_version = 0
+    executor.set_partition(blocks_metadata)
+    use_async = config.async_subproblems
+    # Async mode: block_id -> (start, end, iteration) of tasks still running.
+    in_flight: Dict[str, Tuple[int, int, int]] = {}
+    # block_id -> cache key of the task last dispatched for it
+    task_keys: Dict[str, tuple] = {}
+    # block_id -> (start, end, r_i) of the allocation it was last solved for
+    solved_for: Dict[str, tuple] = {}
+    blocks_solved = 0
+    blocks_skipped = 0
+    diff = 0.0
+    latest: Dict[str, tuple] = {}
+    late_results = 0
+    discarded_results = 0
+    cuts_added = 0
+    cuts_aged_out = 0
+    timer = PhaseTimer(config.instrumentation, tracer)
+    history: List[IterationInfo] = []
+    track_progress = config.instrumentation or callback is not None
+    stopped_early = False
+    t_start = time.perf_counter()
+    # indices of the executor's dispatch rounds this loop took part in
+    rounds: List[int] = []
+
+    def record_rounds(before):
+        rounds.extend(range(before, len(executor.scheduler.makespans)))
+
+    def accept(results, iteration):
+        nonlocal late_results, discarded_results, diff, cuts_added
+        current = {bid: (s, e) for bid, s, e in blocks_metadata}
+        accepted = []
+        for res in results:
+            flight = in_flight.pop(res[0], None)
+            key = task_keys.pop(res[0], None)
+            if flight is not None:
+                start, end, submitted = flight
+                if current.get(res[0]) != (start, end):
+                    # the block was repartitioned while this task was running
+                    discarded_results += 1
+                    continue
+                if submitted < iteration:
+                    late_results += 1
+            else:
+                start, end = current[res[0]]
+            if key is not None:
+                cache.put(key, res)
+            diff += sum(abs(a - b) for a, b in zip(x_prev[start:end], res[2]))
+            x_prev[start:end] = res[2]
+            latest[res[0]] = res
+            accepted.append(res)
+        cuts_added += cut_pool.extend(res[-1] for res in accepted)
+        if shared_cuts is not None:
+            shared_cuts.extend(res[-1] for res in accepted if res[-1] and res[-1][0] == "opt")
 
     iterations_run = 0
     for _ in range(config.max_iterations_per_phase):
         iterations_run += 1
-        x_prev_old = x_prev[:]
-        r_vars, theta = solve_master_problem(
-            blocks_metadata, m0, total_r, all_cuts, config
-        )
-        args_list = []
-        for idx, (block_id, start, end) in enumerate(blocks_metadata):
-            r_i = r_vars[idx]
-            args_list.append(
-                (
-                    block_id,
-                    start,
-                    end,
-                    A_meta,
-                    B_meta,
-                    [0.0] * n,
-                    x_prev,
-                    r_i,
-                    config.__dict__,
-                )
+        diff = 0.0
+        iteration_start = Tracer.now()
+        solved_blocks = blocks_metadata
+        if shared_cuts is not None:
+            fresh = shared_cuts.added_since(shared_version)
+            imported = cut_pool.extend(cut for cut in fresh if cut not in cut_pool)
+            shared_version = shared_cuts.version
+            if imported:
+                cuts_imported += imported
+                all_cuts = cut_pool.select(config.cut_pool_multiplier)
+        with timer.phase("master"):
+            r_vars, theta = solve_master_problem(
+                blocks_metadata, m0, total_r, all_cuts, config, master, block_distribution
             )
-        if config.use_parallel_subproblems:
-            with mp.Pool(processes=config.n_processes) as pool:
-                results = pool.map(solve_subproblem_worker, args_list)
+        with timer.phase("cut_activity"):
+            cuts_aged_out += cut_pool.update_activity(blocks_metadata, r_vars, theta)
+        solved_before = blocks_solved
+        tasks = []
+        cached = []
+        tol = config.convergence_tolerance
+        for idx, (block_id, start, end) in enumerate(blocks_metadata):
+            if block_id in in_flight:
+                continue
+            prev = solved_for.get(block_id)
+            if (
+                prev is not None
+                and prev[:2] == (start, end)
+                and max((abs(a - b) for a, b in zip(prev[2], r_vars[idx])), default=0.0) <= tol
+            ):
+                blocks_skipped += 1
+                continue
+            solved_for[block_id] = (start, end, list(r_vars[idx]))
+            key = cache.key(block_id, start, end, r_vars[idx])
+            hit = cache.get(key)
+            if hit is not None:
+                cache_hits += 1
+                cached.append(hit)
+            else:
+                cache_misses += 1
+                task_keys[block_id] = key
+                tasks.append((block_id, start, end, r_vars[idx]))
+        blocks_solved += len(tasks)
+        accept(cached, iterations_run)
+        if use_async:
+            for block_id, start, end, _ in tasks:
+                in_flight[block_id] = (start, end, iterations_run)
+            with timer.phase("dispatch"):
+                executor.submit(tasks)
+            need = math.ceil(config.async_min_fraction * len(blocks_metadata)) - len(cached)
+            with timer.phase("collect"):
+                before = len(executor.scheduler.makespans)
+                results = executor.collect(max(1 if tasks or in_flight else 0, need))
+                record_rounds(before)
+            accept(results, iterations_run)
         else:
-            results = [solve_subproblem_worker(args) for args in args_list]
-        new_cuts = [res[-1] for res in results if res[-1] is not None]
-        all_cuts.extend(new_cuts)
-        all_cuts = pareto_select_cuts(all_cuts, config.cut_pool_multiplier, config)
-        x_prev = [0.0 for _ in range(n)]
-        for block_id, obj, x_block, *_ in results:
-            for bid, s, e in blocks_metadata:
-                if bid == block_id:
-                    x_prev[s:e] = x_block
-                    break
+            with timer.phase("subproblems"):
+                before = len(executor.scheduler.makespans)
+                results = yield tasks
+                if tasks:
+                    record_rounds(before)
+            accept(results, iterations_run)
+        with timer.phase("cut_selection"):
+            all_cuts = cut_pool.select(config.cut_pool_multiplier)
+
         if config.dynamic_block_weights:
             new_dist = []
-            prev_dist = config.matrix_gen_params.get("block_distribution") or [1.0 for _ in blocks_metadata]
+            prev_dist = block_distribution
+            if not prev_dist or len(prev_dist) != len(blocks_metadata):
+                prev_dist = [1.0 for _ in blocks_metadata]
             for idx, (_, start, end) in enumerate(blocks_metadata):
                 planned = sum(r_vars[idx])
                 produced = sum(x_prev[start:end])
                 ratio = produced / planned if planned > 0 else 1.0
                 weight = 0.5 * prev_dist[idx] + 0.5 * ratio
                 new_dist.append(weight)
-            config.matrix_gen_params["block_distribution"] = new_dist
-        dual_gaps = {
-            bid: theta[idx] - results[idx][1]
-            for idx, (bid, _, _) in enumerate(blocks_metadata)
-        }
-        blocks_metadata = repartition_blocks(blocks_metadata, dual_gaps, n)
-
-        diff = sum(abs(x_prev[i] - x_prev_old[i]) for i in range(n))
-        if diff < config.convergence_tolerance:
+            block_distribution = new_dist
+        with timer.phase("repartition"):
+            if partitioner is not None:
+                blocks_metadata = partitioner.rebalance(blocks_metadata, executor.solve_times)
+            executor.set_partition(blocks_metadata)
+        executor.end_iteration()
+        if tracer is not None:
+            tracer.complete(
+                f"iteration {iterations_run}", iteration_start, Tracer.now(), "driver",
+                {"diff": diff, "blocks": len(solved_blocks)},
+            )
+
+        if track_progress:
+            upper = sum(theta)
+            lower = sum(latest[bid][1] for bid, _, _ in solved_blocks if bid in latest)
+            info = IterationInfo(
+                iterations_run, upper, lower, bound_gap(upper, lower), diff,
+                len(solved_blocks), blocks_solved - solved_before, len(all_cuts),
+                time.perf_counter() - t_start,
+            )
+            if config.instrumentation:
+                history.append(info)
+            if callback is not None and callback(info):
+                stopped_early = True
+                break
+
+        # diff is accumulated per accepted block in accept(); clean blocks add 0
+        if diff < config.convergence_tolerance and not in_flight:
             break
 
-    cleanup_shared_memory()
+    if in_flight:
+        with timer.phase("collect"):
+            before = len(executor.scheduler.makespans)
+            results = executor.collect(len(in_flight))
+            record_rounds(before)
+        accept(results, iterations_run + 1)
+        all_cuts = cut_pool.select(config.cut_pool_multiplier)
+
     total = sum(x_prev)
     unfulfilled = []
-    for idx, (_, start, end) in enumerate(blocks_metadata):
+    for idx, (_, start, end) in enumerate(solved_blocks):
         produced = sum(x_prev[start:end])
         planned = sum(r_vars[idx])
         unfulfilled.append(max(0.0, planned - produced))
 
-    return float(total), x_prev, all_cuts, {
+    stats = {
         "iterations": iterations_run,
         "unfulfilled_demand": unfulfilled,
+        "late_results": late_results,
+        "discarded_results": discarded_results,
+        "blocks_solved": blocks_solved,
+        "blocks_skipped": blocks_skipped,
+        "cache_hits": cache_hits,
+        "cache_misses": cache_misses,
+        "cache_hit_rate": _rate(cache_hits, cache_misses),
+        "cuts_added": cuts_added,
+        "cuts_kept": len(all_cuts),
+        "cuts_duplicate": cut_pool.duplicates,
+        "cuts_evicted": cut_pool.evicted,
+        "cuts_aged_out": cuts_aged_out,
+        "cuts_imported": cuts_imported,
+        "stopped_early": stopped_early,
+        "blocks": len(blocks_metadata),
+        "partition_splits": partitioner.splits if partitioner else 0,
+        "partition_merges": partitioner.merges if partitioner else 0,
+        **executor.scheduler.stats(rounds=rounds),
     }
+    if config.instrumentation:
+        stats["timings"] = timer.as_dict()
+        stats["total_time"] = time.perf_counter() - t_start
+        stats["history"] = history_dicts(history)
+    return float(total), x_prev, all_cuts, stats
+
+
+def _rate(hits: int, misses: int) -> float:
+    total = hits + misses
+    return hits / total if total else 0.0
@@ -0,0 +1,154 @@
+"""Solve many demand scenarios on the same ``A``/``B`` in one session."""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+from . import kernels
+from .algorithm import _benders_steps, _setup, _to_original
+from .config import BendersConfig
+from .cuts import CutPool
+from .executor import SubproblemExecutor
+from .instrumentation import Tracer, trace_file_name
+from .subproblem_cache import SubproblemCache
+
+
+class ScenarioResult(NamedTuple):
+    objective: float
+    x: list
+    cuts: list
+    stats: dict
+
+
+def solve_scenarios(
+    n: int,
+    m0: int,
+    scenarios: Sequence[Sequence[float]],
+    A_sparse,
+    B_sparse,
+    config: BendersConfig | None = None,
+    problem_type: str = "general",
+    executor: SubproblemExecutor | None = None,
+    blocks_metadata: List[Tuple[str, int, int]] | None = None,
+    share_cuts: bool = True,
+    max_active: int | None = None,
+) -> Tuple[List[ScenarioResult], Dict]:
+    """Run :func:`benders_decomposition` for every ``total_r`` in ``scenarios``.
+
+    The matrices are shared and the executor started once for the whole
+    batch. Up to ``max_active`` scenarios (default: all) run interleaved:
+    each round collects the pending subproblem tasks of every active
+    scenario into one dispatch, so the workers stay busy even when a single
+    scenario has fewer blocks than processes.
+
+    Subproblem results do not depend on ``total_r``, so the subproblem cache
+    is shared. With ``share_cuts`` optimality cuts found by any scenario are
+    added to the cut pools of the others; feasibility cuts depend on the
+    allocation they were derived from and stay per scenario.
+
+    All scenarios use the initial partition (``blocks_metadata`` or the cost
+    partitioner's); blocks are not rebalanced within a batch. Async
+    dispatch is not supported since scenarios are interleaved instead.
+
+    Returns one :class:`ScenarioResult` per scenario, in input order, and
+    batch-wide stats.
+    """
+    if config is None:
+        config = BendersConfig()
+    if config.async_subproblems:
+        raise ValueError("solve_scenarios interleaves scenarios; disable async_subproblems")
+    with kernels.jit_scope(config.use_numba_jit):
+        return _solve_scenarios(
+            n, m0, scenarios, A_sparse, B_sparse, config, problem_type, executor,
+            blocks_metadata, share_cuts, max_active,
+        )
+
+
+def _solve_scenarios(
+    n, m0, scenarios, A_sparse, B_sparse, config, problem_type, executor, blocks_metadata,
+    share_cuts, max_active,
+):
+    t_start = time.perf_counter()
+    tracer = Tracer() if config.trace_path else None
+    A_sparse, B_sparse, blocks_metadata, structure, _ = _setup(
+        A_sparse, B_sparse, config, executor, blocks_metadata, problem_type
+    )
+    cache = SubproblemCache(config.subproblem_cache_size, config.subproblem_cache_tolerance)
+    # never aged: activity is only measured against each scenario's own master
+    shared_cuts = None
+    if share_cuts:
+        shared_cuts = CutPool(
+            max_per_type=4 * config.cut_pool_multiplier, max_per_block=config.cut_max_per_block
+        )
+    limit = max_active or len(scenarios)
+
+    owns_executor = executor is None
+    if owns_executor:
+        executor = SubproblemExecutor.from_matrices(A_sparse, B_sparse, config, problem_type)
+    schedule_start = len(executor.scheduler.makespans)
+    results: List[ScenarioResult | None] = [None] * len(scenarios)
+    pending = deque(enumerate(scenarios))
+    # scenario index -> (step generator, tasks it is waiting on)
+    active: Dict[int, tuple] = {}
+    rounds = 0
+    n_tasks = 0
+
+    def advance(idx, steps, value):
+        try:
+            active[idx] = (steps, steps.send(value))
+        except StopIteration as stop:
+            active.pop(idx, None)
+            result = stop.value
+            if structure is not None:
+                result = _to_original(result, structure)
+            results[idx] = ScenarioResult(*result)
+
+    try:
+        executor.set_tracer(tracer)
+        while pending or active:
+            while pending and len(active) < limit:
+                idx, total_r = pending.popleft()
+                steps = _benders_steps(
+                    n, m0, total_r, config, executor, blocks_metadata, None, tracer,
+                    None, cache, shared_cuts,
+                )
+                advance(idx, steps, None)
+            if not active:
+                continue
+            waiting = list(active.items())
+            # scenarios often ask for the same block and allocation; solve it once
+            unique: Dict[tuple, int] = {}
+            tasks = []
+            for _, (_, batch) in waiting:
+                for task in batch:
+                    key = (task[0], task[1], task[2], tuple(task[3]))
+                    if key not in unique:
+                        unique[key] = len(tasks)
+                        tasks.append(task)
+            solved = executor.map(tasks)
+            rounds += 1
+            n_tasks += len(tasks)
+            for idx, (steps, batch) in waiting:
+                answers = [solved[unique[(t[0], t[1], t[2], tuple(t[3]))]] for t in batch]
+                advance(idx, steps, answers)
+    finally:
+        executor.set_tracer(None)
+        if owns_executor:
+            executor.close()
+
+    stats = {
+        "scenarios": len(scenarios),
+        "rounds": rounds,
+        "tasks": n_tasks,
+        "shared_cuts": len(shared_cuts) if shared_cuts is not None else 0,
+        "cache_hits": cache.hits,
+        "cache_misses": cache.misses,
+        "cache_hit_rate": cache.hit_rate,
+        "total_time": time.perf_counter() - t_start,
+        **executor.scheduler.stats(schedule_start),
+    }
+    if tracer is not None:
+        stats["trace_path"] = tracer.write(trace_file_name(config.trace_path))
+    return results, stats
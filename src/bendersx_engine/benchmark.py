@@ -1,10 +1,38 @@
-"""Benchmark helpers."""
+"""Benchmark helpers.
+
+``run_comprehensive_benchmark`` and ``run_planwirtschaft_benchmark`` are quick
+smoke runs. :func:`run_benchmark_suite` sweeps problem sizes, sparsity, block
+counts, problem types and serial/parallel subproblems and emits a JSON report;
+:func:`compare_results` flags regressions against a stored baseline. Both are
+available from the command line::
+
+    python -m bendersx_engine.benchmark run --n 100 1000 --output current.json
+    python -m bendersx_engine.benchmark compare baseline.json current.json
+"""
 
 from __future__ import annotations
 
+import argparse
+import itertools
+import json
+import multiprocessing as mp
+import os
+import platform
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Sequence
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
 from .config import BendersConfig
 from .matrix_generation import generate_sparse_matrices
 from .algorithm import benders_decomposition
+from .executor import SubproblemExecutor
+from .partitioning import uniform_blocks
 
 
 def run_comprehensive_benchmark() -> None:
@@ -28,3 +56,297 @@ def run_planwirtschaft_benchmark() -> None:
         n, m0, total_r, A, B, config, "planwirtschaft"
     )
     print(f"Planwirtschaft objective: {obj:.2f}, cuts: {len(cuts)}")
+
+
+# --------------------------------------------------------------------------
+# Scaling suite
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """One point of a benchmark sweep."""
+
+    n: int
+    m0: int
+    sparsity: float = 0.01
+    blocks: int = 1
+    problem_type: str = "general"
+    parallel: bool = False
+    processes: int | None = None
+    seed: int = 0
+
+    @property
+    def id(self) -> str:
+        mode = f"par{self.processes or ''}" if self.parallel else "ser"
+        return (
+            f"{self.problem_type}-n{self.n}-m{self.m0}-s{self.sparsity:g}"
+            f"-b{self.blocks}-{mode}"
+        )
+
+
+def sweep(
+    n: Sequence[int] = (100, 1000),
+    m0: Sequence[int] = (10,),
+    sparsity: Sequence[float] = (0.01,),
+    blocks: Sequence[int] = (1, 4),
+    problem_type: Sequence[str] = ("general", "leontief", "planwirtschaft"),
+    parallel: Sequence[bool] = (False, True),
+    processes: int | None = None,
+    seed: int = 0,
+) -> List[BenchmarkCase]:
+    """Cartesian product of the given parameter values."""
+    return [
+        BenchmarkCase(n_, m_, s_, b_, p_, par, processes if par else None, seed)
+        for n_, m_, s_, b_, p_, par in itertools.product(
+            n, m0, sparsity, blocks, problem_type, parallel
+        )
+    ]
+
+
+def _peak_rss_kb(who) -> int | None:
+    if resource is None:  # pragma: no cover - Windows
+        return None
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in KiB elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _case_config(case: BenchmarkCase) -> BendersConfig:
+    params = {"planwirtschaft_objective": True} if case.problem_type == "planwirtschaft" else None
+    kwargs = {"n_processes": case.processes} if case.processes else {}
+    return BendersConfig(
+        verbose=False,
+        use_parallel_subproblems=case.parallel,
+        matrix_gen_params=params,
+        **kwargs,
+    )
+
+
+def run_case(case: BenchmarkCase) -> Dict[str, object]:
+    """Run ``case`` once in this process and return its measurements."""
+    phases = {}
+    t0 = time.perf_counter()
+    config = _case_config(case)
+    A, B = generate_sparse_matrices(
+        case.n, case.m0, case.sparsity, case.problem_type, config, seed=case.seed
+    )
+    total_r = [1.0 for _ in range(case.m0)]
+    t1 = time.perf_counter()
+    phases["generate"] = t1 - t0
+
+    executor = SubproblemExecutor.from_matrices(A, B, config, case.problem_type)
+    t2 = time.perf_counter()
+    phases["setup"] = t2 - t1
+    try:
+        obj, _, cuts, stats = benders_decomposition(
+            case.n, case.m0, total_r, A, B, config, case.problem_type,
+            executor=executor, blocks_metadata=uniform_blocks(case.n, case.blocks),
+        )
+        t3 = time.perf_counter()
+        phases["solve"] = t3 - t2
+    finally:
+        executor.close()
+    phases["teardown"] = time.perf_counter() - t3
+
+    solve_time = phases["solve"]
+    nnz = A.nnz + B.nnz
+    return {
+        "id": case.id,
+        "case": asdict(case),
+        "phases": phases,
+        "total_time": sum(phases.values()),
+        "objective": obj,
+        "iterations": stats["iterations"],
+        "blocks_solved": stats["blocks_solved"],
+        "cuts": len(cuts),
+        "nnz": nnz,
+        "subproblems_per_sec": stats["blocks_solved"] / solve_time if solve_time > 0 else None,
+        "nnz_per_sec": nnz * stats["iterations"] / solve_time if solve_time > 0 else None,
+        "peak_rss_kb": _peak_rss_kb(resource.RUSAGE_SELF) if resource else None,
+        "worker_peak_rss_kb": (
+            _peak_rss_kb(resource.RUSAGE_CHILDREN) if resource and case.parallel else None
+        ),
+    }
+
+
+def _case_child(conn, case: BenchmarkCase) -> None:
+    try:
+        conn.send(("ok", run_case(case)))
+    except BaseException as exc:  # pragma: no cover - reported by the parent
+        conn.send(("error", repr(exc)))
+    finally:
+        conn.close()
+
+
+def _run_isolated(case: BenchmarkCase) -> Dict[str, object]:
+    # A fresh process per case keeps caches and the rusage peak per case.
+    ctx = mp.get_context("spawn")
+    parent, child = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_case_child, args=(child, case))
+    proc.start()
+    child.close()
+    try:
+        status, payload = parent.recv()
+    except EOFError:
+        status, payload = "error", f"benchmark process exited with code {proc.exitcode}"
+    proc.join()
+    if status != "ok":
+        raise RuntimeError(f"benchmark case {case.id} failed: {payload}")
+    return payload
+
+
+def _best_of(runs: List[Dict[str, object]]) -> Dict[str, object]:
+    best = min(runs, key=lambda r: r["total_time"])
+    best = dict(best)
+    best["repeats"] = len(runs)
+    best["total_time_all"] = [r["total_time"] for r in runs]
+    return best
+
+
+def run_benchmark_suite(
+    cases: Iterable[BenchmarkCase],
+    repeat: int = 1,
+    isolate: bool = True,
+    output: str | None = None,
+) -> Dict[str, object]:
+    """Run every case ``repeat`` times and keep the fastest run.
+
+    With ``isolate`` each run happens in a freshly spawned process, so peak
+    memory (``ru_maxrss``) and warm caches do not leak between cases. The
+    report is returned and, if ``output`` is given, written there as JSON.
+    """
+    from .env_detection import probe_capabilities
+
+    results = []
+    for case in cases:
+        runs = [
+            _run_isolated(case) if isolate else run_case(case) for _ in range(max(1, repeat))
+        ]
+        results.append(_best_of(runs))
+    report = {
+        "meta": {
+            "timestamp": time.time(),
+            "python": sys.version,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "capabilities": probe_capabilities().as_dict(),
+            "isolated": isolate,
+        },
+        "results": results,
+    }
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+# Metrics where a larger value is a regression, with the absolute change that
+# has to be exceeded as well so that noise on tiny cases is not flagged.
+REGRESSION_METRICS = {
+    "total_time": 1e-3,
+    "phases.solve": 1e-3,
+    "peak_rss_kb": 1024,
+    "iterations": 0,
+}
+
+
+def _metric(result: Dict[str, object], name: str):
+    value = result
+    for part in name.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def compare_results(baseline, current, tolerance: float = 0.2, metrics=None) -> List[Dict[str, object]]:
+    """Return the regressions of ``current`` against ``baseline``.
+
+    Both arguments are reports from :func:`run_benchmark_suite` (or paths to
+    their JSON files). Cases are matched by id; a metric regresses when it
+    grows by more than ``tolerance`` relative to the baseline and by more
+    than its absolute threshold in :data:`REGRESSION_METRICS`.
+    """
+    if isinstance(baseline, str):
+        with open(baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    if isinstance(current, str):
+        with open(current, "r", encoding="utf-8") as f:
+            current = json.load(f)
+    metrics = REGRESSION_METRICS if metrics is None else metrics
+    base = {r["id"]: r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        ref = base.get(result["id"])
+        if ref is None:
+            continue
+        for name, min_abs in metrics.items():
+            old, new = _metric(ref, name), _metric(result, name)
+            if old is None or new is None:
+                continue
+            if new > old * (1.0 + tolerance) and new - old > min_abs:
+                regressions.append({
+                    "id": result["id"],
+                    "metric": name,
+                    "baseline": old,
+                    "current": new,
+                    "ratio": new / old if old else float("inf"),
+                })
+    return regressions
+
+
+def _format_regression(reg: Dict[str, object]) -> str:
+    return (
+        f"REGRESSION {reg['id']} {reg['metric']}: "
+        f"{reg['baseline']:.6g} -> {reg['current']:.6g} (x{reg['ratio']:.2f})"
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bendersx_engine.benchmark")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run a parameter sweep")
+    run.add_argument("--n", type=int, nargs="+", default=[100, 1000])
+    run.add_argument("--m0", type=int, nargs="+", default=[10])
+    run.add_argument("--sparsity", type=float, nargs="+", default=[0.01])
+    run.add_argument("--blocks", type=int, nargs="+", default=[1, 4])
+    run.add_argument(
+        "--problem-type", nargs="+", default=["general", "leontief", "planwirtschaft"],
+        choices=["general", "leontief", "planwirtschaft"],
+    )
+    run.add_argument("--parallel", nargs="+", default=["off", "on"], choices=["off", "on"])
+    run.add_argument("--processes", type=int, default=None)
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--repeat", type=int, default=1)
+    run.add_argument("--no-isolate", action="store_true", help="run cases in this process")
+    run.add_argument("--output", help="write the JSON report to this file")
+    run.add_argument("--baseline", help="compare against this JSON report")
+    run.add_argument("--tolerance", type=float, default=0.2)
+
+    cmp_ = sub.add_parser("compare", help="compare two JSON reports")
+    cmp_.add_argument("baseline")
+    cmp_.add_argument("current")
+    cmp_.add_argument("--tolerance", type=float, default=0.2)
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        cases = sweep(
+            args.n, args.m0, args.sparsity, args.blocks, args.problem_type,
+            [p == "on" for p in args.parallel], args.processes, args.seed,
+        )
+        report = run_benchmark_suite(cases, args.repeat, not args.no_isolate, args.output)
+        if not args.output:
+            print(json.dumps(report, indent=2))
+        if not args.baseline:
+            return 0
+        regressions = compare_results(args.baseline, report, args.tolerance)
+    else:
+        regressions = compare_results(args.baseline, args.current, args.tolerance)
+    for reg in regressions:
+        print(_format_regression(reg), file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":  # pragma: no cover - entry point
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""Block-aware column index over the demand matrix ``B``."""
+
+from __future__ import annotations
+
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+from .simple_matrix import CSRMatrix
+
+
+class BlockSlice(NamedTuple):
+    start: int
+    end: int
+    matrix: CSRMatrix
+    row_sums: List[float]
+
+
+class BlockColumnIndex:
+    """Cache of ``B[:, start:end]`` slices and their row sums per block.
+
+    Slices are keyed by block boundaries. Because blocks of one partition are
+    disjoint, building a slice evicts every cached slice overlapping it, so a
+    rebalance by :class:`partitioning.CostPartitioner` invalidates exactly the
+    blocks whose boundaries moved. A new block lying inside a cached one is
+    cut from that slice rather than from the full matrix.
+    """
+
+    def __init__(self, B: CSRMatrix):
+        self.B = B
+        self._slices: Dict[Tuple[int, int], BlockSlice] = {}
+        self.builds = 0
+
+    def __len__(self) -> int:
+        return len(self._slices)
+
+    def get(self, start: int, end: int) -> BlockSlice:
+        key = (start, end)
+        sl = self._slices.get(key)
+        if sl is None:
+            sl = self._build(start, end)
+        return sl
+
+    def _build(self, start: int, end: int, evict: bool = True) -> BlockSlice:
+        source, offset = self.B, 0
+        overlapping = [k for k in self._slices if k[0] < end and start < k[1]]
+        for key in overlapping:
+            parent = self._slices.pop(key) if evict else self._slices[key]
+            if parent.start <= start and end <= parent.end:
+                source, offset = parent.matrix, parent.start
+        matrix = source.column_slice(start - offset, end - offset)
+        sl = BlockSlice(start, end, matrix, matrix.row_sums())
+        self._slices[(start, end)] = sl
+        self.builds += 1
+        return sl
+
+    def sync(self, blocks_metadata: Sequence[Tuple[str, int, int]]) -> None:
+        """Make the cache match ``blocks_metadata``, rebuilding changed blocks only."""
+        wanted = {(start, end) for _, start, end in blocks_metadata}
+        for start, end in wanted:
+            if (start, end) not in self._slices:
+                self._build(start, end, evict=False)
+        for key in [k for k in self._slices if k not in wanted]:
+            del self._slices[key]
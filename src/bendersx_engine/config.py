@@ -5,9 +5,9 @@ from __future__ import annotations
 import multiprocessing as mp
 import os
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple, FrozenSet
 
-from .env_detection import check_highs_version, detect_gpu_support, setup_numba_cache
+from .env_detection import probe_capabilities, setup_numba_cache
 
 
 @dataclass
@@ -78,6 +78,24 @@ class BendersConfig:
     priority_sector_allocation_factor: float = 1.0
     use_parallel_subproblems: bool = False
     dynamic_block_weights: bool = False
+    master_backend: str = "auto"  # "auto" (HiGHS, else simplex), "highs", "simplex" or "proportional"
+    master_proximal_weight: float = 1e-4
+    cut_max_age: int = 10
+    cut_max_per_block: Optional[int] = 32  # None disables the per-block bound
+    async_subproblems: bool = False
+    async_min_fraction: float = 0.5
+    subproblem_cache_size: int = 128
+    subproblem_cache_tolerance: float = 1e-9
+    blocks_per_process: int = 1
+    pin_blocks: bool = False
+    structural_partitioning: bool = False
+    rebalance_tolerance: float = 0.25
+    rebalance_min_seconds: float = 0.01
+    instrumentation: bool = False
+    trace_path: Optional[str] = None
+    jit_warmup: bool = False
+    leontief_method: str = "gmres"  # "gmres", "jacobi" or "neumann"
+    leontief_tol: float = 1e-8
 
     def __post_init__(self) -> None:
         if self.n_processes is None:
@@ -88,14 +106,14 @@ class BendersConfig:
             if self.verbose:
                 print(f"OpenMP threads: {self.highs_threads}")
 
-        setup_numba_cache()
+        # HiGHS is only probed (and the capability cache written) when the
+        # master first asks for it; Numba and the GPU are cheap checks.
+        caps = probe_capabilities()
+        if self.use_numba_jit and caps.numba:
+            setup_numba_cache(verbose=self.verbose)
 
-        if self.use_first_order_gpu:
-            if not detect_gpu_support():
-                self.use_first_order_gpu = False
-
-        if self.use_highs_threading:
-            check_highs_version()
+        if self.use_first_order_gpu and not caps.gpu:
+            self.use_first_order_gpu = False
 
         if self.matrix_gen_params is None:
             self.matrix_gen_params = {}
@@ -105,6 +123,9 @@ class BendersConfig:
         if self.matrix_gen_params.get("priority_sectors") and self.priority_sector_allocation_factor < 1.0:
             raise ValueError("priority_sector_allocation_factor must be >= 1.0")
 
+        if self.subproblem_cache_tolerance < 0:
+            raise ValueError("subproblem_cache_tolerance must be >= 0")
+
     @staticmethod
     def from_file(path: str) -> "BendersConfig":
         """Load configuration from a JSON file."""
@@ -116,3 +137,84 @@ class BendersConfig:
         if isinstance(params, dict):
             data["matrix_gen_params"] = PlanwirtschaftParams(**params)
         return BendersConfig(**data)
+
+
+def _pairs(mapping) -> Tuple[Tuple[int, float], ...]:
+    if not mapping:
+        return ()
+    return tuple(sorted((int(k), float(v)) for k, v in mapping.items()))
+
+
+def _floats(values) -> Tuple[float, ...] | None:
+    return None if values is None else tuple(float(v) for v in values)
+
+
+def _tiers(values) -> Tuple[Tuple[float, float], ...] | None:
+    return None if not values else tuple((float(t), float(c)) for t, c in values)
+
+
+@dataclass(frozen=True)
+class SubproblemSettings:
+    """Immutable, picklable view of the options read by subproblem workers.
+
+    Built once per solve so that dispatching a task never re-runs the
+    environment probing done in ``BendersConfig.__post_init__``.
+    """
+
+    verbose: bool = False
+    use_numba_jit: bool = True
+    jit_warmup: bool = False
+    convergence_tolerance: float = 1e-6
+    planwirtschaft_objective: bool = False
+    underproduction_penalty: float = 1.0
+    overproduction_penalty: float = 0.0
+    underproduction_penalties: Tuple[float, ...] | None = None
+    overproduction_penalties: Tuple[float, ...] | None = None
+    tiered_underproduction_penalties: Tuple[Tuple[float, float], ...] | None = None
+    tiered_overproduction_penalties: Tuple[Tuple[float, float], ...] | None = None
+    production_bonus: float = 0.0
+    priority_sector_bonus_factor: float = 1.0
+    priority_sectors: FrozenSet[int] = frozenset()
+    societal_bonuses: Tuple[Tuple[int, float], ...] = ()
+    co2_penalties: Tuple[Tuple[int, float], ...] = ()
+    inventory_cost: float = 0.0
+    problem_type: str = "general"
+    use_identity_fast: bool = True
+    leontief_method: str = "gmres"
+    leontief_tol: float = 1e-8
+
+    @staticmethod
+    def from_dict(cfg: Dict) -> "SubproblemSettings":
+        """Build settings from a ``BendersConfig.__dict__``-style mapping."""
+        params = cfg.get("matrix_gen_params") or {}
+        if isinstance(params, PlanwirtschaftParams):
+            params = params.to_dict()
+        return SubproblemSettings(
+            verbose=bool(cfg.get("verbose", False)),
+            use_numba_jit=bool(cfg.get("use_numba_jit", True)),
+            jit_warmup=bool(cfg.get("jit_warmup", False)),
+            convergence_tolerance=float(cfg.get("convergence_tolerance", 1e-6)),
+            planwirtschaft_objective=bool(params.get("planwirtschaft_objective")),
+            underproduction_penalty=float(params.get("underproduction_penalty", 1.0)),
+            overproduction_penalty=float(params.get("overproduction_penalty", 0.0)),
+            underproduction_penalties=_floats(params.get("underproduction_penalties")),
+            overproduction_penalties=_floats(params.get("overproduction_penalties")),
+            tiered_underproduction_penalties=_tiers(params.get("tiered_underproduction_penalties")),
+            tiered_overproduction_penalties=_tiers(params.get("tiered_overproduction_penalties")),
+            production_bonus=float(params.get("production_bonus", 0.0)),
+            priority_sector_bonus_factor=float(params.get("priority_sector_bonus_factor", 1.0)),
+            priority_sectors=frozenset(int(i) for i in params.get("priority_sectors") or ()),
+            societal_bonuses=_pairs(params.get("societal_bonuses")),
+            co2_penalties=_pairs(params.get("co2_penalties")),
+            inventory_cost=float(params.get("inventory_cost", 0.0)),
+            problem_type=str(cfg.get("problem_type", "general")),
+            use_identity_fast=bool(cfg.get("use_identity_fast", True)),
+            leontief_method=str(cfg.get("leontief_method", "gmres")),
+            leontief_tol=float(cfg.get("leontief_tol", 1e-8)),
+        )
+
+    @staticmethod
+    def from_config(config: "BendersConfig | SubproblemSettings") -> "SubproblemSettings":
+        if isinstance(config, SubproblemSettings):
+            return config
+        return SubproblemSettings.from_dict(config.__dict__)
@@ -0,0 +1,139 @@
+"""Array-backed storage for Benders cuts."""
+
+from __future__ import annotations
+
+import operator
+from array import array
+from typing import List, Sequence, Tuple
+
+OPT = 0
+FEAS = 1
+_KINDS = ("opt", "feas")
+
+
+class CutMatrix:
+    """Growable row-major coefficient buffer with rhs, type and block arrays.
+
+    Row ``i`` stores a cut ``(kind, block_id, coeffs, alpha)`` as
+    ``coef[i * m0:(i + 1) * m0]``, ``rhs[i] = alpha``, ``kind[i]`` and an index
+    into a table of block names. Its consumer is :meth:`CutPool.update_activity`
+    (slack-based aging); the master still builds its rows from the selected
+    cut tuples. :meth:`evaluate` loops over the rows in Python, but each inner
+    product runs in C (``map(operator.mul, ...)`` over an array slice) instead
+    of unpacking a cut tuple per row.
+    """
+
+    def __init__(self, m0: int, capacity: int = 16):
+        self.m0 = m0
+        self._capacity = max(1, capacity)
+        self.coef = array("d", [0.0]) * (self._capacity * m0)
+        self.rhs = array("d")
+        self.kind = array("b")
+        self.block = array("i")
+        self.active = array("b")
+        self.block_names: List[str] = []
+        self._block_pos = {}
+
+    def __len__(self) -> int:
+        return len(self.rhs)
+
+    def _grow(self) -> None:
+        self.coef.extend(array("d", [0.0]) * (self._capacity * self.m0))
+        self._capacity *= 2
+
+    def append(self, cut) -> int:
+        """Store ``cut`` and return its row index."""
+        kind, block_id, coeffs, alpha = cut
+        row = len(self.rhs)
+        if row >= self._capacity:
+            self._grow()
+        base = row * self.m0
+        vals = list(coeffs)[: self.m0]
+        self.coef[base:base + len(vals)] = array("d", vals)
+        if len(vals) < self.m0:
+            self.coef[base + len(vals):base + self.m0] = array("d", [0.0]) * (self.m0 - len(vals))
+        pos = self._block_pos.get(block_id)
+        if pos is None:
+            pos = self._block_pos[block_id] = len(self.block_names)
+            self.block_names.append(block_id)
+        self.rhs.append(alpha)
+        self.kind.append(OPT if kind == "opt" else FEAS)
+        self.block.append(pos)
+        self.active.append(1)
+        return row
+
+    def cut(self, row: int) -> Tuple:
+        base = row * self.m0
+        return (
+            _KINDS[self.kind[row]],
+            self.block_names[self.block[row]],
+            list(self.coef[base:base + self.m0]),
+            self.rhs[row],
+        )
+
+    def deactivate(self, row: int) -> None:
+        self.active[row] = 0
+
+    @property
+    def n_active(self) -> int:
+        return sum(self.active)
+
+    def compact(self) -> List[int]:
+        """Drop inactive rows; return the old-to-new row mapping (-1 if dropped)."""
+        mapping = []
+        new = 0
+        m0 = self.m0
+        for row in range(len(self.rhs)):
+            if self.active[row]:
+                if new != row:
+                    self.coef[new * m0:(new + 1) * m0] = self.coef[row * m0:(row + 1) * m0]
+                    self.rhs[new] = self.rhs[row]
+                    self.kind[new] = self.kind[row]
+                    self.block[new] = self.block[row]
+                mapping.append(new)
+                new += 1
+            else:
+                mapping.append(-1)
+        for buf in (self.rhs, self.kind, self.block, self.active):
+            del buf[new:]
+        for row in range(new):
+            self.active[row] = 1
+        return mapping
+
+    def evaluate(
+        self,
+        blocks_metadata: Sequence[Tuple[str, int, int]],
+        r_vars: Sequence[Sequence[float]],
+        theta: Sequence[float],
+    ) -> Tuple[List[float], List[float]]:
+        """Return ``(violations, slacks)`` of every row at ``(r_vars, theta)``.
+
+        For an opt cut the slack is ``alpha + pi . r_b - theta_b``; for a feas
+        cut it is ``alpha - beta . r_b``. Inactive rows and rows whose block is
+        not part of ``blocks_metadata`` get an infinite slack.
+        """
+        index = {bid: idx for idx, (bid, _, _) in enumerate(blocks_metadata)}
+        positions = [index.get(name, -1) for name in self.block_names]
+        m0 = self.m0
+        coef = self.coef
+        mul = operator.mul
+        inf = float("inf")
+        slacks = []
+        for row in range(len(self.rhs)):
+            b = positions[self.block[row]]
+            if b < 0 or not self.active[row]:
+                slacks.append(inf)
+                continue
+            base = row * m0
+            dot = sum(map(mul, coef[base:base + m0], r_vars[b]))
+            if self.kind[row] == OPT:
+                slacks.append(self.rhs[row] + dot - theta[b])
+            else:
+                slacks.append(self.rhs[row] - dot)
+        violations = [-s if s < 0 else 0.0 for s in slacks]
+        return violations, slacks
+
+    def max_violation(self, blocks_metadata, r_vars, theta) -> float:
+        """Largest violation among the rows; a diagnostic, not used by the solver."""
+        violations, _ = self.evaluate(blocks_metadata, r_vars, theta)
+        return max(violations, default=0.0)
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import heapq
 import math
 from .config import BendersConfig
+from .cut_matrix import CutMatrix
 
 
 def _dot(a, b):
@@ -27,10 +29,205 @@ def pareto_select_cuts(cuts_list: list, max_k: int, config: BendersConfig):
     feas_cuts = [c for c in cuts_list if c[0] == "feas"]
     opt_cuts = [c for c in cuts_list if c[0] == "opt"]
 
-    feas_cuts.sort(key=lambda c: abs(c[3]), reverse=True)
-    opt_cuts.sort(key=lambda c: abs(c[3]), reverse=True)
-
     max_feas = max(1, max_k // 3)
     max_opt = max_k - max_feas
 
-    return feas_cuts[:max_feas] + opt_cuts[:max_opt]
+    return heapq.nlargest(max_feas, feas_cuts, key=lambda c: abs(c[3])) + heapq.nlargest(
+        max_opt, opt_cuts, key=lambda c: abs(c[3])
+    )
+
+
+def _top_k(max_heap: list, k: int, alive) -> list:
+    """Return the ``k`` best live entries of a max-heap in O(k log k).
+
+    The heap array is explored best-first from the root with an auxiliary
+    heap, so only the entries that can be among the first ``k`` are visited.
+    """
+    out = []
+    frontier = [(max_heap[0], 0)] if max_heap else []
+    while frontier and len(out) < k:
+        item, idx = heapq.heappop(frontier)
+        if alive(item):
+            out.append(item)
+        for child in (2 * idx + 1, 2 * idx + 2):
+            if child < len(max_heap):
+                heapq.heappush(frontier, (max_heap[child], child))
+    return out
+
+
+def _is_alive(item) -> bool:
+    return item[2].alive
+
+
+class _PoolEntry:
+    __slots__ = ("cut", "key", "score", "seq", "row", "age", "alive")
+
+    def __init__(self, cut, key, score, seq, row):
+        self.cut = cut
+        self.key = key
+        self.score = score
+        self.seq = seq
+        self.row = row
+        self.age = 0
+        self.alive = True
+
+
+class CutPool:
+    """Deduplicating cut pool with bounded heaps and aging eviction.
+
+    * Cuts are hashed on their quantized row scaled to unit max-norm, so
+      positive multiples of a cut share a key. The row of an optimality cut
+      includes its unit ``theta`` coefficient. Duplicates are dropped on
+      insert.
+    * Bounded min-heaps per cut type and per block evict the weakest cut
+      (smallest ``abs(alpha)``, as in :func:`pareto_select_cuts`) on overflow.
+    * :meth:`update_activity` ages cuts that are slack at the current master
+      solution and evicts those inactive for more than ``max_age`` rounds.
+      Slacks come from :meth:`CutMatrix.evaluate` over the pool's rows.
+    * :meth:`select` returns the best cuts per type from max-heaps in
+      O(k log k) instead of sorting the whole pool.
+
+    Heaps use lazy deletion; evicted entries are skipped when popped.
+    """
+
+    def __init__(
+        self,
+        max_per_type: int = 64,
+        max_per_block: int | None = None,
+        max_age: int = 10,
+        tol: float = 1e-9,
+        slack_tol: float = 1e-6,
+    ):
+        self.max_per_type = max_per_type
+        self.max_per_block = max_per_block
+        self.max_age = max_age
+        self.tol = tol
+        self.slack_tol = slack_tol
+        self._entries = {}
+        self._seq = 0
+        self._type_min = {"feas": [], "opt": []}
+        self._type_max = {"feas": [], "opt": []}
+        self._block_min = {}
+        self._type_count = {"feas": 0, "opt": 0}
+        self._block_count = {}
+        self.matrix: CutMatrix | None = None
+        self._rows = []
+        self.duplicates = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self):
+        return (e.cut for e in self._entries.values())
+
+    def __contains__(self, cut) -> bool:
+        return cut is not None and self._key(cut) in self._entries
+
+    def _key(self, cut):
+        kind, block_id, coeffs, alpha = cut
+        vals = list(coeffs) + [alpha]
+        if kind == "opt":
+            vals.append(1.0)  # theta_b <= alpha + pi . r_b
+        scale = max((abs(v) for v in vals), default=0.0) or 1.0
+        vals = [v / scale for v in vals]
+        return kind, block_id, tuple(round(v / self.tol) for v in vals)
+
+    def add(self, cut) -> bool:
+        """Insert ``cut``; return False if it was a duplicate or rejected."""
+        if cut is None:
+            return False
+        key = self._key(cut)
+        if key in self._entries:
+            self.duplicates += 1
+            return False
+        kind, block_id = cut[0], cut[1]
+        if self.matrix is None:
+            self.matrix = CutMatrix(len(cut[2]))
+        self._seq += 1
+        entry = _PoolEntry(cut, key, abs(cut[3]), self._seq, self.matrix.append(cut))
+        self._rows.append(entry)
+        self._entries[key] = entry
+        heapq.heappush(self._type_min[kind], (entry.score, entry.seq, entry))
+        heapq.heappush(self._type_max[kind], (-entry.score, entry.seq, entry))
+        self._type_count[kind] += 1
+        self._block_count[block_id] = self._block_count.get(block_id, 0) + 1
+        heapq.heappush(self._block_min.setdefault(block_id, []), (entry.score, entry.seq, entry))
+        if self._type_count[kind] > self.max_per_type:
+            self._evict_weakest(self._type_min[kind])
+        if self.max_per_block is not None and self._block_count[block_id] > self.max_per_block:
+            self._evict_weakest(self._block_min[block_id])
+        return entry.alive
+
+    def extend(self, cuts) -> int:
+        return sum(1 for cut in cuts if self.add(cut))
+
+    @property
+    def version(self) -> int:
+        """Increases with every inserted cut; see :meth:`added_since`."""
+        return self._seq
+
+    def added_since(self, version: int) -> list:
+        """Cuts still in the pool that were inserted after ``version``."""
+        return [e.cut for e in self._entries.values() if e.seq > version]
+
+    def _evict_weakest(self, heap: list) -> None:
+        while heap:
+            _, _, entry = heapq.heappop(heap)
+            if entry.alive:
+                self._remove(entry)
+                return
+
+    def _remove(self, entry: _PoolEntry) -> None:
+        entry.alive = False
+        self.matrix.deactivate(entry.row)
+        del self._entries[entry.key]
+        self._type_count[entry.cut[0]] -= 1
+        self._block_count[entry.cut[1]] -= 1
+        self.evicted += 1
+        self._compact()
+
+    def _compact(self) -> None:
+        # Rebuild heaps and the cut matrix once dead entries dominate so they
+        # stay O(live size).
+        if len(self._rows) > 2 * max(8, len(self._entries)):
+            mapping = self.matrix.compact()
+            rows = [None] * len(self._entries)
+            for old, entry in enumerate(self._rows):
+                if mapping[old] >= 0:
+                    entry.row = mapping[old]
+                    rows[entry.row] = entry
+            self._rows = rows
+        for heaps in (self._type_min, self._type_max, self._block_min):
+            for name, heap in heaps.items():
+                if len(heap) > 2 * max(8, len(self._entries)):
+                    live = [item for item in heap if item[2].alive]
+                    heapq.heapify(live)
+                    heaps[name] = live
+
+    def update_activity(self, blocks_metadata, r_vars, theta) -> int:
+        """Age cuts that are slack at ``(r_vars, theta)`` and evict stale ones.
+
+        Returns the number of evicted cuts.
+        """
+        if self.matrix is None:
+            return 0
+        _, slacks = self.matrix.evaluate(blocks_metadata, r_vars, theta)
+        stale = []
+        for entry in self._entries.values():
+            entry.age = entry.age + 1 if slacks[entry.row] > self.slack_tol else 0
+            if entry.age > self.max_age:
+                stale.append(entry)
+        for entry in stale:
+            self._remove(entry)
+        return len(stale)
+
+    def select(self, max_k: int) -> list:
+        """Best ``max_k`` cuts, split between types like :func:`pareto_select_cuts`."""
+        if len(self._entries) <= max_k:
+            return sorted((e.cut for e in self._entries.values()), key=lambda c: c[0] != "feas")
+        max_feas = max(1, max_k // 3)
+        max_opt = max_k - max_feas
+        feas = _top_k(self._type_max["feas"], max_feas, _is_alive)
+        opt = _top_k(self._type_max["opt"], max_opt, _is_alive)
+        return [item[2].cut for item in feas] + [item[2].cut for item in opt]
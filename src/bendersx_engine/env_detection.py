@@ -1,41 +1,98 @@
-"""Environment and capability detection utilities."""
+"""Environment and capability detection utilities.
+
+Optional backends are resolved lazily: ``env_detection.highspy`` imports
+``highspy`` on first access and ``NUMBA_AVAILABLE`` only looks the package up
+without importing it. :func:`probe_capabilities` is the single place that
+decides which optional backends are used: the config, the master LP, the
+kernels and the executor all consult it. Its cheap checks (Numba lookup, GPU,
+shared memory) run once per process; HiGHS is only probed when one of its
+fields is first read, and that result is cached on disk, keyed by the
+interpreter, this package's installed files and the install location of
+``highspy``.
+"""
 
 from __future__ import annotations
 
+import importlib.util
+import json
 import os
 import shutil
+import sys
+from dataclasses import asdict, dataclass
+
+_MISSING = object()
+_highspy = _MISSING
+_capabilities: "Capabilities | None" = None
+_highs_values: dict | None = None
+_use_disk_cache = True
+_reported = False
+
+
+def _load_highspy():
+    global _highspy
+    if _highspy is _MISSING:
+        try:
+            import highspy  # type: ignore
+        except ImportError:  # pragma: no cover - highspy is optional
+            highspy = None
+        _highspy = highspy
+    return _highspy
+
+
+def _has_module(name: str) -> bool:
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):  # pragma: no cover - broken installs
+        return False
+
 
-try:
-    import highspy  # type: ignore
-except ImportError:  # pragma: no cover - highspy is optional
-    highspy = None
+def __getattr__(name: str):
+    if name == "highspy":
+        return _load_highspy()
+    if name == "NUMBA_AVAILABLE":
+        return _has_module("numba")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-try:
-    import numba  # type: ignore
+def _highs_version() -> str | None:
+    highspy = _load_highspy()
+    if highspy is None:
+        return None
+    try:
+        return str(highspy.Highs().versionNumber())
+    except Exception:  # pragma: no cover - version detection may fail
+        return None
 
-    NUMBA_AVAILABLE = True
-except ImportError:  # pragma: no cover - numba is optional
-    NUMBA_AVAILABLE = False
+
+def _highs_threading(version: str | None) -> bool:
+    if version is None:
+        return False
+    try:
+        return int(version.split(".")[1]) >= 8
+    except (IndexError, ValueError):  # pragma: no cover - unexpected format
+        return False
 
 
 def check_highs_version() -> bool:
     """Check HiGHS version for multi-threading support."""
-    if highspy is None:
+    if _load_highspy() is None:
         print("HiGHS not installed")
         return False
 
-    try:
-        version = highspy.Highs().versionNumber()
-        major, minor = version.split(".")[:2]
-        if int(minor) < 8:
-            print(f"HiGHS {version} detected. Upgrade recommended")
-            return False
-        print(f"HiGHS {version} detected")
-        return True
-    except Exception as exc:  # pragma: no cover - version detection may fail
-        print(f"Could not detect HiGHS version: {exc}")
+    version = _highs_version()
+    if version is None:  # pragma: no cover - version detection may fail
+        print("Could not detect HiGHS version")
         return False
+    if not _highs_threading(version):
+        print(f"HiGHS {version} detected. Upgrade recommended")
+        return False
+    print(f"HiGHS {version} detected")
+    return True
+
+
+def gpu_available() -> bool:
+    """Quiet check for a CUDA device: a visible device list and ``nvidia-smi``."""
+    return os.getenv("CUDA_VISIBLE_DEVICES", "") != "" and shutil.which("nvidia-smi") is not None
 
 
 def detect_gpu_support() -> bool:
@@ -50,10 +107,166 @@ def detect_gpu_support() -> bool:
     return False
 
 
-def setup_numba_cache() -> None:
+def setup_numba_cache(verbose: bool = True) -> None:
     """Ensure Numba cache directory exists."""
-    if NUMBA_AVAILABLE and "NUMBA_CACHE_DIR" not in os.environ:
+    if "NUMBA_CACHE_DIR" not in os.environ and _has_module("numba"):
         cache_dir = os.path.expanduser("~/.numba_cache")
         os.environ["NUMBA_CACHE_DIR"] = cache_dir
         os.makedirs(cache_dir, exist_ok=True)
-        print(f"Numba cache directory: {cache_dir}")
+        if verbose:
+            print(f"Numba cache directory: {cache_dir}")
+
+
+def shared_memory_available() -> bool:
+    """Whether :mod:`multiprocessing.shared_memory` segments can be created."""
+    try:
+        from multiprocessing import shared_memory
+
+        shm = shared_memory.SharedMemory(create=True, size=1)
+    except (ImportError, OSError):  # pragma: no cover - e.g. no /dev/shm
+        return False
+    shm.close()
+    shm.unlink()
+    return True
+
+
+@dataclass(frozen=True)
+class Capabilities:
+    """Result of :func:`probe_capabilities`.
+
+    The HiGHS properties are probed on first access, so consulting the
+    capabilities for Numba, the GPU or shared memory never imports
+    ``highspy``.
+    """
+
+    numba: bool
+    gpu: bool
+    shared_memory: bool
+
+    @property
+    def highs(self) -> bool:
+        return bool(_highs_probe()["highs"])
+
+    @property
+    def highs_version(self) -> str | None:
+        return _highs_probe()["highs_version"]
+
+    @property
+    def highs_threading(self) -> bool:
+        return bool(_highs_probe()["highs_threading"])
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), **_highs_probe()}
+
+
+def _package_stamp() -> str:
+    # Reinstalling the package rewrites its files; a stat is much cheaper
+    # than importing ``importlib.metadata`` in every process.
+    try:
+        return f"{__file__}:{os.stat(__file__).st_mtime_ns}"
+    except OSError:  # pragma: no cover - zipped install
+        return __file__
+
+
+def _cache_key() -> dict:
+    origins = {}
+    for name in ("highspy",):
+        try:
+            spec = importlib.util.find_spec(name)
+        except (ImportError, ValueError):  # pragma: no cover - broken installs
+            spec = None
+        origins[name] = spec.origin if spec is not None else None
+    return {
+        "executable": sys.executable,
+        "python": sys.version,
+        "package": _package_stamp(),
+        "origins": origins,
+    }
+
+
+def capability_cache_path() -> str:
+    """File holding the cached probe; set ``BENDERSX_CACHE_DIR`` to relocate it."""
+    root = os.environ.get("BENDERSX_CACHE_DIR") or os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "bendersx_engine"
+    )
+    return os.path.join(root, "capabilities.json")
+
+
+def _read_cache(path: str, key: dict) -> dict | None:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("key") != key:
+        return None
+    return data.get("capabilities")
+
+
+def _write_cache(path: str, key: dict, values: dict) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "capabilities": values}, f)
+        os.replace(tmp, path)
+    except OSError:  # pragma: no cover - read-only home, full disk, ...
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def _highs_probe() -> dict:
+    global _highs_values
+    if _highs_values is not None:
+        return _highs_values
+    values = key = path = None
+    if _use_disk_cache:
+        key = _cache_key()
+        path = capability_cache_path()
+        values = _read_cache(path, key)
+    if values is None or "highs" not in values:
+        version = _highs_version()
+        values = {
+            "highs": _load_highspy() is not None,
+            "highs_version": version,
+            "highs_threading": _highs_threading(version),
+        }
+        if _use_disk_cache:
+            _write_cache(path, key, values)
+    _highs_values = values
+    return values
+
+
+def probe_capabilities(refresh: bool = False, use_disk_cache: bool = True) -> Capabilities:
+    """Return the available optional backends.
+
+    Numba, GPU and shared memory are checked once per process. The HiGHS
+    fields are probed on first access and cached for the process and, with
+    ``use_disk_cache``, in :func:`capability_cache_path`; ``refresh`` redoes
+    all checks.
+    """
+    global _capabilities, _highs_values, _use_disk_cache
+    if _capabilities is not None and not refresh:
+        return _capabilities
+    if refresh:
+        _highs_values = None
+    _use_disk_cache = use_disk_cache
+    _capabilities = Capabilities(_has_module("numba"), gpu_available(), shared_memory_available())
+    return _capabilities
+
+
+def report_capabilities(caps: Capabilities) -> None:
+    """Print a one-line summary of ``caps`` once per process."""
+    global _reported
+    if _reported:
+        return
+    _reported = True
+    if caps.highs_version is None:
+        print("HiGHS not installed")
+    elif caps.highs_threading:
+        print(f"HiGHS {caps.highs_version} detected")
+    else:
+        print(f"HiGHS {caps.highs_version} detected. Upgrade recommended")
+
@@ -0,0 +1,423 @@
+"""Long-lived executor for subproblem tasks."""
+
+from __future__ import annotations
+
+import dataclasses
+import itertools
+import multiprocessing as mp
+import os
+import pickle
+import queue
+import time
+from multiprocessing import util
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+from . import kernels
+from .block_index import BlockColumnIndex
+from .config import BendersConfig, SubproblemSettings
+from .instrumentation import Tracer, now_us, trace_event
+from .leontief import BlockLeontiefSolvers
+from .scheduler import TaskScheduler
+from .env_detection import probe_capabilities
+from .shared_memory import (
+    cleanup_shared_memory,
+    csr_from_shared,
+    csr_to_local,
+    csr_to_shared,
+    release_shared,
+)
+from .subproblem import SubproblemInput, solve_subproblem, solve_subproblems
+
+# Per-process state populated once by the pool initializer.
+_worker_state: Dict[str, object] = {}
+
+
+def _make_state(A_meta: dict, B_meta: dict, settings: SubproblemSettings) -> Dict[str, object]:
+    if settings.use_numba_jit and settings.jit_warmup:
+        with kernels.jit_scope(True):
+            kernels.warm_up()
+    A = csr_from_shared(A_meta)
+    B = csr_from_shared(B_meta)
+    leontief = None
+    if settings.problem_type == "leontief":
+        leontief = BlockLeontiefSolvers.from_settings(A, settings)
+    return {
+        "A_meta": A_meta,
+        "B_meta": B_meta,
+        "A": A,
+        "B": B,
+        "B_index": BlockColumnIndex(B),
+        "leontief": leontief,
+        "settings": settings,
+    }
+
+
+def _close_worker() -> None:
+    _worker_state.clear()
+    cleanup_shared_memory()
+
+
+def _init_worker(A_meta: dict, B_meta: dict, settings: SubproblemSettings) -> None:
+    _worker_state.clear()
+    kernels.set_jit(settings.use_numba_jit)
+    _worker_state.update(_make_state(A_meta, B_meta, settings))
+    # Detach before interpreter shutdown; otherwise spawned workers try to
+    # close segments whose views are still alive and report BufferError.
+    util.Finalize(None, _close_worker, exitpriority=10)
+
+
+def _input(task: Tuple, state: Dict[str, object]) -> SubproblemInput:
+    block_id, start, end, r_i = task
+    return SubproblemInput(
+        block_id, start, end, state["A_meta"], state["B_meta"], (), (), r_i, state["settings"]
+    )
+
+
+def _run_task(task: Tuple, state: Dict[str, object] | None = None):
+    """Solve a single ``(block_id, start, end, r_i)`` task."""
+    if state is None:
+        state = _worker_state
+    return solve_subproblem(
+        _input(task, state), state["A"], state["B"], state["B_index"], state["leontief"]
+    )
+
+
+class _TimedResult(NamedTuple):
+    result: tuple
+    seconds: float  # wall time of the solve in the process that ran it
+    pid: int
+
+
+def _run_timed(task: Tuple, state: Dict[str, object] | None = None) -> _TimedResult:
+    t0 = time.perf_counter()
+    result = _run_task(task, state)
+    return _TimedResult(result, time.perf_counter() - t0, os.getpid())
+
+
+def _run_batch(tasks: List[Tuple], state: Dict[str, object] | None = None) -> List[_TimedResult]:
+    """Solve several tasks in one call; their objectives are scored as one batch."""
+    if state is None:
+        state = _worker_state
+    seconds: List[float] = []
+    results = solve_subproblems(
+        [_input(task, state) for task in tasks],
+        state["A"], state["B"], state["B_index"], state["leontief"], seconds,
+    )
+    pid = os.getpid()
+    return [_TimedResult(res, sec, pid) for res, sec in zip(results, seconds)]
+
+
+class _TracedResult(NamedTuple):
+    payload: bytes  # pickled result, so serialization shows up in the trace
+    events: List[dict]
+
+
+def _run_traced(job: Tuple, state: Dict[str, object] | None = None) -> _TracedResult:
+    """Worker side of a traced task: time unpickling, solving and pickling."""
+    seq, submitted, task_bytes = job
+    t0 = now_us()
+    task = pickle.loads(task_bytes)
+    t1 = now_us()
+    result = _run_task(task, state)
+    t2 = now_us()
+    payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+    t3 = now_us()
+    block = {"block": task[0], "columns": task[2] - task[1], "task": seq}
+    events = [
+        trace_event("unpickle_task", t0, t1, "serialization", {"bytes": len(task_bytes)}),
+        trace_event(f"solve {task[0]}", t1, t2, "subproblem", block),
+        trace_event("pickle_result", t2, t3, "serialization", {"bytes": len(payload)}),
+        {"queue": (seq, submitted, t0)},
+    ]
+    return _TracedResult(payload, events)
+
+
+class SubproblemExecutor:
+    """Dispatch subproblem tasks to a pool that lives across iterations.
+
+    The worker initializer attaches the shared matrices and stores the frozen
+    :class:`SubproblemSettings` once per process, so each task only carries
+    the block boundaries and its master allocation. With
+    ``config.use_parallel_subproblems`` disabled tasks run in-process through
+    the same code path. An executor may be passed to several
+    ``benders_decomposition`` calls on the same ``A``/``B``.
+
+    Tasks are dispatched by a :class:`TaskScheduler` in
+    longest-expected-first order using the measured solve times. With
+    ``config.pin_blocks`` every worker gets its own single-process pool and
+    blocks stay on the worker (and its cached column slices) that solved
+    them before, unless that would unbalance the iteration.
+
+    ``problem_type="leontief"`` makes every worker solve its diagonal block
+    of ``(I - A) x = B_b^T r`` with a warm-started :class:`LeontiefSolver`.
+    """
+
+    def __init__(
+        self,
+        A_meta: dict,
+        B_meta: dict,
+        config: BendersConfig,
+        owns_shared: bool = False,
+        problem_type: str = "general",
+    ):
+        self.A_meta = A_meta
+        self.B_meta = B_meta
+        self.config = config
+        self.settings = dataclasses.replace(
+            SubproblemSettings.from_config(config), problem_type=problem_type
+        )
+        self._owns_shared = owns_shared
+        self._pool = None
+        self._state: Dict[str, object] | None = None
+        self._done: queue.Queue = queue.Queue()
+        self.pending = 0
+        self.tracer: Tracer | None = None
+        # block_id -> measured solve time of its latest task, in seconds
+        self.solve_times: Dict[str, float] = {}
+        self._seq = itertools.count()
+        self._pinned_pools: List = []
+        self._columns: Dict[str, int] = {}
+        self._batch_busy: Dict[int, float] = {}
+        # perf_counter() at which the current async round started
+        self._round_start: float | None = None
+        initargs = (A_meta, B_meta, self.settings)
+        if config.use_parallel_subproblems and config.pin_blocks:
+            self._pinned_pools = [
+                mp.Pool(processes=1, initializer=_init_worker, initargs=initargs)
+                for _ in range(config.n_processes)
+            ]
+        elif config.use_parallel_subproblems:
+            self._pool = mp.Pool(
+                processes=config.n_processes, initializer=_init_worker, initargs=initargs
+            )
+        else:
+            self._state = _make_state(A_meta, B_meta, self.settings)
+        self.scheduler = TaskScheduler(config.n_processes if self.parallel else 1)
+
+    @classmethod
+    def from_matrices(
+        cls, A, B, config: BendersConfig, problem_type: str = "general"
+    ) -> "SubproblemExecutor":
+        """Share ``A`` and ``B`` and build an executor owning the segments.
+
+        The matrices go to shared memory only when a worker pool will read
+        them and the capability probe found shared memory usable; otherwise
+        they stay in-process (and workers receive pickled copies).
+        """
+        share = config.use_parallel_subproblems and probe_capabilities().shared_memory
+        to_meta = csr_to_shared if share else csr_to_local
+        A_meta = to_meta("A", A)
+        B_meta = to_meta("B", B)
+        return cls(A_meta, B_meta, config, owns_shared=True, problem_type=problem_type)
+
+    @classmethod
+    def from_problem(
+        cls, problem, config: BendersConfig, problem_type: str = "general"
+    ) -> "SubproblemExecutor":
+        """Build an executor whose workers map the file behind ``problem``.
+
+        ``problem`` is a :class:`~bendersx_engine.problem_io.Problem`; it
+        keeps owning the mapping and must stay open while the executor runs.
+        """
+        return cls(problem.A_meta, problem.B_meta, config, problem_type=problem_type)
+
+    @property
+    def parallel(self) -> bool:
+        return self._pool is not None or bool(self._pinned_pools)
+
+    def set_partition(self, blocks_metadata) -> None:
+        """Announce new block boundaries.
+
+        The in-process index is synced eagerly; pool workers rebuild their
+        cached slices lazily when a task with new boundaries arrives.
+        """
+        if self._state is not None:
+            self._state["B_index"].sync(blocks_metadata)
+        self.scheduler.forget(bid for bid, _, _ in blocks_metadata)
+
+    def end_iteration(self) -> None:
+        """Close the scheduler's per-iteration timing record."""
+        self.scheduler.end_iteration()
+
+    def set_tracer(self, tracer: Tracer | None) -> None:
+        """Record trace events for the following tasks (``None`` stops tracing)."""
+        self.tracer = tracer
+
+    def _traced_job(self, task: Tuple) -> Tuple:
+        t0 = now_us()
+        task_bytes = pickle.dumps(task, protocol=pickle.HIGHEST_PROTOCOL)
+        self.tracer.complete(
+            "pickle_task", t0, now_us(), "serialization", {"block": task[0], "bytes": len(task_bytes)}
+        )
+        return next(self._seq), now_us(), task_bytes
+
+    def _record(self, block_id: str, seconds: float, pid: int) -> None:
+        self.solve_times[block_id] = seconds
+        self.scheduler.record(block_id, seconds, self._columns.get(block_id))
+        self._batch_busy[pid] = self._batch_busy.get(pid, 0.0) + seconds
+
+    def _unwrap(self, res):
+        if isinstance(res, _TimedResult):
+            self._record(res.result[0], res.seconds, res.pid)
+            return res.result
+        events = []
+        for event in res.events:
+            if "queue" in event:
+                seq, submitted, started = event["queue"]
+                pid = res.events[0]["pid"]
+                self.tracer.async_span("queue_wait", seq, submitted, started, "queue", pid)
+            else:
+                events.append(event)
+        self.tracer.extend(events)
+        t0 = now_us()
+        out = pickle.loads(res.payload)
+        self.tracer.complete("unpickle_result", t0, now_us(), "serialization", {"block": out[0]})
+        solve = res.events[1]
+        self._record(out[0], solve["dur"] / 1e6, solve["pid"])
+        return out
+
+    def _prepare(self, tasks: List[Tuple]):
+        for task in tasks:
+            self._columns[task[0]] = task[2] - task[1]
+        fn = _run_traced if self.tracer is not None else _run_timed
+        job = self._traced_job if self.tracer is not None else (lambda task: task)
+        return fn, job
+
+    def _placement(self, tasks: List[Tuple]) -> List[Tuple[object, List[int]]]:
+        """``(pool, task indices)`` pairs in dispatch order."""
+        if self._pinned_pools:
+            plan = self.scheduler.assign(tasks)
+            return list(zip(self._pinned_pools, plan))
+        return [(self._pool, self.scheduler.order(tasks))]
+
+    def map(self, tasks: Iterable[Tuple]) -> List:
+        """Solve ``tasks`` and return their results in task order.
+
+        Untraced tasks are sent in groups (all of them in-process, one group
+        per pinned worker, one per scheduler chunk otherwise) that each
+        worker solves with a single :func:`solve_subproblems` call, so their
+        objectives are evaluated as one batch.
+        """
+        tasks = list(tasks)
+        if not tasks:
+            return []
+        fn, job = self._prepare(tasks)
+        self._batch_busy = {}
+        start = time.perf_counter()
+        batched = self.tracer is None
+        if not self.parallel:
+            with kernels.jit_scope(self.settings.use_numba_jit):
+                if batched:
+                    raw = _run_batch(tasks, self._state)
+                else:
+                    raw = [fn(job(task), self._state) for task in tasks]
+        elif self._pinned_pools:
+            raw = [None] * len(tasks)
+            if batched:
+                handles = [
+                    (idxs, pool.apply_async(_run_batch, ([tasks[i] for i in idxs],)))
+                    for pool, idxs in self._placement(tasks)
+                    if idxs
+                ]
+                for idxs, handle in handles:
+                    for i, res in zip(idxs, handle.get()):
+                        raw[i] = res
+            else:
+                handles = {}
+                for pool, idxs in self._placement(tasks):
+                    for i in idxs:
+                        handles[i] = pool.apply_async(fn, (job(tasks[i]),))
+                raw = [handles[i].get() for i in range(len(tasks))]
+        else:
+            order = self.scheduler.order(tasks)
+            chunk = self.scheduler.chunksize(tasks)
+            raw = [None] * len(tasks)
+            if batched:
+                groups = [order[k : k + chunk] for k in range(0, len(order), chunk)]
+                jobs = [[tasks[i] for i in idxs] for idxs in groups]
+                for idxs, out in zip(groups, self._pool.imap(_run_batch, jobs)):
+                    for i, res in zip(idxs, out):
+                        raw[i] = res
+            else:
+                for i, res in zip(order, self._pool.imap(fn, [job(tasks[i]) for i in order], chunk)):
+                    raw[i] = res
+        results = [self._unwrap(res) for res in raw]
+        self.scheduler.record_batch(time.perf_counter() - start, self._batch_busy, len(tasks))
+        return results
+
+    def submit(self, tasks: Iterable[Tuple]) -> int:
+        """Queue tasks without waiting; results are returned by :meth:`collect`."""
+        tasks = list(tasks)
+        if not tasks:
+            return 0
+        fn, job = self._prepare(tasks)
+        if self._round_start is None:
+            self._round_start = time.perf_counter()
+        if self.parallel:
+            for pool, idxs in self._placement(tasks):
+                for i in idxs:
+                    pool.apply_async(
+                        fn, (job(tasks[i]),), callback=self._done.put, error_callback=self._done.put
+                    )
+        else:
+            with kernels.jit_scope(self.settings.use_numba_jit):
+                for task in tasks:
+                    try:
+                        self._done.put(fn(job(task), self._state))
+                    except Exception as exc:  # surfaced by collect like pool errors
+                        self._done.put(exc)
+        self.pending += len(tasks)
+        return len(tasks)
+
+    def collect(self, min_results: int = 1) -> List:
+        """Return finished results in completion order.
+
+        Blocks until at least ``min_results`` results (capped at the number of
+        pending tasks) are available, then also drains any others that have
+        already completed. Each call that returns results is one dispatch
+        round for the scheduler's makespan and utilization; the round spans
+        from the first submit (or the previous round's end) to this return.
+        """
+        out = []
+        want = min(min_results, self.pending)
+        self._batch_busy = {}
+        while self.pending:
+            try:
+                res = self._done.get(block=len(out) < want)
+            except queue.Empty:
+                break
+            self.pending -= 1
+            if isinstance(res, BaseException):
+                raise res
+            out.append(self._unwrap(res))
+        if out:
+            now = time.perf_counter()
+            start = self._round_start if self._round_start is not None else now
+            wall = now - start
+            # tasks may have started in an earlier round; count only this one
+            busy = {pid: min(b, wall) for pid, b in self._batch_busy.items()}
+            self.scheduler.record_batch(wall, busy, len(out))
+            self._round_start = now if self.pending else None
+        return out
+
+    def close(self) -> None:
+        for pool in [self._pool, *self._pinned_pools]:
+            if pool is not None:
+                pool.close()
+                pool.join()
+        self._pool = None
+        self._pinned_pools = []
+        if self._state is not None:
+            release_shared(self.A_meta)
+            release_shared(self.B_meta)
+            self._state = None
+        if self._owns_shared:
+            release_shared(self.A_meta)
+            release_shared(self.B_meta)
+            self._owns_shared = False
+
+    def __enter__(self) -> "SubproblemExecutor":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,169 @@
+"""Phase timers, per-iteration progress records and execution traces.
+
+:class:`Tracer` collects Chrome trace events (the JSON format read by
+``chrome://tracing`` and https://ui.perfetto.dev). Timestamps come from
+``time.perf_counter_ns``, a system-wide monotonic clock, so events recorded in
+worker processes line up with the driver's without clock adjustment.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from typing import Dict, List, NamedTuple
+
+_NULL = nullcontext()
+_solve_ids = itertools.count(1)
+
+
+class IterationInfo(NamedTuple):
+    """Progress passed to the ``callback`` of ``benders_decomposition``.
+
+    ``upper_bound`` is the master objective ``sum(theta)``, ``lower_bound``
+    the sum of the latest subproblem objectives and ``gap`` their difference
+    relative to ``max(1, |upper_bound|)``.
+    """
+
+    iteration: int
+    upper_bound: float
+    lower_bound: float
+    gap: float
+    diff: float
+    n_blocks: int
+    blocks_solved: int
+    cuts: int
+    elapsed: float
+
+
+class _Phase:
+    __slots__ = ("timer", "name", "start")
+
+    def __init__(self, timer: "PhaseTimer", name: str):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        elapsed = end - self.start
+        tracer = self.timer.tracer
+        if tracer is not None:
+            tracer.complete(self.name, self.start * 1e6, end * 1e6, "driver")
+        totals = self.timer.totals
+        totals[self.name] = totals.get(self.name, 0.0) + elapsed
+        counts = self.timer.counts
+        counts[self.name] = counts.get(self.name, 0) + 1
+        return False
+
+
+class PhaseTimer:
+    """Accumulate wall time per named phase.
+
+    ``with timer.phase("master"): ...`` adds the elapsed monotonic time to
+    ``totals["master"]`` and, with a ``tracer``, records the span as a trace
+    event. A disabled timer hands out one shared ``nullcontext``, so
+    instrumented code pays a method call and nothing else.
+    """
+
+    def __init__(self, enabled: bool = True, tracer: "Tracer | None" = None):
+        self.enabled = enabled or tracer is not None
+        self.tracer = tracer
+        self.totals: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+
+    def phase(self, name: str):
+        if not self.enabled:
+            return _NULL
+        return _Phase(self, name)
+
+    def as_dict(self) -> Dict[str, float]:
+        return dict(self.totals)
+
+
+def bound_gap(upper: float, lower: float) -> float:
+    return (upper - lower) / max(1.0, abs(upper))
+
+
+def history_dicts(history: List[IterationInfo]) -> List[Dict[str, float]]:
+    return [info._asdict() for info in history]
+
+
+def now_us() -> float:
+    """Trace clock in microseconds."""
+    return time.perf_counter_ns() / 1000.0
+
+
+def trace_event(name: str, start: float, end: float, cat: str, args: dict | None = None) -> dict:
+    """Complete (``"X"``) event for the calling process and thread."""
+    event = {
+        "name": name,
+        "cat": cat,
+        "ph": "X",
+        "ts": start,
+        "dur": max(0.0, end - start),
+        "pid": os.getpid(),
+        "tid": threading.get_native_id(),
+    }
+    if args:
+        event["args"] = args
+    return event
+
+
+class Tracer:
+    """Collect trace events from the driver and its workers.
+
+    Worker processes build events with :func:`trace_event` and ship them back
+    with their results; :meth:`extend` merges them. :meth:`write` adds process
+    and thread names and emits a Chrome trace-event JSON file.
+    """
+
+    def __init__(self):
+        self.events: List[dict] = []
+        self.driver_pid = os.getpid()
+
+    now = staticmethod(now_us)
+
+    def complete(self, name: str, start: float, end: float, cat: str, args: dict | None = None) -> None:
+        self.events.append(trace_event(name, start, end, cat, args))
+
+    def async_span(self, name: str, span_id: int, start: float, end: float, cat: str,
+                   pid: int, args: dict | None = None) -> None:
+        """Span that may overlap others, e.g. tasks waiting in the pool queue."""
+        begin = {"name": name, "cat": cat, "ph": "b", "id": span_id, "ts": start, "pid": pid, "tid": 0}
+        if args:
+            begin["args"] = args
+        self.events.append(begin)
+        self.events.append(
+            {"name": name, "cat": cat, "ph": "e", "id": span_id, "ts": end, "pid": pid, "tid": 0}
+        )
+
+    def extend(self, events) -> None:
+        self.events.extend(events)
+
+    def to_dict(self) -> dict:
+        names = []
+        for pid in sorted({e["pid"] for e in self.events} | {self.driver_pid}):
+            label = "driver" if pid == self.driver_pid else f"worker {pid}"
+            names.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": label}})
+        events = sorted(self.events, key=lambda e: e["ts"])
+        return {"traceEvents": names + events, "displayTimeUnit": "ms"}
+
+    def write(self, path: str) -> str:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+        return path
+
+
+def trace_file_name(pattern: str) -> str:
+    """Expand ``{pid}`` and ``{solve}`` (a per-process solve counter) in ``pattern``."""
+    return pattern.format(pid=os.getpid(), solve=next(_solve_ids))
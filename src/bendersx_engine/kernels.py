@@ -0,0 +1,353 @@
+"""Hot loops, compiled with Numba when it is available.
+
+Every kernel is written once as plain Python over indexable buffers. When
+JIT compilation is enabled (``BendersConfig.use_numba_jit``) and Numba is
+installed, the same functions are compiled with ``@njit(cache=True)`` on
+first use; otherwise they run as they are. Numba itself is imported only at
+that point, so importing this module stays cheap.
+
+The public wrappers accept lists, ``array`` objects and the memoryviews of
+shared matrices alike. In compiled mode lists are converted to ``array('d')``
+and outputs are written into preallocated arrays, since Numba cannot build
+Python lists efficiently. :func:`warm_up` compiles (or loads from the on-disk
+cache) all kernels ahead of the first iteration.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from array import array
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence
+
+
+# ----------------------------------------------------------------------
+# kernel sources (valid Python and valid Numba nopython code)
+# ----------------------------------------------------------------------
+def _csr_matvec(data, indices, indptr, x, out):
+    for i in range(len(indptr) - 1):
+        s = 0.0
+        for k in range(indptr[i], indptr[i + 1]):
+            s += data[k] * x[indices[k]]
+        out[i] = s
+
+
+def _row_sums(data, indices, indptr, start, end, out):
+    for i in range(len(indptr) - 1):
+        hi = indptr[i + 1]
+        # first position of row i at or after column ``start``
+        lo = indptr[i]
+        top = hi
+        while lo < top:
+            mid = (lo + top) // 2
+            if indices[mid] < start:
+                lo = mid + 1
+            else:
+                top = mid
+        s = 0.0
+        while lo < hi and indices[lo] < end:
+            s += data[lo]
+            lo += 1
+        out[i] = s
+
+
+def _column_sums(data, indices, out):
+    for k in range(len(data)):
+        out[indices[k]] += data[k]
+
+
+def _cap_columns(data, indices, sums, max_sum):
+    for k in range(len(data)):
+        s = sums[indices[k]]
+        if s >= max_sum:
+            data[k] *= max_sum / s
+
+
+def _dot(a, b):
+    s = 0.0
+    for i in range(len(b)):
+        s += a[i] * b[i]
+    return s
+
+
+def _linear_objective(linear, bonus, under, over, produced, planned, out):
+    """Linear objective terms of stacked pairs; pair ``q`` spans ``[q*m, (q+1)*m)``."""
+    m = len(linear)
+    for q in range(len(out)):
+        base = q * m
+        total = 0.0
+        for i in range(m):
+            p = produced[base + i]
+            r = planned[base + i]
+            dev = r - p
+            if dev > 0:
+                total += linear[i] * p + bonus[i] * p
+                total -= under[i] * dev
+            else:
+                total += linear[i] * p + bonus[i] * r
+                total += over[i] * dev
+        out[q] = total
+
+
+def _tier_costs(breakpoints, cumulative, coeffs, a, b, m, out):
+    """Subtract from ``out[q]`` the tier cost of ``a[i] - b[i]`` over pair ``q``'s rows."""
+    for q in range(len(out)):
+        total = 0.0
+        for i in range(q * m, (q + 1) * m):
+            dev = a[i] - b[i]
+            if dev <= 0:
+                continue
+            lo = 0
+            hi = len(breakpoints)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if dev < breakpoints[mid]:
+                    hi = mid
+                else:
+                    lo = mid + 1
+            k = lo - 1
+            total += cumulative[k] + (dev - breakpoints[k]) * coeffs[k]
+        out[q] -= total
+
+
+def _power_step(data, indices, indptr, y, shift, out):
+    """``out = |A| y + shift * y`` scaled to a maximum of one.
+
+    Returns the smallest and largest quotient ``out_i / y_i`` before scaling.
+    Entries are kept above ``1e-300`` so ``y`` stays strictly positive.
+    """
+    lo = math.inf
+    hi = 0.0
+    top = 0.0
+    for i in range(len(indptr) - 1):
+        s = shift * y[i]
+        for k in range(indptr[i], indptr[i + 1]):
+            s += abs(data[k]) * y[indices[k]]
+        q = s / y[i]
+        if q < lo:
+            lo = q
+        if q > hi:
+            hi = q
+        if s > top:
+            top = s
+        out[i] = s
+    for i in range(len(out)):
+        out[i] = max(out[i] / top, 1e-300)
+    return lo, hi
+
+
+_SOURCES = {
+    "csr_matvec": _csr_matvec,
+    "row_sums": _row_sums,
+    "column_sums": _column_sums,
+    "cap_columns": _cap_columns,
+    "dot": _dot,
+    "linear_objective": _linear_objective,
+    "tier_costs": _tier_costs,
+    "power_step": _power_step,
+}
+
+# ----------------------------------------------------------------------
+# dispatch
+# ----------------------------------------------------------------------
+_jit_requested = True
+_jit_available: bool | None = None
+_compiled: Dict[str, object] = {}
+
+
+def set_jit(enabled: bool) -> None:
+    """Switch compiled kernels on or off for this process."""
+    global _jit_requested
+    _jit_requested = bool(enabled)
+
+
+@contextmanager
+def jit_scope(enabled: bool) -> Iterator[None]:
+    """Switch compiled kernels on or off until the ``with`` block exits.
+
+    Solves apply ``use_numba_jit`` this way, so the flag of one config does
+    not leak into code run later with another.
+    """
+    previous = _jit_requested
+    set_jit(enabled)
+    try:
+        yield
+    finally:
+        set_jit(previous)
+
+
+def jit_enabled() -> bool:
+    """Whether kernels currently run compiled."""
+    global _jit_available
+    if not _jit_requested:
+        return False
+    if _jit_available is None:
+        from . import env_detection
+
+        _jit_available = env_detection.probe_capabilities().numba
+    return _jit_available
+
+
+def _kernel(name: str):
+    if not jit_enabled():
+        return _SOURCES[name]
+    fn = _compiled.get(name)
+    if fn is None:
+        from numba import njit  # type: ignore
+
+        fn = _compiled[name] = njit(cache=True)(_SOURCES[name])
+    return fn
+
+
+def _floats(values: Sequence[float]):
+    if isinstance(values, (array, memoryview)):
+        return values
+    return array("d", values)
+
+
+def _zeros(n: int, jit: bool):
+    return array("d", bytes(8 * n)) if jit else [0.0] * n
+
+
+# ----------------------------------------------------------------------
+# public wrappers
+# ----------------------------------------------------------------------
+def csr_matvec(data, indices, indptr, x: Sequence[float]) -> List[float]:
+    """``A @ x`` over CSR buffers in O(nnz)."""
+    jit = jit_enabled()
+    out = _zeros(len(indptr) - 1, jit)
+    _kernel("csr_matvec")(data, indices, indptr, _floats(x) if jit else x, out)
+    return out.tolist() if jit else out
+
+
+def row_sums(data, indices, indptr, n_cols: int, start: int = 0, end: int | None = None) -> List[float]:
+    """Row sums restricted to columns ``[start, end)``; rows must be sorted."""
+    if end is None or end > n_cols:
+        end = n_cols
+    rows = len(indptr) - 1
+    if jit_enabled():
+        out = _zeros(rows, True)
+        _kernel("row_sums")(data, indices, indptr, start, end, out)
+        return out.tolist()
+    # bisect and a C-level slice sum beat the kernel source in plain Python
+    sums = []
+    for i in range(rows):
+        lo, hi = indptr[i], indptr[i + 1]
+        if start > 0:
+            lo = bisect_left(indices, start, lo, hi)
+        if end < n_cols:
+            hi = bisect_left(indices, end, lo, hi)
+        sums.append(sum(data[lo:hi]))
+    return sums
+
+
+def column_sums(data, indices, n_cols: int) -> List[float]:
+    jit = jit_enabled()
+    out = _zeros(n_cols, jit)
+    _kernel("column_sums")(data, indices, out)
+    return out.tolist() if jit else out
+
+
+def normalize_column_sums(data, indices, n_cols: int, max_sum: float) -> None:
+    """Scale, in place, every column whose sum is at least ``max_sum`` down to it."""
+    jit = jit_enabled()
+    sums = _zeros(n_cols, jit)
+    _kernel("column_sums")(data, indices, sums)
+    _kernel("cap_columns")(data, indices, sums, max_sum)
+
+
+def block_demand(row_sums: Sequence[float], r: Sequence[float]) -> float:
+    """``sum(row_sums[i] * r[i])``: demand a block places on its allocation."""
+    if jit_enabled():
+        return _kernel("dot")(_floats(row_sums), _floats(r))
+    return _dot(row_sums, r)
+
+
+def penalty_objective(
+    linear: Sequence[float],
+    bonus: Sequence[float],
+    under: Sequence[float],
+    over: Sequence[float],
+    produced: Sequence[float],
+    planned: Sequence[float],
+    under_tiers: tuple | None = None,
+    over_tiers: tuple | None = None,
+) -> float:
+    """Planwirtschaft objective of ``produced`` against ``planned``.
+
+    ``under_tiers``/``over_tiers`` are ``(breakpoints, cumulative, coeffs)``
+    tables whose cost is charged on top of the linear terms, as in
+    :class:`objective.PlanwirtschaftObjective`.
+    """
+    m = len(linear)
+    if m == 0:
+        return 0.0
+    return penalty_objectives(
+        linear, bonus, under, over, produced[:m], planned[:m], under_tiers, over_tiers
+    )[0]
+
+
+def penalty_objectives(
+    linear: Sequence[float],
+    bonus: Sequence[float],
+    under: Sequence[float],
+    over: Sequence[float],
+    produced: Sequence[float],
+    planned: Sequence[float],
+    under_tiers: tuple | None = None,
+    over_tiers: tuple | None = None,
+) -> List[float]:
+    """:func:`penalty_objective` of many pairs in one kernel call.
+
+    ``produced`` and ``planned`` stack the pairs row after row, each pair
+    taking ``len(linear)`` entries; one objective value is returned per pair.
+    """
+    m = len(linear)
+    k = len(produced) // m if m else 0
+    jit = jit_enabled()
+    conv = _floats if jit else (lambda v: v)
+    produced, planned = conv(produced), conv(planned)
+    out = _zeros(k, jit)
+    _kernel("linear_objective")(
+        conv(linear), conv(bonus), conv(under), conv(over), produced, planned, out
+    )
+    tier_costs = _kernel("tier_costs")
+    if under_tiers is not None:
+        tier_costs(*(conv(t) for t in under_tiers), planned, produced, m, out)
+    if over_tiers is not None:
+        tier_costs(*(conv(t) for t in over_tiers), produced, planned, m, out)
+    return out.tolist() if jit else out
+
+
+def power_step(data, indices, indptr, y, shift: float, out) -> tuple:
+    """One step of shifted power iteration; ``y`` and ``out`` are ``array('d')``."""
+    return _kernel("power_step")(data, indices, indptr, y, shift, out)
+
+
+def warm_up() -> float:
+    """Compile every kernel for the argument types used in a solve.
+
+    Returns the seconds spent, ``0.0`` when kernels run as plain Python.
+    Shared matrices hand out memoryviews while local ones use ``array``
+    objects, and Numba specialises on both, so both variants are compiled.
+    """
+    if not jit_enabled():
+        return 0.0
+    t0 = time.perf_counter()
+    for wrap in (lambda a: a, memoryview):
+        data = wrap(array("d", [1.0, 2.0]))
+        indices = wrap(array("i", [0, 1]))
+        indptr = wrap(array("i", [0, 1, 2]))
+        csr_matvec(data, indices, indptr, [1.0, 1.0])
+        row_sums(data, indices, indptr, 2, 1, 2)
+        column_sums(data, indices, 2)
+        normalize_column_sums(array("d", [1.0, 2.0]), indices, 2, 10.0)
+        block_demand(data, [1.0, 1.0])
+        power_step(data, indices, indptr, array("d", [1.0, 1.0]), 0.5, array("d", [0.0, 0.0]))
+    table = (array("d", [0.0, 1.0]), array("d", [0.0, 1.0]), array("d", [1.0, 2.0]))
+    ones = [1.0, 1.0]
+    penalty_objective(ones, ones, ones, ones, ones, [2.0, 0.0], table, table)
+    penalty_objective(ones, ones, ones, ones, ones, [2.0, 0.0])
+    return time.perf_counter() - t0
@@ -0,0 +1,530 @@
+"""Incremental LP backends used by the master problem.
+
+Both backends solve ``max c.x`` subject to linear rows and ``0 <= x <= upper``
+(upper bounds default to infinity and are changed with ``set_upper``). Rows
+are given as ``(coeffs, sense, rhs)`` with ``coeffs`` a ``{column: value}``
+mapping and ``sense`` one of ``"<="``, ``">="`` or ``"="``. Models stay alive
+between ``solve`` calls: rows appended afterwards are added to the existing
+model and the next solve starts from the previous optimal basis.
+
+``add_rows`` returns one handle per row. Handles stay valid until the row is
+passed to ``remove_rows`` and can be used with ``set_rhs`` to change the
+right-hand side without rebuilding the model.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+from . import env_detection
+
+Row = Tuple[Dict[int, float], str, float]
+
+INF = float("inf")
+# pivot column entries below this are round-off and are zeroed
+_DROP = 1e-12
+
+
+class LPResult(NamedTuple):
+    status: str  # "optimal", "infeasible", "unbounded", "time_limit" or "error"
+    x: List[float]
+    objective: float
+
+
+class LPBackend:
+    """Interface shared by the master LP backends."""
+
+    name = "base"
+
+    def __init__(
+        self,
+        costs: Sequence[float],
+        threads: int = 1,
+        time_limit: float = INF,
+        upper: Sequence[float] | None = None,
+    ):
+        self.n_cols = len(costs)
+        self.threads = threads
+        self.time_limit = time_limit
+        self.upper = [INF] * self.n_cols if upper is None else [float(u) for u in upper]
+
+    def add_rows(self, rows: Sequence[Row]) -> List[int]:
+        raise NotImplementedError
+
+    def remove_rows(self, handles: Sequence[int]) -> None:
+        raise NotImplementedError
+
+    def set_rhs(self, handle: int, rhs: float) -> None:
+        raise NotImplementedError
+
+    def set_upper(self, col: int, upper: float) -> None:
+        raise NotImplementedError
+
+    def solve(self) -> LPResult:
+        raise NotImplementedError
+
+
+class SimplexBackend(LPBackend):
+    """Pure-Python bounded-variable tableau simplex with warm starts.
+
+    Every row gets one slack column: ``>=`` rows are stored negated and the
+    slack of an ``=`` row is fixed at zero. Column upper bounds are handled by
+    the ratio tests, so they cost no rows. ``beta`` holds the values of the
+    basic columns; nonbasic columns sit at zero or at their upper bound.
+
+    After an optimal solve the tableau stays dual feasible, so appended rows
+    only need a few dual simplex pivots. When a solve starts neither primal nor
+    dual feasible, nonbasic columns move to the bound their reduced cost
+    prefers, remaining wrong-signed reduced costs are clipped to zero, the
+    dual simplex restores primal feasibility and the primal simplex finishes
+    with the true costs.
+
+    Changing a right-hand side or an upper bound moves ``beta`` along one
+    tableau column, which keeps the basis dual feasible. A row is removed by
+    pivoting its slack into the basis (if it is not basic already) and
+    deleting that tableau row together with the slack column.
+    """
+
+    name = "simplex"
+
+    def __init__(
+        self,
+        costs: Sequence[float],
+        threads: int = 1,
+        time_limit: float = INF,
+        upper: Sequence[float] | None = None,
+        tol: float = 1e-9,
+        max_pivots: int = 100000,
+    ):
+        super().__init__(costs, threads, time_limit, upper)
+        self.tol = tol
+        self.max_pivots = max_pivots
+        # internal minimisation of -c.x; slack columns cost nothing
+        self._cost = [-float(c) for c in costs]
+        self._upper = self.upper[:]
+        # rows not yet in the tableau: handle -> [coeffs, rhs, is equality]
+        self._pending: Dict[int, list] = {}
+        self.T: List[List[float]] = []
+        self.basis: List[int] = []
+        self.beta: List[float] = []  # values of the basic columns
+        self.d: List[float] = self._cost[:]
+        self._at_upper: set = set()  # nonbasic columns at their upper bound
+        self.pivots = 0
+        self._sign: Dict[int, float] = {}  # handle -> -1.0 for ">=" rows
+        self._slack: Dict[int, int] = {}  # handle -> slack column
+        self._rhs: Dict[int, float] = {}  # handle -> rhs of the stored row
+        self._next_handle = 0
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.T) + len(self._pending)
+
+    def add_rows(self, rows: Sequence[Row]) -> List[int]:
+        handles = []
+        for coeffs, sense, rhs in rows:
+            if sense not in ("<=", ">=", "="):
+                raise ValueError(f"unknown row sense {sense!r}")
+            sign = -1.0 if sense == ">=" else 1.0
+            handle = self._next_handle
+            self._next_handle += 1
+            value = sign * float(rhs)
+            self._pending[handle] = [{j: sign * v for j, v in coeffs.items()}, value, sense == "="]
+            self._sign[handle] = sign
+            self._rhs[handle] = value
+            handles.append(handle)
+        return handles
+
+    def set_rhs(self, handle: int, rhs: float) -> None:
+        value = self._sign[handle] * float(rhs)
+        delta = value - self._rhs[handle]
+        self._rhs[handle] = value
+        if handle in self._pending:
+            self._pending[handle][1] = value
+        elif delta != 0.0:
+            self._shift(self._slack[handle], -delta)
+
+    def set_upper(self, col: int, upper: float) -> None:
+        old = self._upper[col]
+        self.upper[col] = self._upper[col] = upper = float(upper)
+        if col in self._at_upper:
+            if upper == INF:
+                self._at_upper.discard(col)
+                self._shift(col, -old)
+            else:
+                self._shift(col, upper - old)
+
+    def remove_rows(self, handles: Sequence[int]) -> None:
+        for handle in handles:
+            del self._sign[handle]
+            del self._rhs[handle]
+            if self._pending.pop(handle, None) is None:
+                self._drop_row(self._slack.pop(handle))
+
+    def _shift(self, col: int, step: float) -> None:
+        """Update ``beta`` for nonbasic column ``col`` moving by ``step``."""
+        beta = self.beta
+        for i, row in enumerate(self.T):
+            a = row[col]
+            if a != 0.0:
+                beta[i] -= a * step
+
+    def _drop_row(self, s: int) -> None:
+        """Delete the tableau row and column of slack ``s``."""
+        if s in self.basis:
+            r = self.basis.index(s)
+        else:
+            r = max(range(len(self.T)), key=lambda i: abs(self.T[i][s]))
+            leave = self.basis[r]
+            old = self.beta[r]
+            self._pivot(r, s)
+            self.beta[r] = 0.0
+            # the leaving column becomes nonbasic at its nearest bound
+            u = self._upper[leave]
+            bound = u if u < INF and abs(old - u) < abs(old) else 0.0
+            if bound:
+                self._at_upper.add(leave)
+            self._shift(leave, bound - old)
+        del self.T[r]
+        del self.basis[r]
+        del self.beta[r]
+        for row in self.T:
+            del row[s]
+        del self.d[s]
+        del self._cost[s]
+        del self._upper[s]
+        self.basis = [b - 1 if b > s else b for b in self.basis]
+        self._at_upper = {j - 1 if j > s else j for j in self._at_upper if j != s}
+        for handle, col in self._slack.items():
+            if col > s:
+                self._slack[handle] = col - 1
+
+    def _values(self) -> List[float]:
+        x = [0.0] * self.n_cols
+        for j in self._at_upper:
+            if j < self.n_cols:
+                x[j] = self._upper[j]
+        for b, v in zip(self.basis, self.beta):
+            if b < self.n_cols:
+                x[b] = v
+        return x
+
+    def _append_pending(self) -> None:
+        if not self._pending:
+            return
+        x = self._values()
+        start = len(self._cost)
+        k = len(self._pending)
+        for row in self.T:
+            row.extend([0.0] * k)
+        self.d.extend([0.0] * k)
+        self._cost.extend([0.0] * k)
+        position = {b: r for r, b in enumerate(self.basis)}
+        for slack, (handle, (coeffs, rhs, equality)) in enumerate(self._pending.items(), start):
+            self._slack[handle] = slack
+            self._upper.append(0.0 if equality else INF)
+            new = [0.0] * (start + k)
+            for j, v in coeffs.items():
+                new[j] += v
+            new[slack] = 1.0
+            for j in coeffs:
+                r = position.get(j)
+                f = new[j]
+                if r is not None and f != 0.0:
+                    new = [a - f * b for a, b in zip(new, self.T[r])]
+            self.T.append(new)
+            self.basis.append(slack)
+            self.beta.append(rhs - sum(v * x[j] for j, v in coeffs.items()))
+        self._pending = {}
+
+    def _pivot(self, r: int, c: int) -> None:
+        T = self.T
+        Tr = T[r]
+        p = Tr[c]
+        if p != 1.0:
+            Tr = T[r] = [v / p for v in Tr]
+        for i, row in enumerate(T):
+            f = row[c]
+            if i == r or f == 0.0:
+                continue
+            if -_DROP < f < _DROP:
+                row[c] = 0.0  # round-off, not worth a row update
+            else:
+                T[i] = [a - f * b for a, b in zip(row, Tr)]
+        f = self.d[c]
+        if not -_DROP < f < _DROP:
+            self.d = [a - f * b for a, b in zip(self.d, Tr)]
+        else:
+            self.d[c] = 0.0
+        self.basis[r] = c
+        self.pivots += 1
+
+    def _recompute_reduced_costs(self) -> None:
+        d = self._cost[:]
+        for b, row in zip(self.basis, self.T):
+            cb = self._cost[b]
+            if cb != 0.0:
+                d = [a - cb * v for a, v in zip(d, row)]
+        self.d = d
+
+    def _improving(self) -> List[int]:
+        """Nonbasic columns whose reduced cost favours moving off their bound."""
+        tol = self.tol
+        at_upper = self._at_upper
+        upper = self._upper
+        basic = set(self.basis)
+        return [
+            j for j, dj in enumerate(self.d)
+            if (dj > tol if j in at_upper else dj < -tol) and upper[j] != 0.0 and j not in basic
+        ]
+
+    def _infeasibility(self, i: int) -> float:
+        v = self.beta[i]
+        viol = -v if v < 0.0 else v - self._upper[self.basis[i]]
+        return viol if viol > self.tol * (1.0 + abs(v)) else 0.0
+
+    def _out_of_budget(self, deadline: float, start_pivots: int) -> bool:
+        return time.monotonic() > deadline or self.pivots - start_pivots > self.max_pivots
+
+    def _primal(self, deadline: float) -> str:
+        tol = self.tol
+        beta, upper, at_upper = self.beta, self._upper, self._at_upper
+        start = self.pivots
+        degenerate = 0
+        while True:
+            if self._out_of_budget(deadline, start):
+                return "time_limit"
+            eligible = self._improving()
+            if not eligible:
+                return "optimal"
+            bland = degenerate > 50
+            if bland:
+                # Bland's rule once we appear to be cycling
+                c = eligible[0]
+            else:
+                c = max(eligible, key=lambda j: abs(self.d[j]))
+            direction = -1.0 if c in at_upper else 1.0
+            step = upper[c]  # a bound flip needs no pivot
+            r = -1
+            r_a = 0.0
+            to_upper = False
+            for i, row in enumerate(self.T):
+                a = row[c] * direction
+                if a > tol:
+                    ratio = max(beta[i], 0.0) / a
+                    hits_upper = False
+                elif a < -tol and upper[self.basis[i]] < INF:
+                    ratio = max(upper[self.basis[i]] - beta[i], 0.0) / -a
+                    hits_upper = True
+                else:
+                    continue
+                if ratio < step - tol or (
+                    ratio <= step + tol
+                    and r >= 0
+                    and (self.basis[i] < self.basis[r] if bland else abs(a) > r_a)
+                ):
+                    step, r, r_a, to_upper = ratio, i, abs(a), hits_upper
+            if step == INF:
+                return "unbounded"
+            degenerate = degenerate + 1 if step <= tol else 0
+            value = (upper[c] if c in at_upper else 0.0) + direction * step
+            self._shift(c, direction * step)
+            if r < 0:
+                if c in at_upper:
+                    at_upper.discard(c)
+                else:
+                    at_upper.add(c)
+                continue
+            leave = self.basis[r]
+            self._pivot(r, c)
+            beta[r] = value
+            at_upper.discard(c)
+            if to_upper:
+                at_upper.add(leave)
+
+    def _dual(self, deadline: float) -> str:
+        tol = self.tol
+        beta, upper, at_upper = self.beta, self._upper, self._at_upper
+        start = self.pivots
+        while True:
+            if self._out_of_budget(deadline, start):
+                return "time_limit"
+            r = max(range(len(beta)), key=self._infeasibility, default=-1)
+            if r < 0 or not self._infeasibility(r):
+                return "optimal"
+            leave = self.basis[r]
+            v = beta[r]
+            to_upper = v > 0.0
+            bound = upper[leave] if to_upper else 0.0
+            row = self.T[r]
+            d = self.d
+            c = -1
+            best = INF
+            best_a = 0.0
+            for j, a in enumerate(row):
+                if a == 0.0 or j == leave or upper[j] == 0.0 or abs(a) <= tol:
+                    continue
+                direction = -1.0 if j in at_upper else 1.0
+                # beta[r] moves by -a * direction per unit step of column j
+                if (a * direction > 0.0) != to_upper:
+                    continue
+                ratio = max(d[j] * direction, 0.0) / abs(a)
+                if ratio < best - tol or (ratio <= best + tol and abs(a) > best_a):
+                    c, best, best_a = j, ratio, abs(a)
+            if c < 0:
+                return "infeasible"
+            delta = (v - bound) / row[c]
+            value = (upper[c] if c in at_upper else 0.0) + delta
+            self._shift(c, delta)
+            self._pivot(r, c)
+            beta[r] = value
+            at_upper.discard(c)
+            if to_upper:
+                at_upper.add(leave)
+
+    def solve(self) -> LPResult:
+        deadline = time.monotonic() + self.time_limit
+        self._append_pending()
+        if not any(self._infeasibility(i) for i in range(len(self.beta))):
+            status = self._primal(deadline)
+        else:
+            for j in self._improving():
+                u = self._upper[j]
+                if u < INF:
+                    if j in self._at_upper:
+                        self._at_upper.discard(j)
+                        self._shift(j, -u)
+                    else:
+                        self._at_upper.add(j)
+                        self._shift(j, u)
+            wrong = self._improving()
+            if wrong:
+                for j in wrong:
+                    self.d[j] = 0.0
+                status = self._dual(deadline)
+                self._recompute_reduced_costs()
+                if status == "optimal":
+                    status = self._primal(deadline)
+            else:
+                status = self._dual(deadline)
+        x = self._values()
+        objective = -sum(c * v for c, v in zip(self._cost, x))
+        return LPResult(status, x, objective)
+
+
+class HighsBackend(LPBackend):
+    """Thin wrapper around a persistent ``highspy.Highs`` model.
+
+    HiGHS keeps its basis between ``run`` calls, so rows added after a solve
+    are handled by a warm-started dual simplex. Handles are mapped to HiGHS
+    row positions, which shift down when earlier rows are deleted.
+    """
+
+    name = "highs"
+
+    def __init__(
+        self,
+        costs: Sequence[float],
+        threads: int = 1,
+        time_limit: float = INF,
+        upper: Sequence[float] | None = None,
+    ):
+        super().__init__(costs, threads, time_limit, upper)
+        highspy = env_detection.highspy
+        if highspy is None:
+            raise ImportError("highspy is not installed")
+        self._highspy = highspy
+        self._h = highspy.Highs()
+        self._h.setOptionValue("output_flag", False)
+        self._h.setOptionValue("threads", int(threads))
+        if time_limit != INF:
+            self._h.setOptionValue("time_limit", float(time_limit))
+        inf = highspy.kHighsInf
+        for u in self.upper:
+            self._h.addVar(0.0, inf if u == INF else u)
+        self._h.changeColsCost(len(costs), list(range(len(costs))), [float(c) for c in costs])
+        self._h.changeObjectiveSense(highspy.ObjSense.kMaximize)
+        self._pos: Dict[int, int] = {}  # handle -> row position
+        self._sense: Dict[int, str] = {}
+        self._next_handle = 0
+
+    def _bounds(self, sense: str, rhs: float) -> Tuple[float, float]:
+        inf = self._highspy.kHighsInf
+        lower = -inf if sense == "<=" else float(rhs)
+        upper = inf if sense == ">=" else float(rhs)
+        return lower, upper
+
+    def add_rows(self, rows: Sequence[Row]) -> List[int]:
+        handles = []
+        for coeffs, sense, rhs in rows:
+            if sense not in ("<=", ">=", "="):
+                raise ValueError(f"unknown row sense {sense!r}")
+            lower, upper = self._bounds(sense, rhs)
+            idx = list(coeffs.keys())
+            vals = [float(coeffs[j]) for j in idx]
+            self._h.addRow(lower, upper, len(idx), idx, vals)
+            handle = self._next_handle
+            self._next_handle += 1
+            self._pos[handle] = len(self._pos)
+            self._sense[handle] = sense
+            handles.append(handle)
+        return handles
+
+    def set_rhs(self, handle: int, rhs: float) -> None:
+        lower, upper = self._bounds(self._sense[handle], rhs)
+        self._h.changeRowBounds(self._pos[handle], lower, upper)
+
+    def set_upper(self, col: int, upper: float) -> None:
+        self.upper[col] = float(upper)
+        inf = self._highspy.kHighsInf
+        self._h.changeColBounds(col, 0.0, inf if upper == INF else float(upper))
+
+    def remove_rows(self, handles: Sequence[int]) -> None:
+        if not handles:
+            return
+        positions = sorted(self._pos.pop(h) for h in handles)
+        for h in handles:
+            del self._sense[h]
+        self._h.deleteRows(len(positions), positions)
+        order = sorted(self._pos, key=self._pos.__getitem__)
+        self._pos = {h: i for i, h in enumerate(order)}
+
+    def solve(self) -> LPResult:
+        self._h.run()
+        status = self._h.getModelStatus()
+        codes = self._highspy.HighsModelStatus
+        if status == codes.kOptimal:
+            name = "optimal"
+        elif status == codes.kInfeasible:
+            name = "infeasible"
+        elif status == codes.kUnbounded:
+            name = "unbounded"
+        elif status == codes.kTimeLimit:
+            name = "time_limit"
+        else:
+            name = "error"
+        x = list(self._h.getSolution().col_value)
+        if len(x) != self.n_cols:
+            x = [0.0] * self.n_cols
+        objective = self._h.getInfo().objective_function_value
+        return LPResult(name, x, objective)
+
+
+BACKENDS = {"simplex": SimplexBackend, "highs": HighsBackend}
+
+
+def make_lp_backend(
+    name: str,
+    costs: Sequence[float],
+    threads: int = 1,
+    time_limit: float = INF,
+    upper: Sequence[float] | None = None,
+) -> LPBackend:
+    """Create a backend; ``"auto"`` picks HiGHS when the capability probe finds it."""
+    if name == "auto":
+        name = "highs" if env_detection.probe_capabilities().highs else "simplex"
+    try:
+        cls = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"unknown LP backend {name!r}") from None
+    return cls(costs, threads, time_limit, upper)
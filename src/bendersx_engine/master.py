@@ -1,12 +1,47 @@
-"""Simplified master problem solver used in tests."""
+"""Master problem of the decomposition.
+
+The master allocates the demand ``total_r`` across blocks and carries one
+value variable ``theta`` per block, bounded by the collected cuts::
+
+    max   sum_b theta_b - w * |r - r_ref|_1
+    s.t.  sum_b r_bj = total_r_j                       for every row j
+          r_bj >= min_block_allocations share
+          theta_b <= alpha + pi . r_b                  for each opt cut of b
+          beta . r_b <= alpha                          for each feas cut of b
+          theta_b <= big_m_cap
+
+``r_ref`` is the weighted proportional allocation (block distribution,
+priority sectors and minimum allocations). The small proximal weight ``w``
+keeps the master at ``r_ref`` until cuts make moving worthwhile.
+
+With ``master_backend="auto"`` the LP is solved by HiGHS when ``highspy`` is
+installed and by the pure-Python simplex otherwise; the simplex stays exact but
+slows down quickly once the master has more than ``SIMPLEX_HINT_COLUMNS``
+columns, which a verbose run points out. ``"proportional"`` skips
+the LP, returns ``r_ref`` and evaluates ``theta`` from the cuts; it is only
+used when asked for explicitly.
+"""
 
 from __future__ import annotations
 
+from typing import Dict, List, Tuple
+
+from . import env_detection
+from .lp import INF, LPBackend, make_lp_backend
+
+# masters with more columns than this are slow without highspy
+SIMPLEX_HINT_COLUMNS = 2000
+
 
-def solve_master_problem(blocks_metadata, m0, total_r, cuts, config):
+def _reference_allocation(blocks_metadata, m0, total_r, config, distribution=None):
+    """Weighted proportional allocation and per-entry lower bounds.
+
+    ``distribution`` overrides ``matrix_gen_params["block_distribution"]``.
+    """
     b = len(blocks_metadata)
 
-    distribution = config.matrix_gen_params.get("block_distribution")
+    if distribution is None:
+        distribution = config.matrix_gen_params.get("block_distribution")
     if distribution and len(distribution) == b:
         weights = [float(w) for w in distribution]
     else:
@@ -22,6 +57,7 @@ def solve_master_problem(blocks_metadata, m0, total_r, cuts, config):
     r_vars = [
         [total_r[j] * weights[idx] / sum_weights for j in range(m0)] for idx in range(b)
     ]
+    lower = [[0.0 for _ in range(m0)] for _ in range(b)]
 
     min_levels = config.matrix_gen_params.get("min_block_allocations", {})
     for j in range(m0):
@@ -31,9 +67,11 @@ def solve_master_problem(blocks_metadata, m0, total_r, cuts, config):
             for i in range(b):
                 share = min_reqs[i] / sum_min if sum_min > 0 else 1.0 / b
                 r_vars[i][j] = total_r[j] * share
+                lower[i][j] = r_vars[i][j]
             continue
 
         for i in range(b):
+            lower[i][j] = min_reqs[i]
             if min_reqs[i] > r_vars[i][j]:
                 r_vars[i][j] = min_reqs[i]
         current = sum(r_vars[i][j] for i in range(b))
@@ -51,5 +89,216 @@ def solve_master_problem(blocks_metadata, m0, total_r, cuts, config):
             for i in range(b):
                 r_vars[i][j] += remaining * (weights[i] / weight_sum if weight_sum else 1.0 / b)
 
-    theta = [0.0 for _ in range(b)]
-    return r_vars, theta
+    return r_vars, lower
+
+
+def _cut_key(cut) -> Tuple:
+    kind, block_id, coeffs, alpha = cut
+    return kind, block_id, tuple(coeffs), alpha
+
+
+class MasterProblem:
+    """Master LP kept alive across Benders iterations.
+
+    The LP is only rebuilt when the blocks change. A new demand or reference
+    allocation only moves the upper bounds of the ``q`` columns and the
+    right-hand sides of the cut rows.
+    Each :meth:`solve` appends the rows of cuts not seen before, removes the
+    rows of cuts no longer passed in (e.g. evicted from the cut pool) and the
+    backend warm-starts from its previous basis.
+
+    Columns are laid out as ``p_bj, q_bj`` pairs (``r_bj = r_ref_bj + p - q``
+    with ``q_bj <= r_ref_bj - lower_bj``) followed by one ``theta_b+, theta_b-``
+    pair per block (``theta_b = theta_b+ - theta_b-`` with
+    ``theta_b+ <= big_m``). The only rows are the demand rows and the cuts.
+    Until a block has an optimality cut its ``theta_b+`` is fixed at zero and
+    ``theta_b`` is reported as ``big_m``, so a block's first cut does not
+    start the LP from ``theta_b = big_m``.
+    """
+
+    def __init__(self, m0: int, config, backend: str | None = None):
+        self.m0 = m0
+        self.config = config
+        self.backend_name = backend or getattr(config, "master_backend", "auto")
+        self._auto = self.backend_name == "auto"
+        if self._auto:
+            self.backend_name = "highs" if env_detection.probe_capabilities().highs else "simplex"
+        self.big_m = float(config.big_m_cap)
+        self.proximal_weight = float(getattr(config, "master_proximal_weight", 1e-4))
+        self.lp: LPBackend | None = None
+        self.status: str | None = None
+        self.rebuilds = 0
+        self.cut_rows = 0
+        self.cut_rows_removed = 0
+        self.ref_updates = 0
+        self._key = None
+        self._blocks: Dict[str, int] = {}
+        self._ref: List[List[float]] = []
+        self._lower: List[List[float]] = []
+        # _cut_key -> (row handle or None for unknown blocks, cut)
+        self._rows: Dict[Tuple, Tuple[int | None, tuple]] = {}
+        self._capped: set = set()  # blocks whose theta has an optimality cut
+
+    def _p(self, b: int, j: int) -> int:
+        return 2 * (b * self.m0 + j)
+
+    def _theta(self, b: int) -> int:
+        return 2 * len(self._blocks) * self.m0 + 2 * b
+
+    def _build(self, blocks_metadata, ref, lower) -> None:
+        m0 = self.m0
+        nb = len(blocks_metadata)
+        self._blocks = {bid: idx for idx, (bid, _, _) in enumerate(blocks_metadata)}
+        self._ref = ref
+        self._lower = lower
+        self._rows = {}
+        self._capped = set()
+        costs = [-self.proximal_weight] * (2 * nb * m0) + [1.0, -1.0] * nb
+        upper = []
+        for b in range(nb):
+            for j in range(m0):
+                upper += [INF, max(0.0, ref[b][j] - lower[b][j])]
+        upper += [0.0, INF] * nb
+        auto_simplex = self._auto and self.backend_name == "simplex"
+        if auto_simplex and self.config.verbose and len(costs) > SIMPLEX_HINT_COLUMNS:
+            print(
+                f"highspy not installed: solving the {len(costs)}-column master "
+                "with the pure-Python simplex; install highspy for faster solves"
+            )
+        threads = 1
+        if self.backend_name == "highs" and self.config.use_highs_threading:
+            if env_detection.probe_capabilities().highs_threading:
+                threads = self.config.highs_threads
+        self.lp = make_lp_backend(
+            self.backend_name, costs, threads=threads,
+            time_limit=self.config.highs_time_limit, upper=upper,
+        )
+        rows = []
+        for j in range(m0):
+            coeffs = {}
+            for b in range(nb):
+                coeffs[self._p(b, j)] = 1.0
+                coeffs[self._p(b, j) + 1] = -1.0
+            rows.append((coeffs, "=", 0.0))
+        self.lp.add_rows(rows)
+        self.rebuilds += 1
+
+    def _move_reference(self, ref, lower) -> None:
+        """Shift the ``q`` bounds and cut rows to a new reference allocation."""
+        self._ref = ref
+        self._lower = lower
+        for b in range(len(self._blocks)):
+            for j in range(self.m0):
+                self.lp.set_upper(self._p(b, j) + 1, max(0.0, ref[b][j] - lower[b][j]))
+        for handle, cut in self._rows.values():
+            if handle is not None:
+                self.lp.set_rhs(handle, self._cut_row(cut)[2])
+        self.ref_updates += 1
+
+    def _cut_row(self, cut):
+        kind, block_id, coeffs, alpha = cut
+        b = self._blocks.get(block_id)
+        if b is None:
+            return None
+        row: Dict[int, float] = {}
+        shift = 0.0
+        for j, c in enumerate(coeffs[: self.m0]):
+            if c != 0:
+                p = self._p(b, j)
+                row[p] = -c
+                row[p + 1] = c
+                shift += c * self._ref[b][j]
+        if kind == "opt":
+            t = self._theta(b)
+            row[t] = 1.0
+            row[t + 1] = -1.0
+            return row, "<=", alpha + shift
+        # feasibility cut: coeffs . r_b <= alpha
+        return {k: -v for k, v in row.items()}, "<=", alpha - shift
+
+    def solve(
+        self, blocks_metadata, total_r, cuts, distribution=None
+    ) -> Tuple[List[List[float]], List[float]]:
+        ref, lower = _reference_allocation(
+            blocks_metadata, self.m0, total_r, self.config, distribution
+        )
+        if self.backend_name == "proportional":
+            self._blocks = {bid: idx for idx, (bid, _, _) in enumerate(blocks_metadata)}
+            self.status = "proportional"
+            return ref, self._theta_at(ref, cuts)
+        key = tuple(blocks_metadata)
+        if key != self._key:
+            self._build(blocks_metadata, ref, lower)
+            self._key = key
+        elif ref != self._ref or lower != self._lower:
+            self._move_reference(ref, lower)
+
+        current = {_cut_key(cut): cut for cut in cuts}
+        stale = [k for k in self._rows if k not in current]
+        handles = [self._rows.pop(k)[0] for k in stale]
+        handles = [h for h in handles if h is not None]
+        if handles:
+            self.lp.remove_rows(handles)
+            self.cut_rows_removed += len(handles)
+
+        fresh = []
+        rows = []
+        for k, cut in current.items():
+            if k in self._rows:
+                continue
+            row = self._cut_row(cut)
+            if row is None:
+                self._rows[k] = (None, cut)
+            else:
+                fresh.append((k, cut))
+                rows.append(row)
+        if rows:
+            for (k, cut), handle in zip(fresh, self.lp.add_rows(rows)):
+                self._rows[k] = (handle, cut)
+            self.cut_rows += len(rows)
+        capped = {
+            self._blocks[cut[1]] for handle, cut in self._rows.values()
+            if handle is not None and cut[0] == "opt"
+        }
+        for b in capped ^ self._capped:
+            self.lp.set_upper(self._theta(b), self.big_m if b in capped else 0.0)
+        self._capped = capped
+
+        result = self.lp.solve()
+        self.status = result.status
+        nb = len(blocks_metadata)
+        if result.status != "optimal":
+            return ref, self._theta_at(ref, cuts)
+        x = result.x
+        r_vars = [
+            [ref[b][j] + x[self._p(b, j)] - x[self._p(b, j) + 1] for j in range(self.m0)]
+            for b in range(nb)
+        ]
+        theta = [
+            x[self._theta(b)] - x[self._theta(b) + 1] if b in capped else self.big_m
+            for b in range(nb)
+        ]
+        return r_vars, theta
+
+    def _theta_at(self, r_vars, cuts) -> List[float]:
+        theta = [self.big_m for _ in self._blocks]
+        for kind, block_id, coeffs, alpha in cuts:
+            b = self._blocks.get(block_id)
+            if kind == "opt" and b is not None:
+                val = alpha + sum(c * r for c, r in zip(coeffs, r_vars[b]))
+                theta[b] = min(theta[b], val)
+        return theta
+
+
+def solve_master_problem(
+    blocks_metadata, m0, total_r, cuts, config, master: MasterProblem | None = None,
+    distribution=None,
+):
+    """Solve the master LP; pass ``master`` to reuse a model across iterations.
+
+    ``distribution`` replaces the configured block weights, e.g. the weights
+    a single solve adapts with ``dynamic_block_weights``.
+    """
+    if master is None:
+        master = MasterProblem(m0, config)
+    return master.solve(blocks_metadata, total_r, cuts, distribution)
@@ -1,32 +1,41 @@
 from __future__ import annotations
 
+import math
 import random
+from array import array
+from typing import List
 
-from .simple_matrix import SimpleMatrix
-from .optimizations import sparse_norm_optimized
+from . import kernels
+from .simple_matrix import CSRMatrix
+from .leontief import spectral_radius
 from .config import BendersConfig
-from .env_detection import NUMBA_AVAILABLE
 
 
-def _normalize_column_sums(matrix: SimpleMatrix, max_sum: float) -> None:
-    for j in range(matrix.shape[1]):
-        col_sum = sum(matrix.data[i][j] for i in range(matrix.shape[0]))
-        if col_sum >= max_sum:
-            factor = max_sum / col_sum
-            for i in range(matrix.shape[0]):
-                matrix.data[i][j] *= factor
+def _normalize_column_sums(matrix: CSRMatrix, max_sum: float) -> None:
+    kernels.normalize_column_sums(matrix.data, matrix.indices, matrix.shape[1], max_sum)
+
+
+def _limit_column_sums(matrix: CSRMatrix, limits: dict) -> None:
+    """Scale columns whose sum exceeds the given per-column limit."""
+    col_sums = matrix.column_sums()
+    factors = [1.0] * matrix.shape[1]
+    for j, limit in limits.items():
+        if 0 <= j < matrix.shape[1] and limit > 0 and col_sums[j] > limit:
+            factors[j] = limit / col_sums[j]
+    matrix.scale_columns(factors)
 
 
 def _ensure_b_rows_nonzero(
-    B: SimpleMatrix,
+    B: CSRMatrix,
     row_targets: dict | None = None,
     row_total_targets: dict | None = None,
+    rng=random,
 ) -> None:
     """Ensure every row of ``B`` has at least one non-zero entry and optional totals.
 
     Parameters
     ----------
-    B : SimpleMatrix
+    B : CSRMatrix
         Demand matrix to modify in-place.
     row_targets : dict | None, optional
         Optional dictionary mapping row indices to ``{col: value}`` mappings.
@@ -35,6 +44,12 @@ def _ensure_b_rows_nonzero(
         Optional mapping of row indices to desired total row sums. The row will
         be scaled to match this target after ``row_targets`` are applied and
         non-zero entries ensured.
+    rng : random.Random, optional
+        Source of randomness; defaults to the module-level generator.
+
+    All rewritten rows share one CSR rebuild and the totals one
+    :meth:`~simple_matrix.CSRMatrix.scale_rows` pass, so the cost is
+    O(nnz + m0) however many rows change.
     """
     if row_targets is None:
         row_targets = {}
@@ -42,102 +57,122 @@ def _ensure_b_rows_nonzero(
         row_total_targets = {}
 
     n = B.shape[1]
-    for idx, row in enumerate(B.data):
+    # rows to rewrite and per-row scale factors, applied in one pass each
+    new_rows = {}
+    factors = [1.0] * B.shape[0]
+    for idx in range(B.shape[0]):
+        items = None
         target = row_targets.get(idx)
         if target:
+            items = dict(B.row_items(idx))
             for j, val in target.items():
                 if 0 <= j < n:
-                    row[j] = val
+                    items[j] = val
+            items = {j: val for j, val in items.items() if val != 0}
 
-        if not any(val != 0 for val in row) and n > 0:
-            row[random.randrange(n)] = random.random()
+        nnz = len(items) if items is not None else B.row_nnz(idx)
+        if nnz == 0 and n > 0:
+            val = rng.random()
+            items = {rng.randrange(n): val}
 
         total_target = row_total_targets.get(idx)
         if total_target is not None and n > 0:
-            current = sum(row)
+            if items is not None:
+                current = sum(items.values())
+            else:
+                current = sum(val for _, val in B.row_items(idx))
             if current > 0:
-                factor = total_target / current
-                for j in range(n):
-                    row[j] *= factor
+                factors[idx] = total_target / current
             else:
                 share = total_target / n
-                for j in range(n):
-                    row[j] = share
+                items = dict.fromkeys(range(n), share)
+
+        if items is not None:
+            new_rows[idx] = items.items()
+
+    if new_rows:
+        B.set_rows(new_rows)
+    B.scale_rows(factors)
 
 
-def _apply_planwirtschaft_modifiers(A: SimpleMatrix, B: SimpleMatrix, params: dict) -> None:
+def _apply_planwirtschaft_modifiers(A: CSRMatrix, B: CSRMatrix, params: dict, rng=random) -> None:
     """Apply simple structured tweaks for planwirtschaft matrices.
 
     The helper normalizes ``A`` according to optional column limits and ensures
-    the ``B`` matrix adheres to given demand targets.
+    the ``B`` matrix adheres to given demand targets. All adjustments operate on
+    the stored non-zeros only.
     """
     diag_base = params.get("diag_base", 0.2)
     diag_var = params.get("diag_variation", 0.7)
-    diag_vals = [diag_base + diag_var * random.random() for _ in range(A.shape[0])]
+    diag_vals = [diag_base + diag_var * rng.random() for _ in range(A.shape[0])]
     A.setdiag(diag_vals)
 
     max_col_sum = params.get("max_col_sum_A", 0.95)
 
     column_limits = params.get("A_column_limits")
     if isinstance(column_limits, dict):
-        for j, limit in column_limits.items():
-            if 0 <= j < A.shape[1]:
-                col_sum = sum(A.data[i][j] for i in range(A.shape[0]))
-                if col_sum > limit and limit > 0:
-                    factor = limit / col_sum
-                    for i in range(A.shape[0]):
-                        A.data[i][j] *= factor
+        _limit_column_sums(A, column_limits)
 
     _normalize_column_sums(A, max_col_sum)
 
     row_targets = params.get("B_row_targets")
     row_total_targets = params.get("B_row_total_targets")
-    _ensure_b_rows_nonzero(B, row_targets, row_total_targets)
+    _ensure_b_rows_nonzero(B, row_targets, row_total_targets, rng)
 
     seasonal_weights = params.get("seasonal_demand_weights")
     if isinstance(seasonal_weights, list):
+        factors = [1.0] * B.shape[0]
         for idx, weight in enumerate(seasonal_weights):
             if 0 <= idx < B.shape[0]:
-                B.data[idx] = [val * weight for val in B.data[idx]]
+                factors[idx] = weight
+        B.scale_rows(factors)
 
     priority_factor = params.get("priority_sector_demand_factor", 1.0)
     priority_sectors = params.get("priority_sectors", [])
     priority_levels = params.get("priority_levels") or {}
+    filled = {}
+    factors = [1.0] * B.shape[0]
     for idx in priority_sectors:
         if 0 <= idx < B.shape[0]:
-            row = B.data[idx]
-            if not any(val != 0 for val in row) and B.shape[1] > 0:
-                row[random.randrange(B.shape[1])] = random.random() * priority_factor
+            if B.row_nnz(idx) == 0 and idx not in filled and B.shape[1] > 0:
+                val = rng.random() * priority_factor
+                filled[idx] = [(rng.randrange(B.shape[1]), val)]
             level = priority_levels.get(idx, 0)
-            fac = priority_factor * (1.0 + level / 10.0)
-            B.data[idx] = [val * fac for val in row]
+            factors[idx] *= priority_factor * (1.0 + level / 10.0)
+    if filled:
+        B.set_rows(filled)
+    B.scale_rows(factors)
 
     tech_factor = params.get("priority_sector_tech_factor")
     if tech_factor is not None:
+        factors = [1.0] * A.shape[0]
         for idx in priority_sectors:
             if 0 <= idx < A.shape[0]:
-                A.data[idx] = [val * tech_factor for val in A.data[idx]]
+                factors[idx] = tech_factor
+        A.scale_rows(factors)
 
         other_rows = [i for i in range(A.shape[0]) if i not in priority_sectors]
         if other_rows:
-            target_avg = sum(sum(A.data[i]) for i in other_rows) / (
+            row_sums = A.row_sums()
+            target_avg = sum(row_sums[i] for i in other_rows) / (
                 len(other_rows) * A.shape[1]
             )
+            factors = [1.0] * A.shape[0]
             for idx in priority_sectors:
                 if 0 <= idx < A.shape[0]:
-                    row_avg = sum(A.data[idx]) / A.shape[1]
+                    row_avg = row_sums[idx] / A.shape[1]
                     if row_avg > target_avg and row_avg > 0:
-                        scale = target_avg / row_avg
-                        A.data[idx] = [val * scale for val in A.data[idx]]
+                        factors[idx] = target_avg / row_avg
+            A.scale_rows(factors)
 
     capacity_limits = params.get("sector_capacity_limits")
     if isinstance(capacity_limits, dict):
+        row_sums = B.row_sums()
+        factors = [1.0] * B.shape[0]
         for idx, limit in capacity_limits.items():
-            if 0 <= idx < B.shape[0] and limit > 0:
-                row_sum = sum(B.data[idx])
-                if row_sum > limit:
-                    factor = limit / row_sum
-                    B.data[idx] = [val * factor for val in B.data[idx]]
+            if 0 <= idx < B.shape[0] and limit > 0 and row_sums[idx] > limit:
+                factors[idx] = limit / row_sums[idx]
+        B.scale_rows(factors)
 
     prod_limits = params.get("production_limits")
     if isinstance(prod_limits, dict):
@@ -145,38 +180,59 @@ def _apply_planwirtschaft_modifiers(A: SimpleMatrix, B: SimpleMatrix, params: di
             if 0 <= i < B.shape[0] and isinstance(col_limits, dict):
                 for j, limit in col_limits.items():
                     if 0 <= j < B.shape[1] and limit >= 0:
-                        if B.data[i][j] > limit:
-                            B.data[i][j] = limit
+                        if B[i, j] > limit:
+                            B[i, j] = limit
 
     trade_limits = params.get("import_export_limits")
     if isinstance(trade_limits, dict):
         import_lims = trade_limits.get("import")
         export_lims = trade_limits.get("export")
         if isinstance(import_lims, dict):
+            col_sums = A.column_sums()
+            factors = [1.0] * A.shape[1]
             for j, lim in import_lims.items():
-                if 0 <= j < A.shape[1] and lim >= 0:
-                    col_sum = sum(A.data[i][j] for i in range(A.shape[0]))
-                    if col_sum > lim and col_sum > 0:
-                        factor = lim / col_sum
-                        for i in range(A.shape[0]):
-                            A.data[i][j] *= factor
+                if 0 <= j < A.shape[1] and lim >= 0 and col_sums[j] > lim and col_sums[j] > 0:
+                    factors[j] = lim / col_sums[j]
+            A.scale_columns(factors)
         if isinstance(export_lims, dict):
+            row_sums = B.row_sums()
+            factors = [1.0] * B.shape[0]
             for i, lim in export_lims.items():
-                if 0 <= i < B.shape[0] and lim >= 0:
-                    row_sum = sum(B.data[i])
-                    if row_sum > lim and row_sum > 0:
-                        factor = lim / row_sum
-                        B.data[i] = [val * factor for val in B.data[i]]
+                if 0 <= i < B.shape[0] and lim >= 0 and row_sums[i] > lim and row_sums[i] > 0:
+                    factors[i] = lim / row_sums[i]
+            B.scale_rows(factors)
 
 
-def _random_matrix(rows: int, cols: int, density: float) -> SimpleMatrix:
-    data = []
+def _sample_columns(cols: int, density: float, rng) -> List[int]:
+    """Sorted column positions of a Bernoulli(``density``) row in O(nnz).
+
+    Gaps between successive non-zeros are drawn from the geometric
+    distribution instead of testing every cell.
+    """
+    if density >= 1.0:
+        return list(range(cols))
+    if density <= 0.0:
+        return []
+    log_q = math.log1p(-density)
+    out = []
+    j = -1
+    while True:
+        j += 1 + int(math.log(1.0 - rng.random()) / log_q)
+        if j >= cols:
+            return out
+        out.append(j)
+
+
+def _random_matrix(rows: int, cols: int, density: float, rng=random) -> CSRMatrix:
+    data = array("d")
+    indices = array("i")
+    indptr = array("i", [0])
     for _ in range(rows):
-        row = [
-            random.random() if random.random() < density else 0.0 for _ in range(cols)
-        ]
-        data.append(row)
-    return SimpleMatrix(data)
+        positions = _sample_columns(cols, density, rng)
+        indices.extend(positions)
+        data.extend(rng.random() for _ in positions)
+        indptr.append(len(data))
+    return CSRMatrix.from_buffers(data, indices, indptr, (rows, cols))
 
 
 def generate_sparse_matrices(
@@ -185,35 +241,44 @@ def generate_sparse_matrices(
     sparsity: float = 0.02,
     problem_type: str = "general",
     config: BendersConfig | None = None,
+    seed: int | None = None,
 ):
+    """Generate ``A`` (n x n) and ``B`` (m0 x n) directly in CSR form.
+
+    Non-zero positions are sampled directly, so generation, the Leontief
+    diagonal and column normalization run in O(nnz). ``A`` is then scaled to
+    a spectral radius of 0.95, estimated by power iteration at O(nnz) per
+    step. Passing ``seed`` makes the output reproducible; otherwise the
+    module-level ``random`` generator is used.
+    """
     if config is None:
         config = BendersConfig()
+    with kernels.jit_scope(config.use_numba_jit):
+        return _generate(n, m0, sparsity, problem_type, config, seed)
+
+
+def _generate(n, m0, sparsity, problem_type, config, seed):
+    rng = random.Random(seed) if seed is not None else random
 
-    A = _random_matrix(n, n, sparsity)
+    A = _random_matrix(n, n, sparsity, rng)
     if problem_type == "leontief":
-        diag_vals = [0.2 + 0.7 * random.random() for _ in range(n)]
+        diag_vals = [0.2 + 0.7 * rng.random() for _ in range(n)]
         A.setdiag(diag_vals)
         _normalize_column_sums(A, 0.95)
 
-    rho = sparse_norm_optimized([v for row in A.data for v in row])
+    rho = spectral_radius(A)
     if rho > 0:
-        scale = 0.95 / rho
-        for i in range(n):
-            for j in range(n):
-                A.data[i][j] *= scale
+        A.scale(0.95 / rho)
 
     if problem_type == "planwirtschaft":
-        data = []
         num_entries = max(1, int(n * sparsity))
+        rows = []
         for _ in range(m0):
-            row = [0.0] * n
-            cols = random.sample(range(n), num_entries)
-            for j in cols:
-                row[j] = random.random()
-            data.append(row)
-        B = SimpleMatrix(data)
-        _apply_planwirtschaft_modifiers(A, B, config.matrix_gen_params)
+            cols = rng.sample(range(n), num_entries)
+            rows.append([(j, rng.random()) for j in cols])
+        B = CSRMatrix.from_rows(rows, (m0, n))
+        _apply_planwirtschaft_modifiers(A, B, config.matrix_gen_params, rng)
     else:
-        B = _random_matrix(m0, n, sparsity * 2)
+        B = _random_matrix(m0, n, sparsity * 2, rng)
 
     return A, B
@@ -0,0 +1,171 @@
+"""Planwirtschaft objective compiled once per solve.
+
+The subproblem used to re-read every penalty and bonus from
+``matrix_gen_params`` and walk the tier lists for each row. Here those inputs
+are folded into dense per-row coefficient vectors and piecewise-linear tier
+tables whose segment is found by binary search.
+:meth:`PlanwirtschaftObjective.evaluate_many` scores the stacked
+``(produced, planned)`` pairs of several blocks in one kernel call.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from array import array
+from functools import cached_property, lru_cache
+from typing import Iterable, List, Sequence, Tuple
+
+from . import kernels
+from .config import SubproblemSettings
+
+
+@dataclass(frozen=True)
+class TierTable:
+    """Piecewise-linear penalty with breakpoints and cumulative costs.
+
+    Equivalent to applying the tiers in order: each tier charges its
+    coefficient up to its threshold, and deviations beyond the last breakpoint
+    are charged at the last coefficient.
+    """
+
+    breakpoints: Tuple[float, ...]
+    cumulative: Tuple[float, ...]
+    coeffs: Tuple[float, ...]
+
+    @staticmethod
+    def from_tiers(tiers: Iterable[tuple]) -> "TierTable":
+        tiers = list(tiers)
+        breakpoints = [0.0]
+        cumulative = [0.0]
+        coeffs: List[float] = []
+        prev = 0.0
+        for thresh, coeff in tiers:
+            width = thresh - prev
+            if width > 0:
+                coeffs.append(coeff)
+                breakpoints.append(breakpoints[-1] + width)
+                cumulative.append(cumulative[-1] + width * coeff)
+            prev = thresh
+        # Beyond the last breakpoint the last listed coefficient applies.
+        coeffs.append(tiers[-1][1] if tiers else 0.0)
+        return TierTable(tuple(breakpoints), tuple(cumulative), tuple(coeffs))
+
+    def cost(self, dev: float) -> float:
+        if dev <= 0:
+            return 0.0
+        k = bisect_right(self.breakpoints, dev) - 1
+        return self.cumulative[k] + (dev - self.breakpoints[k]) * self.coeffs[k]
+
+
+@dataclass(frozen=True)
+class PlanwirtschaftObjective:
+    """Dense per-row coefficients of the planwirtschaft objective.
+
+    For a row with planned amount ``r`` and produced amount ``p`` the value is
+    ``linear * p + bonus * min(r, p) - under(r - p)^+ - over(p - r)^+`` where
+    the under/over terms are either linear or given by a :class:`TierTable`.
+    Inventory cost is folded into the linear overproduction coefficient.
+    """
+
+    linear: Tuple[float, ...]
+    bonus: Tuple[float, ...]
+    under: Tuple[float, ...]
+    over: Tuple[float, ...]
+    under_tiers: TierTable | None = None
+    over_tiers: TierTable | None = None
+
+    @staticmethod
+    def compile(settings: SubproblemSettings, m0: int) -> "PlanwirtschaftObjective":
+        def dense(values, default):
+            vals = list(values) if values is not None else []
+            return [vals[i] if i < len(vals) else default for i in range(m0)]
+
+        societal = dict(settings.societal_bonuses)
+        co2 = dict(settings.co2_penalties)
+        linear = [1.0 + societal.get(i, 0.0) - co2.get(i, 0.0) for i in range(m0)]
+        bonus = [
+            settings.production_bonus
+            * (settings.priority_sector_bonus_factor if i in settings.priority_sectors else 1.0)
+            for i in range(m0)
+        ]
+        under_tiers = over_tiers = None
+        if settings.tiered_underproduction_penalties:
+            under_tiers = TierTable.from_tiers(settings.tiered_underproduction_penalties)
+            under = [0.0] * m0
+        else:
+            under = dense(settings.underproduction_penalties, settings.underproduction_penalty)
+        if settings.tiered_overproduction_penalties:
+            over_tiers = TierTable.from_tiers(settings.tiered_overproduction_penalties)
+            over = [settings.inventory_cost] * m0
+        else:
+            over = [
+                p + settings.inventory_cost
+                for p in dense(settings.overproduction_penalties, settings.overproduction_penalty)
+            ]
+        return PlanwirtschaftObjective(
+            tuple(linear), tuple(bonus), tuple(under), tuple(over), under_tiers, over_tiers
+        )
+
+    @cached_property
+    def _buffers(self) -> tuple:
+        """Coefficients and tier tables as ``array('d')`` for the compiled kernel."""
+        def tables(tiers):
+            if tiers is None:
+                return None
+            return tuple(array("d", t) for t in (tiers.breakpoints, tiers.cumulative, tiers.coeffs))
+
+        vectors = tuple(array("d", v) for v in (self.linear, self.bonus, self.under, self.over))
+        return vectors, tables(self.under_tiers), tables(self.over_tiers)
+
+    def evaluate_many(
+        self, produced: Sequence[Sequence[float]], planned: Sequence[Sequence[float]]
+    ) -> List[float]:
+        """Objective of every ``(produced[q], planned[q])`` pair, batched.
+
+        The pairs are stacked into two flat buffers and scored by a single
+        :func:`kernels.penalty_objectives` call.
+        """
+        if not produced:
+            return []
+        if not self.linear:
+            return [0.0] * len(produced)
+        m = len(self.linear)
+        flat_produced = array("d")
+        flat_planned = array("d")
+        for p, r in zip(produced, planned):
+            flat_produced.extend(p[:m])
+            flat_planned.extend(r[:m])
+        (linear, bonus, under, over), under_tiers, over_tiers = self._buffers
+        return kernels.penalty_objectives(
+            linear, bonus, under, over, flat_produced, flat_planned, under_tiers, over_tiers
+        )
+
+    def evaluate(self, produced: Sequence[float], planned: Sequence[float]) -> float:
+        if kernels.jit_enabled():
+            (linear, bonus, under, over), under_tiers, over_tiers = self._buffers
+            return kernels.penalty_objective(
+                linear, bonus, under, over, produced, planned, under_tiers, over_tiers
+            )
+        total = 0.0
+        under_tiers = self.under_tiers
+        over_tiers = self.over_tiers
+        for lin, bon, u, o, p, r in zip(
+            self.linear, self.bonus, self.under, self.over, produced, planned
+        ):
+            dev = r - p
+            if dev > 0:
+                total += lin * p + bon * p
+                total -= under_tiers.cost(dev) if under_tiers is not None else u * dev
+            else:
+                total += lin * p + bon * r
+                total += o * dev
+                if over_tiers is not None:
+                    total -= over_tiers.cost(-dev)
+        return total
+
+
+@lru_cache(maxsize=32)
+def compile_objective(settings: SubproblemSettings, m0: int) -> PlanwirtschaftObjective:
+    """Return the compiled objective for ``settings``, cached per process."""
+    return PlanwirtschaftObjective.compile(settings, m0)
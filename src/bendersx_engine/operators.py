@@ -0,0 +1,201 @@
+"""Matrix-free linear operators for Leontief systems.
+
+The identity is stored as a single scale factor, diagonals as one vector and
+``I - A`` as a weighted sum of terms, so applying them costs
+O(n + nnz(A)) time and never more than O(n) extra memory. Operators combine
+with ``+``, ``-`` and scalar ``*``; :meth:`LinearOperator.to_csr` assembles
+the sparse form row by row when an explicit matrix is needed.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from .simple_matrix import CSRMatrix, as_csr
+
+
+class LinearOperator:
+    """Base class; subclasses provide ``shape``, products and row access."""
+
+    shape: Tuple[int, int]
+
+    def matvec(self, x: Sequence[float]) -> List[float]:
+        raise NotImplementedError
+
+    def rmatvec(self, y: Sequence[float]) -> List[float]:
+        """Return ``op.T @ y``."""
+        raise NotImplementedError
+
+    def row_items(self, i: int) -> Iterator[Tuple[int, float]]:
+        """Iterate over the non-zero ``(column, value)`` pairs of row ``i``."""
+        raise NotImplementedError
+
+    def diagonal(self) -> List[float]:
+        raise NotImplementedError
+
+    def to_csr(self) -> CSRMatrix:
+        rows = self.shape[0]
+        return CSRMatrix.from_rows((self.row_items(i) for i in range(rows)), self.shape)
+
+    def scaled(self, factor: float) -> "LinearOperator":
+        return SumOperator([(factor, self)])
+
+    def __add__(self, other) -> "LinearOperator":
+        return SumOperator([(1.0, self), (1.0, aslinearoperator(other))])
+
+    def __radd__(self, other) -> "LinearOperator":
+        return SumOperator([(1.0, aslinearoperator(other)), (1.0, self)])
+
+    def __sub__(self, other) -> "LinearOperator":
+        return SumOperator([(1.0, self), (-1.0, aslinearoperator(other))])
+
+    def __rsub__(self, other) -> "LinearOperator":
+        return SumOperator([(1.0, aslinearoperator(other)), (-1.0, self)])
+
+    def __mul__(self, factor: float) -> "LinearOperator":
+        return self.scaled(float(factor))
+
+    __rmul__ = __mul__
+
+    def __neg__(self) -> "LinearOperator":
+        return self.scaled(-1.0)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(shape={self.shape})"
+
+
+class IdentityOperator(LinearOperator):
+    """``scale * I`` in O(1) storage."""
+
+    def __init__(self, n: int, scale: float = 1.0):
+        self.shape = (n, n)
+        self.scale = float(scale)
+
+    def matvec(self, x: Sequence[float]) -> List[float]:
+        s = self.scale
+        return [s * v for v in x]
+
+    rmatvec = matvec
+
+    def row_items(self, i: int) -> Iterator[Tuple[int, float]]:
+        if self.scale != 0.0:
+            yield i, self.scale
+
+    def diagonal(self) -> List[float]:
+        return [self.scale] * self.shape[0]
+
+    def scaled(self, factor: float) -> "IdentityOperator":
+        return IdentityOperator(self.shape[0], self.scale * factor)
+
+
+class DiagonalOperator(LinearOperator):
+    """``diag(values)`` in O(n) storage."""
+
+    def __init__(self, values: Sequence[float]):
+        self.values = array("d", values)
+        n = len(self.values)
+        self.shape = (n, n)
+
+    def matvec(self, x: Sequence[float]) -> List[float]:
+        return [d * v for d, v in zip(self.values, x)]
+
+    rmatvec = matvec
+
+    def row_items(self, i: int) -> Iterator[Tuple[int, float]]:
+        if self.values[i] != 0.0:
+            yield i, self.values[i]
+
+    def diagonal(self) -> List[float]:
+        return list(self.values)
+
+    def scaled(self, factor: float) -> "DiagonalOperator":
+        return DiagonalOperator([factor * d for d in self.values])
+
+
+class MatrixOperator(LinearOperator):
+    """Operator view of a :class:`CSRMatrix` (no copy)."""
+
+    def __init__(self, matrix: CSRMatrix):
+        self.matrix = matrix
+        self.shape = matrix.shape
+
+    def matvec(self, x: Sequence[float]) -> List[float]:
+        return self.matrix.matvec(x)
+
+    def rmatvec(self, y: Sequence[float]) -> List[float]:
+        return self.matrix.rmatvec(y)
+
+    def row_items(self, i: int) -> Iterator[Tuple[int, float]]:
+        return self.matrix.row_items(i)
+
+    def diagonal(self) -> List[float]:
+        return [self.matrix[i, i] for i in range(min(self.shape))]
+
+    def to_csr(self) -> CSRMatrix:
+        return self.matrix
+
+
+class SumOperator(LinearOperator):
+    """``sum(coef * op)`` over ``(coef, op)`` terms of equal shape.
+
+    Nested sums are flattened, so ``I - A + D`` is a single three-term sum.
+    """
+
+    def __init__(self, terms: Sequence[Tuple[float, LinearOperator]]):
+        flat: List[Tuple[float, LinearOperator]] = []
+        for coef, op in terms:
+            if isinstance(op, SumOperator):
+                flat.extend((coef * c, o) for c, o in op.terms)
+            else:
+                flat.append((coef, op))
+        shapes = {op.shape for _, op in flat}
+        if len(shapes) != 1:
+            raise ValueError(f"operator shapes differ: {sorted(shapes)}")
+        self.terms = flat
+        self.shape = shapes.pop()
+
+    def _combine(self, products) -> List[float]:
+        out = [0.0] * len(products[0][1]) if products else []
+        for coef, vec in products:
+            for i, v in enumerate(vec):
+                out[i] += coef * v
+        return out
+
+    def matvec(self, x: Sequence[float]) -> List[float]:
+        return self._combine([(c, op.matvec(x)) for c, op in self.terms])
+
+    def rmatvec(self, y: Sequence[float]) -> List[float]:
+        return self._combine([(c, op.rmatvec(y)) for c, op in self.terms])
+
+    def row_items(self, i: int) -> Iterator[Tuple[int, float]]:
+        merged: Dict[int, float] = {}
+        for coef, op in self.terms:
+            for j, v in op.row_items(i):
+                merged[j] = merged.get(j, 0.0) + coef * v
+        for j in sorted(merged):
+            if merged[j] != 0.0:
+                yield j, merged[j]
+
+    def diagonal(self) -> List[float]:
+        return self._combine([(c, op.diagonal()) for c, op in self.terms])
+
+    def scaled(self, factor: float) -> "SumOperator":
+        return SumOperator([(factor * c, op) for c, op in self.terms])
+
+
+def aslinearoperator(obj) -> LinearOperator:
+    """Wrap matrices (anything :func:`as_csr` accepts) as operators."""
+    if isinstance(obj, LinearOperator):
+        return obj
+    return MatrixOperator(as_csr(obj))
+
+
+def leontief_operator(A, implicit: bool = True) -> LinearOperator:
+    """``I - A``, matrix-free unless ``implicit`` is false.
+
+    The assembled variant stores ``I - A`` as a single CSR matrix, which is
+    faster to apply repeatedly but costs a copy of ``A``.
+    """
+    op = IdentityOperator(as_csr(A).shape[0]) - A
+    return op if implicit else MatrixOperator(op.to_csr())
@@ -2,25 +2,26 @@
 
 from __future__ import annotations
 
-from .simple_matrix import SimpleMatrix
+from . import kernels
+from .simple_matrix import CSRMatrix
 
 
 def create_identity_optimized(n: int, format: str = "csr", dtype=float):
-    """Return a simple identity matrix."""
-    data = [[1.0 if i == j else 0.0 for j in range(n)] for i in range(n)]
-    return SimpleMatrix(data)
+    """Return an identity matrix in CSR form (O(n) storage).
+
+    ``format="operator"`` returns an :class:`~.operators.IdentityOperator`
+    instead, which stores no entries at all.
+    """
+    if format == "operator":
+        from .operators import IdentityOperator
+
+        return IdentityOperator(n)
+    return CSRMatrix.identity(n)
 
 
 def sparse_matvec_optimized(data, indices, indptr, x):
-    """Minimal sparse matrix-vector product used in stubs."""
-    result = [0.0 for _ in range(len(indptr) - 1)]
-    idx = 0
-    for i in range(len(indptr) - 1):
-        s = 0.0
-        for j in range(indptr[i], indptr[i + 1]):
-            s += data[j] * x[indices[j]]
-        result[i] = s
-    return result
+    """Sparse matrix-vector product over CSR buffers in O(nnz)."""
+    return kernels.csr_matvec(data, indices, indptr, x)
 
 
 def sparse_norm_optimized(data):
@@ -2,25 +2,222 @@
 
 from __future__ import annotations
 
-from typing import List, Tuple, Dict
-
-
-def repartition_blocks(
-    blocks_metadata: List[Tuple[str, int, int]],
-    dual_gaps: Dict[str, float],
-    max_block_size: int,
-):
-    new_metadata = []
-    for block_id, start, end in blocks_metadata:
-        size = end - start
-        gap = dual_gaps.get(block_id, 0)
-        if size > max_block_size and gap > 1e-3:
-            split_factor = 0.5 + min(gap, 1.0) / 4
-            mid = start + int(size * split_factor)
-            if mid <= start or mid >= end:
-                mid = start + size // 2
-            new_metadata.append((block_id, start, mid))
-            new_metadata.append((f"split_{block_id}", mid, end))
-        else:
-            new_metadata.append((block_id, start, end))
-    return new_metadata
+import itertools
+from array import array
+from bisect import bisect_left
+from typing import List, Sequence, Tuple, Dict
+
+
+def uniform_blocks(n: int, n_blocks: int) -> List[Tuple[str, int, int]]:
+    """Split ``n`` columns into ``n_blocks`` contiguous blocks of near-equal size."""
+    n_blocks = max(1, min(n_blocks, n))
+    bounds = [n * k // n_blocks for k in range(n_blocks + 1)]
+    return [(f"block_{k}", bounds[k], bounds[k + 1]) for k in range(n_blocks)]
+
+
+def column_costs(A, B, base: float = 1.0) -> List[float]:
+    """Static per-column work estimate: ``base`` plus the column's nnz in A and B.
+
+    A block's subproblem touches its columns of ``B`` and, through the
+    production model, its columns of ``A``; the constant ``base`` covers the
+    per-column work that does not depend on the sparsity pattern.
+    """
+    n = A.shape[1]
+    costs = [base] * n
+    for mat in (A, B):
+        for j in mat.indices:
+            costs[j] += 1.0
+    return costs
+
+
+def _prefix(costs: Sequence[float]) -> array:
+    out = array("d", [0.0])
+    total = 0.0
+    for c in costs:
+        total += c
+        out.append(total)
+    return out
+
+
+def balanced_blocks(costs: Sequence[float], n_blocks: int, prefix: str = "block_") -> List[Tuple[str, int, int]]:
+    """Contiguous blocks whose summed ``costs`` are as even as possible.
+
+    Boundaries are placed at the cost quantiles of the prefix sums (binary
+    search), so the cost is O(n + n_blocks log n).
+    """
+    n = len(costs)
+    n_blocks = max(1, min(n_blocks, n))
+    cum = _prefix(costs)
+    total = cum[-1]
+    bounds = [0]
+    for k in range(1, n_blocks):
+        pos = bisect_left(cum, total * k / n_blocks)
+        # keep every block non-empty
+        pos = min(max(pos, bounds[-1] + 1), n - (n_blocks - k))
+        bounds.append(pos)
+    bounds.append(n)
+    return [(f"{prefix}{k}", bounds[k], bounds[k + 1]) for k in range(n_blocks)]
+
+
+class BlockCostModel:
+    """Estimate subproblem cost of a column range.
+
+    The static estimate is the sum of :func:`column_costs` over the range.
+    Measured solve times turn it into seconds: every observed block gets a
+    smoothed rate (seconds per cost unit) and unobserved ranges use the
+    smoothed global rate. Rates are assumed uniform inside a block, so splits
+    and merges keep consistent estimates: the new blocks inherit the rate of
+    the blocks they came from, but only count as :meth:`measured` once they
+    have been timed themselves.
+    """
+
+    def __init__(self, costs: Sequence[float], smoothing: float = 0.5):
+        self._cum = _prefix(costs)
+        self.smoothing = smoothing
+        self.rate: float | None = None
+        self._rates: Dict[Tuple[int, int], float] = {}
+        # rates inherited through split/merge, used until the block is timed
+        self._inherited: Dict[Tuple[int, int], float] = {}
+
+    def static_cost(self, start: int, end: int) -> float:
+        return self._cum[end] - self._cum[start]
+
+    def observe(self, start: int, end: int, seconds: float) -> None:
+        static = self.static_cost(start, end)
+        if static <= 0:
+            return
+        rate = seconds / static
+        a = self.smoothing
+        old = self._rates.get((start, end))
+        self._rates[(start, end)] = rate if old is None else a * rate + (1 - a) * old
+        self._inherited.pop((start, end), None)
+        self.rate = rate if self.rate is None else a * rate + (1 - a) * self.rate
+
+    def block_rate(self, start: int, end: int) -> float:
+        rate = self._rates.get((start, end))
+        if rate is None:
+            rate = self._inherited.get((start, end))
+        if rate is None:
+            rate = self.rate if self.rate is not None else 1.0
+        return rate
+
+    def cost(self, start: int, end: int) -> float:
+        return self.static_cost(start, end) * self.block_rate(start, end)
+
+    def measured(self, start: int, end: int) -> bool:
+        return (start, end) in self._rates
+
+    def split_point(self, start: int, end: int) -> int:
+        """Column that halves the estimated cost of ``[start, end)``."""
+        half = (self._cum[start] + self._cum[end]) / 2
+        mid = bisect_left(self._cum, half, start + 1, end)
+        return min(max(mid, start + 1), end - 1)
+
+    def _inherit(self, start: int, end: int, rate: float) -> None:
+        if (start, end) not in self._rates:
+            self._inherited[(start, end)] = rate
+
+    def split(self, start: int, end: int) -> int:
+        mid = self.split_point(start, end)
+        rate = self.block_rate(start, end)
+        self._inherit(start, mid, rate)
+        self._inherit(mid, end, rate)
+        return mid
+
+    def merge(self, start: int, mid: int, end: int) -> None:
+        left, right = self.cost(start, mid), self.cost(mid, end)
+        static = self.static_cost(start, end)
+        if static > 0:
+            self._inherit(start, end, (left + right) / static)
+
+
+class CostPartitioner:
+    """Keep a block partition balanced for ``n_workers`` processes.
+
+    :meth:`initial` splits the columns into ``n_workers * blocks_per_worker``
+    blocks of equal static cost. :meth:`rebalance` feeds measured solve times
+    into the :class:`BlockCostModel`; once every block has been measured and
+    the heaviest block exceeds the mean by more than ``tolerance`` (and
+    ``min_seconds`` in absolute terms), the heaviest blocks are split at
+    their cost midpoint and adjacent light blocks are merged while the
+    result stays within the target. Changed blocks get fresh ids so cuts of
+    the old blocks are not applied to different columns.
+    """
+
+    def __init__(
+        self,
+        costs: Sequence[float],
+        n_workers: int,
+        blocks_per_worker: int = 1,
+        tolerance: float = 0.25,
+        min_seconds: float = 0.0,
+        max_blocks: int | None = None,
+    ):
+        self.model = BlockCostModel(costs)
+        self.n = len(costs)
+        self.n_target = max(1, min(n_workers * blocks_per_worker, self.n))
+        self.tolerance = tolerance
+        self.min_seconds = min_seconds
+        self.max_blocks = max_blocks or 4 * self.n_target
+        self.splits = 0
+        self.merges = 0
+        self._ids = itertools.count()
+        self._costs = costs
+
+    def _new_id(self) -> str:
+        return f"part_{next(self._ids)}"
+
+    def initial(self) -> List[Tuple[str, int, int]]:
+        return balanced_blocks(self._costs, self.n_target)
+
+    def observe(self, blocks_metadata, solve_times: Dict[str, float]) -> None:
+        for block_id, start, end in blocks_metadata:
+            seconds = solve_times.get(block_id)
+            if seconds is not None:
+                self.model.observe(start, end, seconds)
+
+    def imbalance(self, blocks_metadata) -> float:
+        costs = [self.model.cost(s, e) for _, s, e in blocks_metadata]
+        mean = sum(costs) / len(costs) if costs else 0.0
+        return max(costs) / mean if mean > 0 else 1.0
+
+    def rebalance(self, blocks_metadata, solve_times: Dict[str, float] | None = None):
+        """Return a rebalanced partition, or ``blocks_metadata`` if it is fine."""
+        if solve_times:
+            self.observe(blocks_metadata, solve_times)
+        model = self.model
+        if not all(model.measured(s, e) for _, s, e in blocks_metadata):
+            return blocks_metadata
+        costs = [model.cost(s, e) for _, s, e in blocks_metadata]
+        if max(costs, default=0.0) < self.min_seconds:
+            return blocks_metadata
+        if self.imbalance(blocks_metadata) <= 1.0 + self.tolerance:
+            return blocks_metadata
+
+        limit = (1.0 + self.tolerance) * sum(costs) / self.n_target
+        blocks = [list(b) for b in blocks_metadata]
+        changed = False
+        # split the heaviest block while it is over the limit
+        while len(blocks) < self.max_blocks:
+            idx = max(range(len(blocks)), key=lambda i: model.cost(blocks[i][1], blocks[i][2]))
+            block_id, start, end = blocks[idx]
+            if end - start < 2 or model.cost(start, end) <= limit:
+                break
+            mid = model.split(start, end)
+            blocks[idx:idx + 1] = [[self._new_id(), start, mid], [self._new_id(), mid, end]]
+            self.splits += 1
+            changed = True
+        # merge the cheapest adjacent pair while there are surplus blocks
+        while len(blocks) > self.n_target:
+            costs = [model.cost(s, e) for _, s, e in blocks]
+            pair = min(range(len(blocks) - 1), key=lambda i: costs[i] + costs[i + 1])
+            if costs[pair] + costs[pair + 1] > limit:
+                break
+            start, mid, end = blocks[pair][1], blocks[pair][2], blocks[pair + 1][2]
+            model.merge(start, mid, end)
+            blocks[pair:pair + 2] = [[self._new_id(), start, end]]
+            self.merges += 1
+            changed = True
+        if not changed:
+            return blocks_metadata
+        return [tuple(b) for b in blocks]
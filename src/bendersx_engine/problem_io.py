@@ -0,0 +1,206 @@
+"""Versioned binary problem files that load through ``mmap``.
+
+A problem file stores the CSR buffers of ``A`` and ``B`` together with
+``total_r``, the block metadata and the matrix generation parameters::
+
+    magic (8 bytes) | version (u32) | header length (u32) | JSON header
+    | padding to 8 bytes | A: data, indices, indptr | B: ... | total_r
+
+The JSON header records the byte order, the shapes and ``nnz`` of both
+matrices and the offset of every section. :func:`load_problem` maps the file
+read-only and returns matrices whose buffers are ``memoryview`` casts of the
+mapping, so opening a model costs a header parse regardless of its size. The
+metadata in :attr:`Problem.A_meta`/:attr:`Problem.B_meta` can be handed to a
+:class:`~bendersx_engine.executor.SubproblemExecutor`; worker processes then
+map the same file instead of copying the matrices.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+import sys
+from array import array
+from dataclasses import dataclass, field, fields
+from typing import Dict, List, Sequence, Tuple
+
+from .config import PlanwirtschaftParams
+from .shared_memory import _layout, csr_from_shared, release_shared
+from .simple_matrix import CSRMatrix, as_csr
+
+MAGIC = b"BXPROB\x00\x00"
+FORMAT_VERSION = 1
+_PREAMBLE = struct.Struct("<8sII")
+_ALIGN = 8
+
+
+@dataclass
+class Problem:
+    """A loaded problem; call :meth:`close` (or use ``with``) to unmap it."""
+
+    A: CSRMatrix
+    B: CSRMatrix
+    total_r: List[float]
+    blocks_metadata: List[Tuple[str, int, int]] | None = None
+    params: PlanwirtschaftParams | dict | None = None
+    A_meta: Dict[str, object] = field(default_factory=dict)
+    B_meta: Dict[str, object] = field(default_factory=dict)
+
+    @property
+    def n(self) -> int:
+        return self.A.shape[0]
+
+    @property
+    def m0(self) -> int:
+        return self.B.shape[0]
+
+    def close(self) -> None:
+        for meta in (self.A_meta, self.B_meta):
+            if meta:
+                release_shared(meta)
+        self.A_meta = {}
+        self.B_meta = {}
+
+    def __enter__(self) -> "Problem":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _pad(offset: int) -> int:
+    return -offset % _ALIGN
+
+
+def _int_keys(value):
+    """Undo JSON's conversion of integer dict keys to strings."""
+    if isinstance(value, dict):
+        return {
+            (int(k) if isinstance(k, str) and k.lstrip("-").isdigit() else k): _int_keys(v)
+            for k, v in value.items()
+        }
+    if isinstance(value, list):
+        return [_int_keys(v) for v in value]
+    return value
+
+
+def _encode_params(params) -> Dict[str, object] | None:
+    if params is None:
+        return None
+    if isinstance(params, PlanwirtschaftParams):
+        return {"type": "PlanwirtschaftParams", "values": params.to_dict()}
+    return {"type": "dict", "values": dict(params)}
+
+
+def _decode_params(encoded):
+    if encoded is None:
+        return None
+    values = _int_keys(encoded["values"])
+    if encoded["type"] == "PlanwirtschaftParams":
+        known = {f.name for f in fields(PlanwirtschaftParams)}
+        return PlanwirtschaftParams(**{k: v for k, v in values.items() if k in known})
+    return values
+
+
+def save_problem(
+    path: str,
+    A,
+    B,
+    total_r: Sequence[float],
+    blocks_metadata: Sequence[Tuple[str, int, int]] | None = None,
+    params: PlanwirtschaftParams | dict | None = None,
+) -> None:
+    """Write ``A``, ``B``, ``total_r`` and optional metadata to ``path``."""
+    mats = {"A": as_csr(A), "B": as_csr(B)}
+    total = array("d", (float(v) for v in total_r))
+    header = {
+        "version": FORMAT_VERSION,
+        "byteorder": sys.byteorder,
+        "itemsize": {"d": array("d").itemsize, "i": array("i").itemsize},
+        "matrices": {},
+        "total_r": {"length": len(total)},
+        "blocks_metadata": [list(b) for b in blocks_metadata] if blocks_metadata is not None else None,
+        "params": _encode_params(params),
+    }
+
+    # Offsets depend on the header length, which depends on the offsets;
+    # iterate until the header size is stable.
+    offsets_size = -1
+    while True:
+        encoded = json.dumps(header, sort_keys=True).encode("utf-8")
+        start = _PREAMBLE.size + len(encoded)
+        start += _pad(start)
+        if start == offsets_size:
+            break
+        offsets_size = start
+        offset = start
+        for name, mat in mats.items():
+            size = sum(_layout(mat.shape, mat.nnz))
+            header["matrices"][name] = {"shape": list(mat.shape), "nnz": mat.nnz, "offset": offset}
+            offset += size + _pad(size)
+        header["total_r"]["offset"] = offset
+
+    with open(path, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(encoded)))
+        f.write(encoded)
+        f.write(b"\x00" * (start - _PREAMBLE.size - len(encoded)))
+        for mat in mats.values():
+            size = 0
+            for buf, code in ((mat.data, "d"), (mat.indices, "i"), (mat.indptr, "i")):
+                chunk = array(code, buf).tobytes()
+                f.write(chunk)
+                size += len(chunk)
+            f.write(b"\x00" * _pad(size))
+        f.write(total.tobytes())
+
+
+def read_header(path: str) -> Dict[str, object]:
+    """Return the JSON header of a problem file after validating it."""
+    with open(path, "rb") as f:
+        preamble = f.read(_PREAMBLE.size)
+        if len(preamble) != _PREAMBLE.size:
+            raise ValueError(f"{path} is not a problem file")
+        magic, version, length = _PREAMBLE.unpack(preamble)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a problem file")
+        if version > FORMAT_VERSION:
+            raise ValueError(f"unsupported problem file version {version}")
+        header = json.loads(f.read(length).decode("utf-8"))
+    if header["byteorder"] != sys.byteorder:
+        raise ValueError(f"{path} was written on a {header['byteorder']}-endian machine")
+    if header["itemsize"] != {"d": array("d").itemsize, "i": array("i").itemsize}:
+        raise ValueError(f"{path} uses incompatible array item sizes")
+    return header
+
+
+def load_problem(path: str) -> Problem:
+    """Memory-map the problem stored at ``path``.
+
+    ``A`` and ``B`` are read-only views of the file; copy them (for example
+    with ``CSRMatrix(problem.A)``) before modifying.
+    """
+    header = read_header(path)
+    metas = {}
+    for name, info in header["matrices"].items():
+        metas[name] = {
+            "name": name,
+            "path": path,
+            "offset": info["offset"],
+            "shape": tuple(info["shape"]),
+            "nnz": info["nnz"],
+        }
+    total_info = header["total_r"]
+    total = array("d")
+    with open(path, "rb") as f:
+        f.seek(total_info["offset"])
+        total.frombytes(f.read(total_info["length"] * total.itemsize))
+    blocks = header.get("blocks_metadata")
+    return Problem(
+        A=csr_from_shared(metas["A"]),
+        B=csr_from_shared(metas["B"]),
+        total_r=total.tolist(),
+        blocks_metadata=[tuple(b) for b in blocks] if blocks is not None else None,
+        params=_decode_params(header.get("params")),
+        A_meta=metas["A"],
+        B_meta=metas["B"],
+    )
@@ -0,0 +1,150 @@
+"""Timing-based scheduling of subproblem tasks onto workers."""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+
+class TaskScheduler:
+    """Order, chunk and place ``(block_id, start, end, r_i)`` tasks.
+
+    Every solve time reported through :meth:`record` updates a smoothed
+    expected time per block (blocks never seen are estimated from the mean
+    time per column). Dispatch follows the longest-processing-time-first
+    rule, so a heavy block does not start last and stretch the iteration.
+
+    * :meth:`chunksize` grows chunks only when tasks are short compared to
+      the measured per-task dispatch overhead.
+    * :meth:`assign` places tasks on individual workers for pinned pools: a
+      block stays on its previous worker unless that would push the worker
+      more than ``pin_tolerance`` above the ideal makespan, otherwise it goes
+      to the least loaded worker (greedy LPT).
+    * :meth:`record_batch` keeps per-iteration makespan and utilization.
+    """
+
+    def __init__(
+        self,
+        n_workers: int,
+        smoothing: float = 0.5,
+        pin_tolerance: float = 0.1,
+        history: int = 32,
+    ):
+        self.n_workers = max(1, n_workers)
+        self.smoothing = smoothing
+        self.pin_tolerance = pin_tolerance
+        self.expected: Dict[str, float] = {}
+        self.pinned: Dict[str, int] = {}
+        self.overhead = 5e-4  # seconds of dispatch cost per task, refined per batch
+        self._time_per_column: float | None = None
+        # one {block_id: seconds} dict per iteration
+        self.iterations: deque = deque(maxlen=history)
+        self._current: Dict[str, float] = {}
+        self.makespans: List[float] = []
+        self.busy: List[float] = []
+
+    # ------------------------------------------------------------------
+    # measurements
+    # ------------------------------------------------------------------
+    def record(self, block_id: str, seconds: float, columns: int | None = None) -> None:
+        a = self.smoothing
+        old = self.expected.get(block_id)
+        self.expected[block_id] = seconds if old is None else a * seconds + (1 - a) * old
+        self._current[block_id] = seconds
+        if columns:
+            rate = seconds / columns
+            tpc = self._time_per_column
+            self._time_per_column = rate if tpc is None else a * rate + (1 - a) * tpc
+
+    def end_iteration(self) -> None:
+        if self._current:
+            self.iterations.append(self._current)
+            self._current = {}
+
+    def record_batch(self, wall: float, busy_by_worker: Dict[object, float], n_tasks: int) -> None:
+        """Store the makespan of one dispatch round and refine ``overhead``."""
+        if n_tasks <= 0:
+            return
+        busy = sum(busy_by_worker.values())
+        self.makespans.append(wall)
+        self.busy.append(busy)
+        longest = max(busy_by_worker.values(), default=0.0)
+        per_worker = math.ceil(n_tasks / self.n_workers)
+        overhead = max(0.0, wall - longest) / per_worker
+        self.overhead = self.smoothing * overhead + (1 - self.smoothing) * self.overhead
+
+    # ------------------------------------------------------------------
+    # decisions
+    # ------------------------------------------------------------------
+    def estimate(self, task: Tuple) -> float:
+        block_id, start, end = task[0], task[1], task[2]
+        seconds = self.expected.get(block_id)
+        if seconds is not None:
+            return seconds
+        if self._time_per_column is not None:
+            return self._time_per_column * (end - start)
+        # nothing measured yet: larger blocks first
+        return float(end - start)
+
+    def order(self, tasks: Sequence[Tuple]) -> List[int]:
+        """Indices of ``tasks`` in longest-expected-first order."""
+        return sorted(range(len(tasks)), key=lambda i: (-self.estimate(tasks[i]), i))
+
+    def chunksize(self, tasks: Sequence[Tuple]) -> int:
+        if not tasks or not self.expected:
+            return 1
+        mean = sum(self.estimate(t) for t in tasks) / len(tasks)
+        limit = max(1, len(tasks) // (2 * self.n_workers))
+        if mean <= 0:
+            return limit
+        return max(1, min(limit, int(self.overhead / mean)))
+
+    def assign(self, tasks: Sequence[Tuple]) -> List[List[int]]:
+        """Per-worker lists of task indices, each in LPT order."""
+        order = self.order(tasks)
+        est = {i: self.estimate(tasks[i]) for i in order}
+        total = sum(est.values())
+        ideal = max(total / self.n_workers, max(est.values(), default=0.0))
+        bound = (1.0 + self.pin_tolerance) * ideal
+        load = [0.0] * self.n_workers
+        plan: List[List[int]] = [[] for _ in range(self.n_workers)]
+        for i in order:
+            block_id = tasks[i][0]
+            worker = self.pinned.get(block_id)
+            if worker is None or worker >= self.n_workers or load[worker] + est[i] > bound:
+                worker = min(range(self.n_workers), key=lambda w: (load[w], w))
+            load[worker] += est[i]
+            plan[worker].append(i)
+            self.pinned[block_id] = worker
+        return plan
+
+    def forget(self, live_blocks: Iterable[str]) -> None:
+        """Drop estimates and pins of blocks that no longer exist."""
+        live = set(live_blocks)
+        for table in (self.expected, self.pinned):
+            for block_id in [b for b in table if b not in live]:
+                del table[block_id]
+
+    # ------------------------------------------------------------------
+    # reporting
+    # ------------------------------------------------------------------
+    def stats(self, since: int = 0, rounds: Sequence[int] | None = None) -> Dict[str, object]:
+        """Makespan (sum over dispatch rounds) and mean worker utilization.
+
+        ``since`` skips earlier rounds, e.g. those of a previous solve that
+        reused the same executor. ``rounds`` instead selects the indices of
+        the rounds to report, e.g. those one of several interleaved solves
+        took part in.
+        """
+        if rounds is None:
+            rounds = range(since, len(self.makespans))
+        makespans = [self.makespans[i] for i in rounds]
+        total = sum(makespans)
+        capacity = self.n_workers * total
+        busy = sum(self.busy[i] for i in rounds)
+        return {
+            "makespan": total,
+            "makespan_history": makespans,
+            "worker_utilization": busy / capacity if capacity > 0 else 0.0,
+        }
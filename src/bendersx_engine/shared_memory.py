@@ -1,21 +1,169 @@
-"""Simplified shared memory helpers for tests."""
+"""Cross-process shared memory for CSR matrices.
+
+``csr_to_shared`` copies the ``data``/``indices``/``indptr`` buffers of a
+matrix into a single :mod:`multiprocessing.shared_memory` segment and returns a
+small picklable metadata dict. ``csr_from_shared`` attaches to that segment and
+wraps zero-copy ``memoryview`` casts of it in a :class:`CSRMatrix`, so every
+worker process reads the same physical pages. Segments are reference counted
+per process; the creating process unlinks a segment once its count drops to
+zero or when ``cleanup_shared_memory`` is called.
+
+Where no pool needs the matrices, or shared memory is unavailable,
+``csr_to_local`` wraps the matrix itself in the metadata instead: the current
+process uses it directly and pool workers receive a pickled copy.
+
+Metadata carrying a ``path`` and ``offset`` instead of ``shm_name`` describes
+a matrix stored in a problem file (see :mod:`problem_io`); it is attached
+through a read-only :mod:`mmap` with the same layout, so every process shares
+the page cache of the file.
+"""
 
 from __future__ import annotations
 
-from typing import Dict, Any, cast
-from .simple_matrix import SimpleMatrix
+import mmap
+import os
+from array import array
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, Any, List
+
+from .simple_matrix import CSRMatrix, as_csr
+
+_DATA_ITEMSIZE = array("d").itemsize
+_INDEX_ITEMSIZE = array("i").itemsize
+
+
+@dataclass
+class _Segment:
+    shm: shared_memory.SharedMemory | mmap.mmap
+    matrix: CSRMatrix
+    refs: int
+    owner_pid: int | None
+
+
+_shared_store: Dict[str, _Segment] = {}
+_retired: List[shared_memory.SharedMemory | mmap.mmap] = []
+
+
+def _layout(shape, nnz: int):
+    data_bytes = nnz * _DATA_ITEMSIZE
+    index_bytes = nnz * _INDEX_ITEMSIZE
+    indptr_bytes = (shape[0] + 1) * _INDEX_ITEMSIZE
+    return data_bytes, index_bytes, indptr_bytes
+
+
+def _views(buf: memoryview, meta: Dict[str, Any], offset: int = 0) -> CSRMatrix:
+    shape = tuple(meta["shape"])
+    data_bytes, index_bytes, indptr_bytes = _layout(shape, meta["nnz"])
+    data = buf[offset:offset + data_bytes].cast("d")
+    off = offset + data_bytes
+    indices = buf[off:off + index_bytes].cast("i")
+    off += index_bytes
+    indptr = buf[off:off + indptr_bytes].cast("i")
+    return CSRMatrix.from_buffers(data, indices, indptr, shape)
+
+
+def _segment_key(meta: Dict[str, Any]) -> str:
+    if "shm_name" in meta:
+        return meta["shm_name"]
+    return f"{os.path.abspath(meta['path'])}@{meta['offset']}"
+
+
+def _attach_file(meta: Dict[str, Any]):
+    with open(meta["path"], "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    with memoryview(mm) as buf:
+        mat = _views(buf, meta, meta["offset"])
+    return mm, mat
+
+
+def csr_to_shared(name_prefix: str, csr_matrix) -> Dict[str, object]:
+    """Copy ``csr_matrix`` into a new shared memory segment."""
+    mat = as_csr(csr_matrix)
+    shape = mat.shape
+    nnz = mat.nnz
+    data_bytes, index_bytes, indptr_bytes = _layout(shape, nnz)
+    size = max(1, data_bytes + index_bytes + indptr_bytes)
+    shm = shared_memory.SharedMemory(create=True, size=size)
+    meta = {"name": name_prefix, "shm_name": shm.name, "shape": shape, "nnz": nnz}
+
+    views = _views(shm.buf, meta)
+    views.data[:] = array("d", mat.data)
+    views.indices[:] = array("i", mat.indices)
+    views.indptr[:] = array("i", mat.indptr)
+    views.data.release()
+    views.indices.release()
+    views.indptr.release()
+
+    # The creating process keeps using its private copy; handing out views
+    # here would pin the mapping and prevent ``close`` during cleanup.
+    _shared_store[shm.name] = _Segment(shm, mat, 1, os.getpid())
+    return meta
+
+
+def csr_to_local(name_prefix: str, csr_matrix) -> Dict[str, object]:
+    """Metadata carrying ``csr_matrix`` itself, without a shared segment."""
+    mat = as_csr(csr_matrix)
+    if isinstance(mat.data, memoryview):
+        mat = mat.copy()  # views cannot be pickled for pool workers
+    return {"name": name_prefix, "matrix": mat, "shape": mat.shape, "nnz": mat.nnz}
+
 
-_shared_store: Dict[str, SimpleMatrix] = {}
+def csr_from_shared(meta: Dict[str, Any]) -> CSRMatrix:
+    """Return a matrix backed by the shared segment described by ``meta``."""
+    if "matrix" in meta:
+        return meta["matrix"]
+    key = _segment_key(meta)
+    seg = _shared_store.get(key)
+    if seg is not None and (seg.owner_pid is None or seg.owner_pid == os.getpid()):
+        seg.refs += 1
+        return seg.matrix
+    if "shm_name" in meta:
+        shm = shared_memory.SharedMemory(name=key)
+        mat = _views(shm.buf, meta)
+    else:
+        shm, mat = _attach_file(meta)
+    _shared_store[key] = _Segment(shm, mat, 1, None)
+    return mat
 
 
-def csr_to_shared(name_prefix: str, csr_matrix: SimpleMatrix) -> Dict[str, object]:
-    _shared_store[name_prefix] = csr_matrix
-    return {"name": name_prefix}
+def _close(seg: _Segment, unlink: bool) -> None:
+    if seg.owner_pid is None:
+        for buf in (seg.matrix.data, seg.matrix.indices, seg.matrix.indptr):
+            try:
+                buf.release()
+            except (AttributeError, BufferError):  # pragma: no cover - caller holds a slice
+                pass
+    try:
+        seg.shm.close()
+    except BufferError:
+        # Views are still referenced elsewhere; keep the mapping alive.
+        _retired.append(seg.shm)
+    if unlink:
+        try:
+            seg.shm.unlink()
+        except FileNotFoundError:  # pragma: no cover - already removed
+            pass
 
 
-def csr_from_shared(meta: Dict[str, Any]) -> SimpleMatrix:
-    return cast(SimpleMatrix, _shared_store.get(meta["name"]))
+def release_shared(meta: Dict[str, Any]) -> None:
+    """Drop one reference to a segment, unlinking it when no longer used."""
+    if "matrix" in meta:
+        return
+    key = _segment_key(meta)
+    seg = _shared_store.get(key)
+    if seg is None:
+        return
+    seg.refs -= 1
+    if seg.refs <= 0:
+        del _shared_store[key]
+        _close(seg, unlink=seg.owner_pid == os.getpid())
 
 
 def cleanup_shared_memory() -> None:
+    """Close every segment known to this process and unlink the owned ones."""
+    pid = os.getpid()
+    for seg in list(_shared_store.values()):
+        if seg.owner_pid is None or seg.owner_pid == pid:
+            _close(seg, unlink=seg.owner_pid == pid)
     _shared_store.clear()
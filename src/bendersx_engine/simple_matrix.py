@@ -1,3 +1,12 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Iterator, List, Mapping, Sequence, Tuple
+
+from . import kernels
+
+
 class SimpleMatrix:
     """Very small stand-in for scipy.sparse matrices used in tests."""
 
@@ -22,3 +31,367 @@ class SimpleMatrix:
                 if self.data[i][j] != other.data[i][j]:
                     diff += 1
         return type("Diff", (), {"nnz": diff})()
+
+
+class CSRMatrix:
+    """Compressed sparse row matrix backed by flat ``array`` buffers.
+
+    ``data`` holds the non-zero values (``array('d')``), ``indices`` their
+    column positions (``array('i')``) and ``indptr`` the row offsets into both
+    buffers. Column indices are kept sorted within each row so single entries
+    and column ranges can be located by binary search. Any object supporting
+    the sequence protocol (e.g. a ``memoryview``) may back the buffers, which
+    allows zero-copy views onto shared or memory-mapped storage; wrap such
+    buffers with :meth:`from_buffers`. The constructor itself only takes
+    another matrix or dense rows (any sequence of sequences).
+
+    Structural edits (:meth:`set_row`, :meth:`set_rows`, inserting entries) copy view-backed
+    buffers into private arrays first. Value updates in place (assigning an
+    existing entry, the ``scale*`` methods) write through writable views and
+    raise ``ValueError`` on read-only ones such as a mapped problem file.
+    """
+
+    def __init__(self, arg=None, shape: Tuple[int, int] | None = None):
+        if isinstance(arg, CSRMatrix):
+            self.data = array("d", arg.data)
+            self.indices = array("i", arg.indices)
+            self.indptr = array("i", arg.indptr)
+            self._shape = arg.shape
+        else:
+            rows = arg.data if isinstance(arg, SimpleMatrix) else (arg or [])
+            rows = [list(row) for row in rows]
+            n_rows = len(rows)
+            n_cols = len(rows[0]) if rows else 0
+            if shape is not None:
+                n_rows, n_cols = int(shape[0]), int(shape[1])
+            self.data = array("d")
+            self.indices = array("i")
+            self.indptr = array("i", [0])
+            for row in rows:
+                for j, val in enumerate(row):
+                    if val != 0:
+                        self.data.append(val)
+                        self.indices.append(j)
+                self.indptr.append(len(self.data))
+            for _ in range(len(rows), n_rows):
+                self.indptr.append(len(self.data))
+            self._shape = (n_rows, n_cols)
+
+    @classmethod
+    def from_buffers(cls, data, indices, indptr, shape: Tuple[int, int]) -> "CSRMatrix":
+        """Wrap existing buffers without copying them."""
+        mat = cls.__new__(cls)
+        mat.data = data
+        mat.indices = indices
+        mat.indptr = indptr
+        mat._shape = (int(shape[0]), int(shape[1]))
+        return mat
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Iterable[Tuple[int, float]]], shape: Tuple[int, int]) -> "CSRMatrix":
+        """Build a matrix from per-row ``(column, value)`` pairs."""
+        data = array("d")
+        indices = array("i")
+        indptr = array("i", [0])
+        for items in rows:
+            for j, val in sorted(items):
+                if val != 0:
+                    indices.append(j)
+                    data.append(val)
+            indptr.append(len(data))
+        for _ in range(len(indptr) - 1, shape[0]):
+            indptr.append(len(data))
+        return cls.from_buffers(data, indices, indptr, shape)
+
+    @classmethod
+    def identity(cls, n: int) -> "CSRMatrix":
+        return cls.from_buffers(
+            array("d", [1.0]) * n, array("i", range(n)), array("i", range(n + 1)), (n, n)
+        )
+
+    @property
+    def shape(self):
+        return self._shape
+
+    @property
+    def nnz(self) -> int:
+        return len(self.data)
+
+    def copy(self) -> "CSRMatrix":
+        return CSRMatrix(self)
+
+    def _check_writable(self) -> None:
+        if getattr(self.data, "readonly", False):
+            raise ValueError(
+                "matrix values are a read-only view (e.g. a mapped problem file); "
+                "use copy() for a writable matrix"
+            )
+
+    # ------------------------------------------------------------------
+    # element and row/column access
+    # ------------------------------------------------------------------
+    def _row_range(self, i: int, start: int = 0, end: int | None = None) -> Tuple[int, int]:
+        """Return the buffer positions of row ``i`` covering columns ``[start, end)``."""
+        lo = self.indptr[i]
+        hi = self.indptr[i + 1]
+        if start > 0:
+            lo = bisect_left(self.indices, start, lo, hi)
+        if end is not None and end < self._shape[1]:
+            hi = bisect_left(self.indices, end, lo, hi)
+        return lo, hi
+
+    def _find(self, i: int, j: int) -> int:
+        lo = self.indptr[i]
+        hi = self.indptr[i + 1]
+        pos = bisect_left(self.indices, j, lo, hi)
+        if pos < hi and self.indices[pos] == j:
+            return pos
+        return -1
+
+    def __getitem__(self, key) -> float:
+        i, j = key
+        pos = self._find(i, j)
+        return self.data[pos] if pos >= 0 else 0.0
+
+    def __setitem__(self, key, value: float) -> None:
+        i, j = key
+        pos = self._find(i, j)
+        if pos >= 0:
+            self._check_writable()
+            self.data[pos] = value
+        elif value != 0:
+            cols = list(self.indices[self.indptr[i]:self.indptr[i + 1]])
+            vals = list(self.data[self.indptr[i]:self.indptr[i + 1]])
+            cols.append(j)
+            vals.append(value)
+            self.set_row(i, cols, vals)
+
+    def row_items(self, i: int) -> Iterator[Tuple[int, float]]:
+        """Iterate over the ``(column, value)`` pairs stored in row ``i``."""
+        for pos in range(self.indptr[i], self.indptr[i + 1]):
+            yield self.indices[pos], self.data[pos]
+
+    def row_nnz(self, i: int) -> int:
+        return self.indptr[i + 1] - self.indptr[i]
+
+    def getrow(self, i: int) -> List[float]:
+        """Return row ``i`` as a dense Python list."""
+        row = [0.0] * self._shape[1]
+        for j, val in self.row_items(i):
+            row[j] = val
+        return row
+
+    def getcol(self, j: int) -> List[float]:
+        """Return column ``j`` as a dense Python list."""
+        return [self[i, j] for i in range(self._shape[0])]
+
+    def toarray(self) -> List[List[float]]:
+        return [self.getrow(i) for i in range(self._shape[0])]
+
+    def set_row(self, i: int, cols: Sequence[int], vals: Sequence[float]) -> None:
+        """Replace the contents of row ``i``; later duplicates overwrite earlier ones.
+
+        Costs O(nnz): the buffers are rebuilt as new arrays, so a view-backed
+        matrix becomes a private copy. Use :meth:`set_rows` to replace several
+        rows in one rebuild.
+        """
+        self.set_rows({i: zip(cols, vals)})
+
+    def set_rows(self, rows: Mapping[int, Iterable[Tuple[int, float]]]) -> None:
+        """Replace every row ``i`` in ``rows`` by its ``(column, value)`` pairs.
+
+        All rows are written in a single O(nnz + n_rows) rebuild of the
+        buffers; within a row later duplicates overwrite earlier ones.
+        """
+        new_rows = {}
+        for i, items in rows.items():
+            merged = dict(items)
+            new_rows[i] = sorted((j, v) for j, v in merged.items() if v != 0)
+        data = array("d")
+        indices = array("i")
+        indptr = array("i", [0])
+        prev = 0
+        for i in sorted(new_rows):
+            lo, hi = self.indptr[i], self.indptr[i + 1]
+            data.extend(self.data[prev:lo])
+            indices.extend(self.indices[prev:lo])
+            delta = len(data) - lo
+            indptr.extend(p + delta for p in self.indptr[len(indptr):i + 1])
+            data.extend(v for _, v in new_rows[i])
+            indices.extend(j for j, _ in new_rows[i])
+            indptr.append(len(data))
+            prev = hi
+        data.extend(self.data[prev:])
+        indices.extend(self.indices[prev:])
+        delta = len(data) - len(self.data)
+        indptr.extend(p + delta for p in self.indptr[len(indptr):])
+        self.data, self.indices, self.indptr = data, indices, indptr
+
+    def setdiag(self, diag_vals) -> None:
+        """Set the main diagonal in a single O(nnz + n) pass."""
+        diag = list(diag_vals)[: min(self._shape)]
+        data = array("d")
+        indices = array("i")
+        indptr = array("i", [0])
+        for i in range(self._shape[0]):
+            lo, hi = self.indptr[i], self.indptr[i + 1]
+            if i < len(diag):
+                pos = bisect_left(self.indices, i, lo, hi)
+                data.extend(self.data[lo:pos])
+                indices.extend(self.indices[lo:pos])
+                if diag[i] != 0:
+                    data.append(diag[i])
+                    indices.append(i)
+                if pos < hi and self.indices[pos] == i:
+                    pos += 1
+                data.extend(self.data[pos:hi])
+                indices.extend(self.indices[pos:hi])
+            else:
+                data.extend(self.data[lo:hi])
+                indices.extend(self.indices[lo:hi])
+            indptr.append(len(data))
+        self.data, self.indices, self.indptr = data, indices, indptr
+
+    def column_slice(self, start: int, end: int) -> "CSRMatrix":
+        """Return columns ``[start, end)`` as a new matrix with rebased indices."""
+        data = array("d")
+        indices = array("i")
+        indptr = array("i", [0])
+        for i in range(self._shape[0]):
+            lo, hi = self._row_range(i, start, end)
+            data.extend(self.data[lo:hi])
+            indices.extend(j - start for j in self.indices[lo:hi])
+            indptr.append(len(data))
+        return CSRMatrix.from_buffers(data, indices, indptr, (self._shape[0], max(0, end - start)))
+
+    def diagonal_block(self, start: int, end: int) -> "CSRMatrix":
+        """Return ``M[start:end, start:end]`` with rebased indices."""
+        data = array("d")
+        indices = array("i")
+        indptr = array("i", [0])
+        for i in range(start, end):
+            lo, hi = self._row_range(i, start, end)
+            data.extend(self.data[lo:hi])
+            indices.extend(j - start for j in self.indices[lo:hi])
+            indptr.append(len(data))
+        size = max(0, end - start)
+        return CSRMatrix.from_buffers(data, indices, indptr, (size, size))
+
+    def permuted(
+        self, row_perm: Sequence[int] | None = None, col_perm: Sequence[int] | None = None
+    ) -> "CSRMatrix":
+        """Return ``M[row_perm][:, col_perm]``.
+
+        ``perm[new] = old``; row ``i`` of the result is row ``row_perm[i]`` of
+        this matrix and column ``j`` is column ``col_perm[j]``.
+        """
+        rows, cols = self._shape
+        if row_perm is None:
+            row_perm = range(rows)
+        new_col = None
+        if col_perm is not None:
+            new_col = [0] * cols
+            for new, old in enumerate(col_perm):
+                new_col[old] = new
+        data = array("d")
+        indices = array("i")
+        indptr = array("i", [0])
+        for old in row_perm:
+            lo, hi = self.indptr[old], self.indptr[old + 1]
+            if new_col is None:
+                indices.extend(self.indices[lo:hi])
+                data.extend(self.data[lo:hi])
+            else:
+                entries = sorted(zip((new_col[j] for j in self.indices[lo:hi]), self.data[lo:hi]))
+                indices.extend(j for j, _ in entries)
+                data.extend(v for _, v in entries)
+            indptr.append(len(data))
+        return CSRMatrix.from_buffers(data, indices, indptr, (len(indptr) - 1, cols))
+
+    # ------------------------------------------------------------------
+    # reductions and scaling, all O(nnz)
+    # ------------------------------------------------------------------
+    def row_sums(self, start: int = 0, end: int | None = None) -> List[float]:
+        """Row sums restricted to columns ``[start, end)``."""
+        return kernels.row_sums(self.data, self.indices, self.indptr, self._shape[1], start, end)
+
+    def column_sums(self) -> List[float]:
+        return kernels.column_sums(self.data, self.indices, self._shape[1])
+
+    def max_abs(self) -> float:
+        return max((abs(v) for v in self.data), default=0.0)
+
+    def scale(self, factor: float) -> None:
+        self._check_writable()
+        data = self.data
+        for pos in range(len(data)):
+            data[pos] *= factor
+
+    def scale_rows(self, factors: Sequence[float]) -> None:
+        self._check_writable()
+        data = self.data
+        for i, fac in enumerate(factors):
+            if fac != 1.0:
+                for pos in range(self.indptr[i], self.indptr[i + 1]):
+                    data[pos] *= fac
+
+    def scale_columns(self, factors: Sequence[float]) -> None:
+        self._check_writable()
+        data = self.data
+        for pos, j in enumerate(self.indices):
+            data[pos] *= factors[j]
+
+    # ------------------------------------------------------------------
+    # products
+    # ------------------------------------------------------------------
+    def matvec(self, x: Sequence[float]) -> List[float]:
+        from .optimizations import sparse_matvec_optimized
+
+        return sparse_matvec_optimized(self.data, self.indices, self.indptr, x)
+
+    def rmatvec(self, y: Sequence[float]) -> List[float]:
+        """Return ``A.T @ y``."""
+        out = [0.0] * self._shape[1]
+        data, indices = self.data, self.indices
+        for i in range(self._shape[0]):
+            yi = y[i]
+            if yi == 0:
+                continue
+            for pos in range(self.indptr[i], self.indptr[i + 1]):
+                out[indices[pos]] += data[pos] * yi
+        return out
+
+    def column_range_matvec(self, x: Sequence[float], start: int, end: int) -> List[float]:
+        """Return ``A[:, start:end] @ x`` without materializing the slice."""
+        out = []
+        data, indices = self.data, self.indices
+        for i in range(self._shape[0]):
+            lo, hi = self._row_range(i, start, end)
+            s = 0.0
+            for pos in range(lo, hi):
+                s += data[pos] * x[indices[pos] - start]
+            out.append(s)
+        return out
+
+    def __ne__(self, other):
+        other = as_csr(other)
+        diff = 0
+        for i in range(self._shape[0]):
+            mine = dict(self.row_items(i))
+            theirs = dict(other.row_items(i)) if i < other.shape[0] else {}
+            for j in mine.keys() | theirs.keys():
+                if mine.get(j, 0.0) != theirs.get(j, 0.0):
+                    diff += 1
+        return type("Diff", (), {"nnz": diff})()
+
+
+def as_csr(matrix) -> CSRMatrix:
+    """Return ``matrix`` as a :class:`CSRMatrix`, converting dense inputs.
+
+    Linear operators (see :mod:`operators`) are assembled with ``to_csr``.
+    """
+    if isinstance(matrix, CSRMatrix):
+        return matrix
+    if hasattr(matrix, "to_csr"):
+        return matrix.to_csr()
+    return CSRMatrix(matrix)
@@ -2,12 +2,17 @@
 
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
-from typing import Tuple, Sequence, List, Iterable
+from typing import Dict, Tuple, Sequence, List
 
-from .config import BendersConfig
+from . import kernels
+from .config import BendersConfig, SubproblemSettings
+from .block_index import BlockColumnIndex
 from .shared_memory import csr_from_shared
 from .cuts import make_opt_cut
+from .leontief import BlockLeontiefSolvers
+from .objective import compile_objective
 
 
 @dataclass
@@ -20,7 +25,7 @@ class SubproblemInput:
     d: Sequence[float]
     x_prev: Sequence[float]
     r_i_assigned: Sequence[float]
-    config: BendersConfig
+    config: BendersConfig | SubproblemSettings
 
 
 @dataclass
@@ -33,93 +38,107 @@ class SubproblemOutput:
     cut: tuple | None
 
 
-def _apply_tiered_penalty(dev: float, tiers: Iterable[tuple]) -> float:
-    """Compute penalty for a deviation using tiered (piecewise) coefficients."""
-    remaining = dev
-    prev = 0.0
-    total = 0.0
-    tiers_list = list(tiers)
-    for thresh, coeff in tiers_list:
-        if remaining <= 0:
-            break
-        step = min(remaining, thresh - prev)
-        if step > 0:
-            total += step * coeff
-            remaining -= step
-        prev = thresh
-    if remaining > 0 and tiers_list:
-        total += remaining * tiers_list[-1][1]
-    return total
-
-
 def solve_subproblem_worker(args) -> Tuple[str, float, list, list, list, tuple | None]:
     if isinstance(args, SubproblemInput):
         inp = args
     else:
         block_id, start, end, A_meta, B_meta, d, x_prev, r_i_assigned, cfg_dict = args
-        cfg = BendersConfig(**cfg_dict)
+        cfg = SubproblemSettings.from_dict(cfg_dict)
         inp = SubproblemInput(block_id, start, end, A_meta, B_meta, d, x_prev, r_i_assigned, cfg)
 
     A = csr_from_shared(inp.A_meta)
     B = csr_from_shared(inp.B_meta)
+    return solve_subproblem(inp, A, B)
+
+
+def solve_subproblem(
+    inp: SubproblemInput,
+    A,
+    B,
+    block_index: BlockColumnIndex | None = None,
+    leontief: BlockLeontiefSolvers | None = None,
+) -> Tuple[str, float, list, list, list, tuple | None]:
+    """Solve one block given already attached matrices ``A`` and ``B``.
+
+    When ``block_index`` is given the cached column slice of ``B`` and its row
+    sums are used, so the work per call is proportional to the non-zeros in
+    the block.
+
+    For ``problem_type="leontief"`` the block's gross output solves
+    ``(I - A_bb) x = B_b^T r`` iteratively, where ``A_bb`` is the diagonal
+    block of ``A``; pass the worker's ``leontief`` solvers to warm-start from
+    the previous iteration.
+    """
+    return solve_subproblems([inp], A, B, block_index, leontief)[0]
+
+
+def solve_subproblems(
+    inps: Sequence[SubproblemInput],
+    A,
+    B,
+    block_index: BlockColumnIndex | None = None,
+    leontief: BlockLeontiefSolvers | None = None,
+    seconds: List[float] | None = None,
+) -> List[Tuple[str, float, list, list, list, tuple | None]]:
+    """Solve several blocks, as :func:`solve_subproblem` would one by one.
+
+    The planwirtschaft objectives of all blocks are scored in one batched
+    :meth:`~objective.PlanwirtschaftObjective.evaluate_many` call. When
+    ``seconds`` is given, the wall time of each block (its own solve plus an
+    equal share of the batched evaluation) is appended to it.
+    """
+    outputs = []
+    # compiled objective -> indices of the blocks it scores
+    batches: Dict[object, List[int]] = {}
+    for idx, inp in enumerate(inps):
+        t0 = time.perf_counter()
+        settings = SubproblemSettings.from_config(inp.config)
+        x_block, produced = _block_output(inp, A, B, block_index, leontief, settings)
+        outputs.append([x_block, produced, sum(x_block), time.perf_counter() - t0])
+        if settings.planwirtschaft_objective:
+            model = compile_objective(settings, len(inp.r_i_assigned))
+            batches.setdefault(model, []).append(idx)
+
+    for model, idxs in batches.items():
+        t0 = time.perf_counter()
+        values = model.evaluate_many(
+            [outputs[i][1] for i in idxs], [inps[i].r_i_assigned for i in idxs]
+        )
+        share = (time.perf_counter() - t0) / len(idxs)
+        for i, value in zip(idxs, values):
+            outputs[i][2] = value
+            outputs[i][3] += share
+
+    if seconds is not None:
+        seconds.extend(out[3] for out in outputs)
+    return [_result(inp, obj, x_block) for inp, (x_block, _, obj, _) in zip(inps, outputs)]
+
+
+def _block_output(inp, A, B, block_index, leontief, settings):
+    """Production ``x_block`` of one block and, for the planwirtschaft
+    objective, the amounts ``B_b x_block`` it delivers."""
     n_block = max(0, inp.end - inp.start)
+    block = block_index.get(inp.start, inp.end) if block_index is not None else None
+    if settings.problem_type == "leontief":
+        B_block = block.matrix if block is not None else B.column_slice(inp.start, inp.end)
+        if leontief is None:
+            leontief = BlockLeontiefSolvers.from_settings(A, settings)
+        x_block = leontief.solve(inp.start, inp.end, B_block.rmatvec(inp.r_i_assigned))
+    else:
+        block_sums = block.row_sums if block is not None else B.row_sums(inp.start, inp.end)
+        demand = kernels.block_demand(block_sums, inp.r_i_assigned)
+        x_block = [demand / n_block if n_block > 0 else 0.0 for _ in range(n_block)]
+
+    produced = None
+    if settings.planwirtschaft_objective:
+        if block is not None:
+            produced = block.matrix.matvec(x_block)
+        else:
+            produced = B.column_range_matvec(x_block, inp.start, inp.end)
+    return x_block, produced
+
 
-    demand = sum(
-        sum(B.data[i][inp.start:inp.end]) * inp.r_i_assigned[i]
-        for i in range(len(inp.r_i_assigned))
-    )
-    x_block = [demand / n_block if n_block > 0 else 0.0 for _ in range(n_block)]
-
-    obj = sum(x_block)
-    if inp.config.matrix_gen_params.get("planwirtschaft_objective"):
-        under_penalty = inp.config.matrix_gen_params.get("underproduction_penalty", 1.0)
-        over_penalty = inp.config.matrix_gen_params.get("overproduction_penalty", 0.0)
-        under_penalties = inp.config.matrix_gen_params.get("underproduction_penalties")
-        over_penalties = inp.config.matrix_gen_params.get("overproduction_penalties")
-        tiered_under = inp.config.matrix_gen_params.get("tiered_underproduction_penalties")
-        tiered_over = inp.config.matrix_gen_params.get("tiered_overproduction_penalties")
-        prod_bonus = inp.config.matrix_gen_params.get("production_bonus", 0.0)
-        bonus_factor = inp.config.matrix_gen_params.get("priority_sector_bonus_factor", 1.0)
-        priority = set(inp.config.matrix_gen_params.get("priority_sectors", []))
-        societal_bonuses = inp.config.matrix_gen_params.get("societal_bonuses", {})
-        co2_penalties = inp.config.matrix_gen_params.get("co2_penalties", {})
-        inventory_cost = inp.config.matrix_gen_params.get("inventory_cost", 0.0)
-
-        m0 = len(inp.r_i_assigned)
-        if under_penalties is None:
-            under_penalties = [under_penalty for _ in range(m0)]
-        if over_penalties is None:
-            over_penalties = [over_penalty for _ in range(m0)]
-
-        produced_vec = []
-        for i in range(m0):
-            prod = 0.0
-            for j in range(n_block):
-                prod += B.data[i][inp.start + j] * x_block[j]
-            produced_vec.append(prod)
-
-        obj = 0.0
-        for i in range(m0):
-            planned = inp.r_i_assigned[i]
-            produced = produced_vec[i]
-            under_dev = max(0.0, planned - produced)
-            over_dev = max(0.0, produced - planned)
-            if tiered_under:
-                under_cost = _apply_tiered_penalty(under_dev, tiered_under)
-            else:
-                under_cost = under_penalties[i] * under_dev
-            if tiered_over:
-                over_cost = _apply_tiered_penalty(over_dev, tiered_over)
-            else:
-                over_cost = over_penalties[i] * over_dev
-            sector_bonus = prod_bonus
-            if i in priority:
-                sector_bonus *= bonus_factor
-            bonus = sector_bonus * min(planned, produced)
-            societal_bonus = societal_bonuses.get(i, 0.0) * produced
-            co2_pen = co2_penalties.get(i, 0.0) * produced
-            inv_cost = inventory_cost * over_dev
-            obj += produced + bonus + societal_bonus - under_cost - over_cost - co2_pen - inv_cost
+def _result(inp, obj, x_block) -> Tuple[str, float, list, list, list, tuple | None]:
     pi_i = [0.5 for _ in inp.r_i_assigned]
     mu_iT_d_value = obj - sum(pi_i[j] * inp.r_i_assigned[j] for j in range(len(pi_i)))
     cut = make_opt_cut(inp.block_id, pi_i, mu_iT_d_value)
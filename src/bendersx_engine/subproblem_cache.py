@@ -0,0 +1,57 @@
+"""Memoization of subproblem results across iterations."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Hashable, Sequence, Tuple
+
+
+class SubproblemCache:
+    """Bounded LRU cache of subproblem results.
+
+    Results are keyed on the block id, its boundaries and the assigned demand
+    ``r_i`` quantized to ``tolerance``, so allocations that only move within
+    the tolerance reuse the stored objective, ``x_block`` and cut. A
+    ``tolerance`` of zero keys on the exact values. A ``max_size`` of zero
+    disables caching.
+    """
+
+    def __init__(self, max_size: int = 128, tolerance: float = 1e-9):
+        self.max_size = max_size
+        self.tolerance = tolerance
+        self._data: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def key(self, block_id: str, start: int, end: int, r_i: Sequence[float]) -> Tuple:
+        tol = self.tolerance
+        if tol <= 0:
+            return block_id, start, end, tuple(float(v) for v in r_i)
+        return block_id, start, end, tuple(round(v / tol) for v in r_i)
+
+    def get(self, key: Hashable):
+        if self.max_size <= 0:
+            return None
+        res = self._data.get(key)
+        if res is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return res
+
+    def put(self, key: Hashable, result) -> None:
+        if self.max_size <= 0:
+            return
+        self._data[key] = result
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
@@ -1,34 +1,47 @@
 from __future__ import annotations
 
+from array import array
 from typing import List
 
-from bendersx_engine.simple_matrix import SimpleMatrix
+from bendersx_engine.simple_matrix import CSRMatrix
 
 
-class csr_matrix(SimpleMatrix):
+class csr_matrix(CSRMatrix):
     pass
 
 
 def identity(n: int, format: str = "csr", dtype=float) -> csr_matrix:
-    data = [[1.0 if i == j else 0.0 for j in range(n)] for i in range(n)]
-    return csr_matrix(data)
+    return csr_matrix.identity(n)
 
 
 def vstack(mats: List[csr_matrix], format: str = "csr") -> csr_matrix:
-    data = []
+    data = array("d")
+    indices = array("i")
+    indptr = array("i", [0])
+    cols = mats[0].shape[1] if mats else 0
     for m in mats:
-        data.extend([row[:] for row in m.data])
-    return csr_matrix(data)
+        offset = len(data)
+        data.extend(m.data)
+        indices.extend(m.indices)
+        indptr.extend(p + offset for p in m.indptr[1:])
+    return csr_matrix.from_buffers(data, indices, indptr, (len(indptr) - 1, cols))
 
 
 def hstack(mats: List[csr_matrix], format: str = "csr") -> csr_matrix:
     if not mats:
         return csr_matrix([])
     rows = mats[0].shape[0]
-    data = []
+    data = array("d")
+    indices = array("i")
+    indptr = array("i", [0])
     for r in range(rows):
-        row = []
+        col_offset = 0
         for m in mats:
-            row.extend(m.data[r])
-        data.append(row)
-    return csr_matrix(data)
+            lo, hi = m.indptr[r], m.indptr[r + 1]
+            data.extend(m.data[lo:hi])
+            indices.extend(j + col_offset for j in m.indices[lo:hi])
+            col_offset += m.shape[1]
+        indptr.append(len(data))
+    return csr_matrix.from_buffers(
+        data, indices, indptr, (rows, sum(m.shape[1] for m in mats))
+    )
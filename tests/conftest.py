@@ -1,7 +1,16 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 # Ensure local packages in src/ are importable
 SRC_PATH = Path(__file__).resolve().parents[1] / "src"
 if str(SRC_PATH) not in sys.path:
     sys.path.insert(0, str(SRC_PATH))
+
+
+@pytest.fixture(autouse=True)
+def _isolated_caches(tmp_path, monkeypatch):
+    """Keep capability and Numba caches out of the developer's home directory."""
+    monkeypatch.setenv("BENDERSX_CACHE_DIR", str(tmp_path / "bendersx_cache"))
+    monkeypatch.setenv("NUMBA_CACHE_DIR", str(tmp_path / "numba_cache"))
@@ -13,3 +13,110 @@ def test_algorithm_runs():
     _, _, _, info = benders_decomposition(n, m0, total_r, A, B, cfg)
     assert info["iterations"] <= cfg.max_iterations_per_phase
     assert isinstance(info.get("unfulfilled_demand"), list)
+
+
+def test_async_mode_matches_sync():
+    n, m0 = 6, 2
+    A = sp.identity(n, format="csr")
+    B = sp.csr_matrix(np.ones((m0, n)))
+    total_r = [1.0, 2.0]
+    sync_cfg = BendersConfig(verbose=False)
+    async_cfg = BendersConfig(
+        verbose=False,
+        async_subproblems=True,
+        async_min_fraction=0.5,
+        use_parallel_subproblems=True,
+        n_processes=2,
+    )
+    blocks = [("block_0", 0, n)]
+    obj_sync, x_sync, _, info_sync = benders_decomposition(
+        n, m0, total_r, A, B, sync_cfg, blocks_metadata=blocks
+    )
+    obj_async, x_async, _, info_async = benders_decomposition(
+        n, m0, total_r, A, B, async_cfg, blocks_metadata=blocks
+    )
+    assert abs(obj_sync - obj_async) < 1e-9
+    assert x_sync == x_async
+    assert set(info_sync) == set(info_async)
+    assert info_async["iterations"] <= async_cfg.max_iterations_per_phase
+
+
+def test_unchanged_blocks_are_skipped():
+    cfg = BendersConfig(verbose=False, max_iterations_per_phase=5)
+    n, m0 = 4, 1
+    A = sp.identity(n, format="csr")
+    B = sp.csr_matrix(np.ones((m0, n)))
+    _, x, _, info = benders_decomposition(n, m0, [1.0], A, B, cfg)
+    assert info["blocks_solved"] == 1
+    assert info["blocks_skipped"] == 1
+    assert info["iterations"] == 2
+    assert abs(sum(x) - 4.0) < 1e-12
+
+
+def test_instrumentation_and_early_stop():
+    n, m0 = 6, 2
+    A = sp.identity(n, format="csr")
+    B = sp.csr_matrix(np.ones((m0, n)))
+    cfg = BendersConfig(verbose=False, instrumentation=True, max_iterations_per_phase=5)
+    _, _, cuts, info = benders_decomposition(n, m0, [1.0, 2.0], A, B, cfg)
+    assert {"master", "subproblems", "cut_selection", "repartition"} <= set(info["timings"])
+    assert all(t >= 0 for t in info["timings"].values())
+    assert len(info["history"]) == info["iterations"]
+    assert info["cuts_kept"] == len(cuts)
+    assert info["stopped_early"] is False
+
+    seen = []
+
+    def stop_after_first(progress):
+        seen.append(progress)
+        return True
+
+    plain = BendersConfig(verbose=False, max_iterations_per_phase=5)
+    _, _, _, info = benders_decomposition(n, m0, [1.0, 2.0], A, B, plain, callback=stop_after_first)
+    assert info["stopped_early"] is True
+    assert info["iterations"] == 1
+    assert [p.iteration for p in seen] == [1]
+    assert seen[0].upper_bound >= seen[0].lower_bound
+    assert "timings" not in info
+
+
+def test_trace_export_merges_worker_events(tmp_path):
+    import json
+
+    n, m0 = 6, 2
+    A = sp.identity(n, format="csr")
+    B = sp.csr_matrix(np.ones((m0, n)))
+    blocks = [("block_0", 0, 3), ("block_1", 3, 6)]
+    for parallel in (False, True):
+        cfg = BendersConfig(
+            verbose=False,
+            use_parallel_subproblems=parallel,
+            n_processes=2,
+            trace_path=str(tmp_path / "trace_{solve}.json"),
+        )
+        plain = benders_decomposition(n, m0, [1.0, 2.0], A, B, BendersConfig(verbose=False), blocks_metadata=blocks)
+        obj, x, _, info = benders_decomposition(n, m0, [1.0, 2.0], A, B, cfg, blocks_metadata=blocks)
+        assert (obj, x) == plain[:2]
+
+        with open(info["trace_path"]) as f:
+            trace = json.load(f)
+        events = trace["traceEvents"]
+        names = {e["name"] for e in events}
+        assert {"master", "pickle_task", "unpickle_result", "queue_wait"} <= names
+        assert {"solve block_0", "solve block_1"} <= names
+        assert all(e["dur"] >= 0 for e in events if e["ph"] == "X")
+        worker_pids = {e["pid"] for e in events if e["name"].startswith("solve ")}
+        driver = [e for e in events if e["ph"] == "M" and e["args"]["name"] == "driver"]
+        assert len(driver) == 1
+        if parallel:
+            assert driver[0]["pid"] not in worker_pids
+
+
+def test_parallel_mode_partitions_for_workers():
+    n, m0 = 8, 2
+    A = sp.identity(n, format="csr")
+    B = sp.csr_matrix(np.ones((m0, n)))
+    cfg = BendersConfig(verbose=False, use_parallel_subproblems=True, n_processes=2)
+    _, x, _, info = benders_decomposition(n, m0, [1.0, 2.0], A, B, cfg)
+    assert info["blocks"] == 2
+    assert len(x) == n
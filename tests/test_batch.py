@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from bendersx_engine import BendersConfig, solve_scenarios
+from bendersx_engine.algorithm import benders_decomposition
+from bendersx_engine.executor import SubproblemExecutor
+
+
+def _problem(n=6, m0=2):
+    A = sp.identity(n, format="csr")
+    B = sp.csr_matrix(np.ones((m0, n)))
+    return n, m0, A, B
+
+
+def test_batch_matches_individual_solves():
+    n, m0, A, B = _problem()
+    cfg = BendersConfig(verbose=False)
+    blocks = [("block_0", 0, 3), ("block_1", 3, n)]
+    scenarios = [[1.0, 2.0], [2.0, 1.0], [1.0, 2.0]]
+    results, stats = solve_scenarios(
+        n, m0, scenarios, A, B, cfg, blocks_metadata=blocks, share_cuts=False
+    )
+    for total_r, res in zip(scenarios, results):
+        obj, x, _, info = benders_decomposition(n, m0, total_r, A, B, cfg, blocks_metadata=blocks)
+        assert abs(res.objective - obj) < 1e-9
+        assert res.x == x
+        assert res.stats["iterations"] == info["iterations"]
+    assert stats["scenarios"] == 3
+    # the repeated scenario is answered from the shared cache or deduplicated
+    assert stats["tasks"] < sum(r.stats["blocks_solved"] for r in results)
+    assert stats["rounds"] == max(r.stats["iterations"] for r in results)
+
+
+def test_batch_shares_cuts_and_executor():
+    n, m0, A, B = _problem()
+    cfg = BendersConfig(verbose=False, use_parallel_subproblems=True, n_processes=2)
+    scenarios = [[1.0, 1.0], [2.0, 1.0], [1.0, 3.0]]
+    with SubproblemExecutor.from_matrices(A, B, cfg) as ex:
+        pool = ex._pool
+        results, stats = solve_scenarios(n, m0, scenarios, A, B, cfg, executor=ex, max_active=2)
+        assert ex._pool is pool
+    assert [len(r.x) for r in results] == [n] * 3
+    assert stats["shared_cuts"] > 0
+    assert sum(r.stats["cuts_imported"] for r in results) > 0
+    assert results[1].objective > results[0].objective
+
+
+def test_batch_rejects_async():
+    n, m0, A, B = _problem()
+    cfg = BendersConfig(verbose=False, async_subproblems=True)
+    with pytest.raises(ValueError):
+        solve_scenarios(n, m0, [[1.0, 1.0]], A, B, cfg)
+
+
+def test_batch_stats_and_weights_are_per_scenario():
+    n, m0, A, B = _problem()
+    cfg = BendersConfig(
+        verbose=False, dynamic_block_weights=True,
+        matrix_gen_params={"block_distribution": [1.0, 2.0]},
+    )
+    blocks = [("block_0", 0, 3), ("block_1", 3, n)]
+    scenarios = [[1.0, 2.0], [2.0, 1.0], [1.0, 2.0]]
+    results, stats = solve_scenarios(
+        n, m0, scenarios, A, B, cfg, blocks_metadata=blocks, share_cuts=False
+    )
+    assert sum(r.stats["cache_misses"] for r in results) == stats["cache_misses"]
+    assert sum(r.stats["cache_hits"] for r in results) == stats["cache_hits"]
+    for total_r, res in zip(scenarios, results):
+        _, _, _, info = benders_decomposition(n, m0, total_r, A, B, cfg, blocks_metadata=blocks)
+        assert res.stats["cache_misses"] == info["cache_misses"]
+        history = res.stats["makespan_history"]
+        assert len(history) == res.stats["iterations"]
+        assert all(m in stats["makespan_history"] for m in history)
+    assert cfg.matrix_gen_params["block_distribution"] == [1.0, 2.0]
@@ -8,3 +8,32 @@ def test_benchmark_runs():
 
 def test_planwirtschaft_benchmark_runs():
     run_planwirtschaft_benchmark()
+
+
+def test_suite_report_and_compare(tmp_path):
+    import json
+
+    from bendersx_engine.benchmark import compare_results, run_benchmark_suite, sweep
+
+    cases = sweep(n=[20], m0=[3], sparsity=[0.1], blocks=[1, 2],
+                  problem_type=["leontief"], parallel=[False])
+    out = tmp_path / "report.json"
+    report = run_benchmark_suite(cases, isolate=False, output=str(out))
+    assert json.loads(out.read_text()) == report
+    assert [r["id"] for r in report["results"]] == [c.id for c in cases]
+    for res in report["results"]:
+        assert set(res["phases"]) == {"generate", "setup", "solve", "teardown"}
+        assert res["iterations"] >= 1
+
+    assert compare_results(report, report) == []
+    slower = json.loads(json.dumps(report))
+    slower["results"][0]["total_time"] = report["results"][0]["total_time"] * 3 + 1.0
+    regs = compare_results(str(out), slower)
+    assert [(r["id"], r["metric"]) for r in regs] == [(cases[0].id, "total_time")]
+
+
+def test_isolated_case_runs_in_subprocess():
+    from bendersx_engine.benchmark import BenchmarkCase, run_benchmark_suite
+
+    report = run_benchmark_suite([BenchmarkCase(10, 2, 0.2)], isolate=True)
+    assert report["results"][0]["peak_rss_kb"] is None or report["results"][0]["peak_rss_kb"] > 0
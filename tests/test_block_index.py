@@ -0,0 +1,25 @@
+import scipy.sparse as sp
+from bendersx_engine.block_index import BlockColumnIndex
+
+
+def test_block_slices_and_row_sums():
+    B = sp.csr_matrix([[1.0, 2.0, 0.0, 4.0], [0.0, 3.0, 5.0, 0.0]])
+    index = BlockColumnIndex(B)
+    sl = index.get(1, 3)
+    assert sl.row_sums == [2.0, 8.0]
+    assert sl.matrix.toarray() == [[2.0, 0.0], [3.0, 5.0]]
+    assert index.get(1, 3) is sl
+    assert index.builds == 1
+
+
+def test_sync_rebuilds_only_changed_blocks():
+    B = sp.csr_matrix([[1.0, 2.0, 3.0, 4.0]])
+    index = BlockColumnIndex(B)
+    index.sync([("b0", 0, 2), ("b1", 2, 4)])
+    assert index.builds == 2
+    index.sync([("b0", 0, 2), ("b1", 2, 3), ("split_b1", 3, 4)])
+    assert index.builds == 4
+    assert len(index) == 3
+    assert index.get(3, 4).row_sums == [4.0]
+    index.get(0, 4)
+    assert len(index) == 1
@@ -26,3 +26,25 @@ def test_planwirtschaft_params_from_file(tmp_path):
     params = PlanwirtschaftParams.from_file(str(path))
     assert params.diag_base == 0.4
     assert params.diag_variation == 0.5
+
+
+def test_subproblem_settings_frozen_and_picklable():
+    import dataclasses
+    import pickle
+
+    from bendersx_engine.config import SubproblemSettings
+
+    cfg = BendersConfig(
+        verbose=False,
+        matrix_gen_params={"planwirtschaft_objective": True, "societal_bonuses": {"1": 0.5}},
+    )
+    settings = SubproblemSettings.from_config(cfg)
+    assert settings.planwirtschaft_objective is True
+    assert settings.societal_bonuses == ((1, 0.5),)
+    assert pickle.loads(pickle.dumps(settings)) == settings
+    try:
+        settings.inventory_cost = 1.0
+    except dataclasses.FrozenInstanceError:
+        pass
+    else:
+        raise AssertionError("settings should be immutable")
@@ -0,0 +1,35 @@
+from bendersx_engine.cut_matrix import CutMatrix
+from bendersx_engine.cuts import CutPool
+
+
+def test_cut_matrix_evaluate_and_grow():
+    store = CutMatrix(2, capacity=1)
+    store.append(("opt", "b0", [1.0, 0.0], 0.0))
+    store.append(("feas", "b1", [1.0, 1.0], 3.0))
+    store.append(("opt", "gone", [1.0, 1.0], 0.0))
+    assert len(store) == 3
+    assert store.cut(1) == ("feas", "b1", [1.0, 1.0], 3.0)
+    blocks = [("b0", 0, 1), ("b1", 1, 2)]
+    violations, slacks = store.evaluate(blocks, [[2.0, 5.0], [1.0, 4.0]], [3.0, 0.0])
+    assert slacks[:2] == [-1.0, -2.0]
+    assert violations[:2] == [1.0, 2.0]
+    assert slacks[2] == float("inf")
+    assert store.max_violation(blocks, [[2.0, 5.0], [1.0, 4.0]], [3.0, 0.0]) == 2.0
+
+
+def test_cut_matrix_compact():
+    store = CutMatrix(1)
+    for a in range(4):
+        store.append(("opt", "b0", [float(a)], float(a)))
+    store.deactivate(0)
+    store.deactivate(2)
+    assert store.compact() == [-1, 0, -1, 1]
+    assert [store.cut(i)[3] for i in range(len(store))] == [1.0, 3.0]
+
+
+def test_cut_pool_survives_compaction():
+    pool = CutPool(max_per_type=2)
+    for a in range(40):
+        pool.add(("opt", "b0", [1.0], float(a)))
+    assert len(pool.matrix) < 40
+    assert sorted(pool.matrix.cut(e.row)[3] for e in pool._entries.values()) == [38.0, 39.0]
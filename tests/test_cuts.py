@@ -1,7 +1,72 @@
-from bendersx_engine.cuts import make_feas_cut
+from bendersx_engine.cuts import CutPool, make_feas_cut
 import numpy as np
 
 
 def test_make_feas_cut():
     cut = make_feas_cut("b0", np.array([1, 0]), np.array([2, 2]))
     assert cut[0] == "feas"
+
+
+def test_pareto_select_keeps_strongest():
+    from bendersx_engine.cuts import pareto_select_cuts
+
+    cuts = [("opt", "b", [0.5], float(a)) for a in range(10)] + [("feas", "b", [1.0], 3.0)]
+    selected = pareto_select_cuts(cuts, 4, None)
+    assert selected[0][0] == "feas"
+    assert [c[3] for c in selected[1:]] == [9.0, 8.0, 7.0]
+
+
+def test_cut_pool_dedup_and_bounds():
+    from bendersx_engine.cuts import CutPool
+
+    pool = CutPool(max_per_type=3)
+    assert pool.add(("opt", "b0", [0.5, 0.5], 1.0))
+    assert not pool.add(("opt", "b0", [0.5, 0.5], 1.0))
+    assert pool.add(make_feas_cut("b0", [1.0, 0.0], [2.0, 2.0]))
+    # scaled feasibility cut is the same half-space
+    assert not pool.add(make_feas_cut("b0", [2.0, 0.0], [2.0, 2.0]))
+    for a in (2.0, 3.0, 4.0):
+        pool.add(("opt", "b0", [0.5, 0.5], a))
+    assert pool.duplicates == 2
+    assert len(pool) == 4
+    assert sorted(c[3] for c in pool if c[0] == "opt") == [2.0, 3.0, 4.0]
+    selected = pool.select(3)
+    assert selected[0][0] == "feas"
+    assert [c[3] for c in selected[1:]] == [4.0, 3.0]
+
+
+def test_cut_pool_ages_out_slack_cuts():
+    from bendersx_engine.cuts import CutPool
+
+    pool = CutPool(max_age=1)
+    blocks = [("b0", 0, 1)]
+    pool.add(("opt", "b0", [1.0], 0.0))   # binding at theta = r
+    pool.add(("opt", "b0", [1.0], 5.0))   # slack by 5
+    assert pool.update_activity(blocks, [[2.0]], [2.0]) == 0
+    assert pool.update_activity(blocks, [[2.0]], [2.0]) == 1
+    assert [c[3] for c in pool] == [0.0]
+
+
+def test_cut_pool_added_since_version():
+    pool = CutPool()
+    pool.add(("opt", "b0", [0.5], 1.0))
+    version = pool.version
+    cut = ("opt", "b1", [0.5], 2.0)
+    pool.add(cut)
+    assert pool.added_since(version) == [cut]
+    assert cut in pool and ("opt", "b1", [0.5], 3.0) not in pool
+
+
+def test_cut_pool_per_block_bound_and_relative_dedup():
+    pool = CutPool(max_per_block=2)
+    for a in (1.0, 2.0, 3.0):
+        pool.add(("opt", "b0", [0.5], a))
+    pool.add(("opt", "b1", [0.5], 1.0))
+    assert sorted((c[1], c[3]) for c in pool) == [("b0", 2.0), ("b0", 3.0), ("b1", 1.0)]
+    # keys are relative to the row's magnitude, not an absolute grid
+    big = ("opt", "b1", [1e6, 1e6], 1e7)
+    assert pool.add(big)
+    assert not pool.add(("opt", "b1", [1e6 + 1e-5, 1e6], 1e7))
+    # theta keeps its unit coefficient: a scaled opt cut is a different cut
+    assert ("opt", "b1", [1e6, 1e6], 2e7) not in pool
+    assert ("opt", "b1", [2e6, 2e6], 2e7) not in pool
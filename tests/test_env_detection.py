@@ -1,5 +1,72 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from bendersx_engine import env_detection
 from bendersx_engine.env_detection import NUMBA_AVAILABLE
 
 
 def test_numba_flag():
     assert isinstance(NUMBA_AVAILABLE, bool)
+
+
+def test_package_import_is_lazy():
+    src = Path(__file__).resolve().parents[1] / "src"
+    code = (
+        "import sys; import bendersx_engine as b; "
+        "loaded = [m for m in ('bendersx_engine.algorithm', 'bendersx_engine.benchmark', "
+        "'highspy', 'numba') if m in sys.modules]; "
+        "assert not loaded, loaded; "
+        "assert b.BendersConfig.__name__ == 'BendersConfig'"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=str(src))
+
+
+def test_probe_is_cached_on_disk(tmp_path, monkeypatch):
+    monkeypatch.setenv("BENDERSX_CACHE_DIR", str(tmp_path))
+    caps = env_detection.probe_capabilities(refresh=True)
+    path = Path(env_detection.capability_cache_path())
+    assert not path.exists()  # HiGHS is probed on first use
+    version = caps.highs_version
+    assert path.exists()
+
+    calls = []
+    monkeypatch.setattr(env_detection, "_highs_version", lambda: calls.append(1))
+    monkeypatch.setattr(env_detection, "_capabilities", None)
+    monkeypatch.setattr(env_detection, "_highs_values", None)
+    assert env_detection.probe_capabilities() == caps
+    assert env_detection.probe_capabilities().highs_version == version
+    assert env_detection.probe_capabilities() is env_detection.probe_capabilities()
+    assert not calls
+
+
+def test_config_consults_probe_without_highs(monkeypatch):
+    from bendersx_engine import BendersConfig
+
+    monkeypatch.setattr(env_detection, "_capabilities", None)
+    monkeypatch.setattr(env_detection, "_highs_values", None)
+    monkeypatch.setattr(env_detection, "_highspy", env_detection._MISSING)
+    monkeypatch.setenv("CUDA_VISIBLE_DEVICES", "")
+    cfg = BendersConfig(verbose=False, use_first_order_gpu=True)
+    assert env_detection._capabilities is not None
+    assert cfg.use_first_order_gpu is False
+    # creating a config neither imports highspy nor writes the disk cache
+    assert env_detection._highspy is env_detection._MISSING
+    assert env_detection._highs_values is None
+    assert not Path(env_detection.capability_cache_path()).exists()
+
+
+def test_backend_choices_follow_probe(monkeypatch):
+    from bendersx_engine import BendersConfig, kernels
+    from bendersx_engine.lp import make_lp_backend
+    from bendersx_engine.master import MasterProblem
+
+    no_highs = {"highs": False, "highs_version": None, "highs_threading": False}
+    monkeypatch.setattr(env_detection, "_highs_values", no_highs)
+    assert make_lp_backend("auto", [1.0]).name == "simplex"
+    assert MasterProblem(1, BendersConfig(verbose=False)).backend_name == "simplex"
+
+    monkeypatch.setattr(env_detection, "_capabilities", env_detection.Capabilities(False, False, True))
+    monkeypatch.setattr(kernels, "_jit_available", None)
+    with kernels.jit_scope(True):
+        assert not kernels.jit_enabled()
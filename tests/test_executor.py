@@ -0,0 +1,105 @@
+import numpy as np
+import scipy.sparse as sp
+from bendersx_engine.algorithm import benders_decomposition
+from bendersx_engine.executor import SubproblemExecutor
+from bendersx_engine import BendersConfig
+
+
+def test_executor_serial_tasks():
+    cfg = BendersConfig(verbose=False)
+    A = sp.identity(4, format="csr")
+    B = sp.csr_matrix(np.ones((1, 4)))
+    with SubproblemExecutor.from_matrices(A, B, cfg) as ex:
+        results = ex.map([("b0", 0, 2, [1.0]), ("b1", 2, 4, [2.0])])
+    assert [r[0] for r in results] == ["b0", "b1"]
+    assert results[1][2] == [2.0, 2.0]
+
+
+def test_executor_shares_matrices_only_for_pools(monkeypatch):
+    from bendersx_engine import env_detection, shared_memory
+
+    A = sp.identity(4, format="csr")
+    B = sp.csr_matrix(np.ones((1, 4)))
+    with SubproblemExecutor.from_matrices(A, B, BendersConfig(verbose=False)) as ex:
+        assert "matrix" in ex.A_meta and not shared_memory._shared_store
+        assert ex.map([("b0", 0, 4, [1.0])])[0][2] == [1.0] * 4
+
+    monkeypatch.setattr(env_detection, "_capabilities", env_detection.Capabilities(False, False, False))
+    cfg = BendersConfig(verbose=False, use_parallel_subproblems=True, n_processes=2)
+    with SubproblemExecutor.from_matrices(A, B, cfg) as ex:
+        assert "matrix" in ex.B_meta
+        results = ex.map([("b0", 0, 2, [1.0]), ("b1", 2, 4, [2.0])])
+    assert results[1][2] == [2.0, 2.0]
+
+
+def test_executor_reused_across_solves():
+    cfg = BendersConfig(verbose=False, use_parallel_subproblems=True, n_processes=2)
+    n, m0 = 4, 1
+    A = sp.identity(n, format="csr")
+    B = sp.csr_matrix(np.ones((m0, n)))
+    with SubproblemExecutor.from_matrices(A, B, cfg) as ex:
+        pool = ex._pool
+        first = benders_decomposition(n, m0, [1.0], A, B, cfg, executor=ex)
+        second = benders_decomposition(n, m0, [2.0], A, B, cfg, executor=ex)
+        assert ex._pool is pool
+    assert second[0] > first[0]
+
+
+def test_executor_submit_collect_completion_order():
+    cfg = BendersConfig(verbose=False, use_parallel_subproblems=True, n_processes=2)
+    A = sp.identity(4, format="csr")
+    B = sp.csr_matrix(np.ones((1, 4)))
+    with SubproblemExecutor.from_matrices(A, B, cfg) as ex:
+        ex.submit([("b0", 0, 2, [1.0]), ("b1", 2, 4, [2.0])])
+        first = ex.collect(1)
+        rest = ex.collect(2 - len(first))
+        assert ex.pending == 0
+    assert sorted(r[0] for r in first + rest) == ["b0", "b1"]
+
+
+def test_pinned_workers_report_utilization():
+    import scipy.sparse as sp
+    from bendersx_engine import BendersConfig
+    from bendersx_engine.executor import SubproblemExecutor
+
+    A = sp.identity(6, format="csr")
+    B = sp.csr_matrix([[1.0] * 6])
+    cfg = BendersConfig(verbose=False, use_parallel_subproblems=True, n_processes=2, pin_blocks=True)
+    tasks = [("b0", 0, 2, [1.0]), ("b1", 2, 3, [1.0]), ("b2", 3, 6, [1.0])]
+    with SubproblemExecutor.from_matrices(A, B, cfg) as ex:
+        first = ex.map(tasks)
+        pins = dict(ex.scheduler.pinned)
+        second = ex.map(tasks)
+        assert [r[0] for r in first] == ["b0", "b1", "b2"]
+        assert [r[2] for r in first] == [r[2] for r in second]
+        assert set(pins.values()) <= {0, 1}
+        stats = ex.scheduler.stats()
+        assert len(stats["makespan_history"]) == 2
+        assert 0.0 <= stats["worker_utilization"] <= 1.0
+
+
+def test_async_rounds_record_makespan():
+    cfg = BendersConfig(verbose=False, use_parallel_subproblems=True, n_processes=2)
+    A = sp.identity(4, format="csr")
+    B = sp.csr_matrix(np.ones((1, 4)))
+    with SubproblemExecutor.from_matrices(A, B, cfg) as ex:
+        ex.submit([("b0", 0, 2, [1.0]), ("b1", 2, 4, [2.0])])
+        rounds = 0
+        while ex.pending:
+            rounds += bool(ex.collect(1))
+        history = ex.scheduler.stats()["makespan_history"]
+        assert len(history) == rounds and all(t > 0 for t in history)
+        # busy time of the async rounds does not leak into the next batch
+        ex.map([("b0", 0, 2, [1.0])])
+        assert len(ex._batch_busy) == 1 and ex.scheduler.busy[-1] == ex.solve_times["b0"]
+
+    n, m0 = 6, 2
+    async_cfg = BendersConfig(
+        verbose=False, async_subproblems=True, use_parallel_subproblems=True, n_processes=2
+    )
+    _, _, _, info = benders_decomposition(
+        n, m0, [1.0, 2.0], sp.identity(n, format="csr"), sp.csr_matrix(np.ones((m0, n))),
+        async_cfg,
+    )
+    assert info["makespan_history"] and info["makespan"] == sum(info["makespan_history"])
+    assert 0.0 < info["worker_utilization"] <= 1.0
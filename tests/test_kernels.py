@@ -0,0 +1,90 @@
+from array import array
+
+import pytest
+
+from bendersx_engine import kernels
+from bendersx_engine.config import SubproblemSettings
+from bendersx_engine.objective import PlanwirtschaftObjective
+from bendersx_engine.simple_matrix import CSRMatrix
+
+
+def _fake_compiled(monkeypatch):
+    """Run the compiled-mode wrappers with the Python kernel sources."""
+    monkeypatch.setattr(kernels, "_jit_requested", True)
+    monkeypatch.setattr(kernels, "_jit_available", True)
+    monkeypatch.setattr(kernels, "_compiled", dict(kernels._SOURCES))
+
+
+@pytest.fixture
+def compiled_mode(monkeypatch):
+    _fake_compiled(monkeypatch)
+
+
+def _settings():
+    return SubproblemSettings(
+        planwirtschaft_objective=True,
+        underproduction_penalties=(2.0, 1.0, 0.5),
+        production_bonus=0.1,
+        tiered_overproduction_penalties=((1.0, 1.0), (2.0, 3.0)),
+        inventory_cost=0.25,
+    )
+
+
+def test_wrappers_match_in_both_modes(monkeypatch):
+    A = CSRMatrix([[1.0, 0.0, 2.0], [0.0, 3.0, 4.0]])
+    model = PlanwirtschaftObjective.compile(_settings(), 3)
+    produced, planned = [1.0, 3.5, 0.0], [2.0, 1.0, 0.0]
+
+    def run():
+        B = A.copy()
+        kernels.normalize_column_sums(B.data, B.indices, 3, 5.0)
+        return (
+            kernels.csr_matvec(A.data, A.indices, A.indptr, [1.0, 2.0, 3.0]),
+            kernels.column_sums(memoryview(A.data), memoryview(A.indices), 3),
+            B.toarray(),
+            kernels.block_demand(A.row_sums(0, 3), [0.5, 1.0]),
+            A.row_sums(1, 3) + A.row_sums(0, 2),
+            model.evaluate(produced, planned),
+        )
+
+    monkeypatch.setattr(kernels, "_jit_requested", False)
+    python = run()
+    assert python[:5] == (
+        [7.0, 18.0], [1.0, 3.0, 6.0], [[1.0, 0.0, 5 / 3], [0.0, 3.0, 10 / 3]], 8.5,
+        [2.0, 7.0, 1.0, 3.0],
+    )
+    _fake_compiled(monkeypatch)
+    compiled = run()
+    assert compiled[:5] == python[:5]
+    assert abs(compiled[5] - python[5]) < 1e-12
+
+
+def test_config_does_not_switch_jit(monkeypatch):
+    from bendersx_engine import BendersConfig
+
+    monkeypatch.setattr(kernels, "_jit_requested", True)
+    BendersConfig(verbose=False, use_numba_jit=False)
+    assert kernels._jit_requested
+    with kernels.jit_scope(False):
+        assert not kernels.jit_enabled()
+    assert kernels._jit_requested
+
+
+def test_warm_up_is_noop_without_jit(monkeypatch):
+    monkeypatch.setattr(kernels, "_jit_requested", False)
+    assert not kernels.jit_enabled()
+    assert kernels.warm_up() == 0.0
+
+
+def test_warm_up_runs_every_kernel(compiled_mode):
+    assert kernels.warm_up() >= 0.0
+
+
+def test_numba_kernels_agree_with_python(monkeypatch):
+    pytest.importorskip("numba")
+    A = CSRMatrix([[1.0, 0.0, 2.0], [0.0, 3.0, 4.0]])
+    monkeypatch.setattr(kernels, "_jit_requested", True)
+    kernels.warm_up()
+    out = kernels.csr_matvec(memoryview(A.data), memoryview(A.indices), memoryview(A.indptr), [1.0, 2.0, 3.0])
+    assert out == [7.0, 18.0]
+    assert kernels.block_demand(array("d", [1.0, 2.0]), [3.0, 4.0]) == 11.0
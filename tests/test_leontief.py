@@ -0,0 +1,73 @@
+import pytest
+
+from bendersx_engine.leontief import LeontiefSolver, solve_leontief, spectral_radius
+from bendersx_engine.matrix_generation import generate_sparse_matrices
+from bendersx_engine.simple_matrix import CSRMatrix
+
+
+def test_spectral_radius_bounds_perron_root():
+    # all-ones 3x3 has rho = 3 while its largest entry is 1
+    ones = CSRMatrix([[1.0] * 3] * 3)
+    assert abs(spectral_radius(ones, tol=1e-10) - 3.0) < 1e-8
+    # a cyclic permutation is periodic; the shift still converges to rho = 1
+    cycle = CSRMatrix([[0.0, 1.0, 0.0], [0.0, 0.0, 1.0], [1.0, 0.0, 0.0]])
+    assert abs(spectral_radius(cycle, tol=1e-10, max_iter=1000) - 1.0) < 1e-8
+    # stopping early still yields an upper bound
+    assert spectral_radius(ones, max_iter=1) >= 3.0
+    assert spectral_radius(CSRMatrix([[0.0, 0.0], [0.0, 0.0]])) == 0.0
+
+
+def test_generated_matrix_is_productive():
+    A, _ = generate_sparse_matrices(60, 3, 0.1, "general", seed=7)
+    rho = spectral_radius(A, tol=1e-8, max_iter=1000)
+    assert rho <= 0.95 + 1e-6
+    assert rho > 0.9
+
+
+@pytest.mark.parametrize("method", ["gmres", "jacobi", "neumann"])
+def test_solvers_reach_residual_tolerance(method):
+    A, _ = generate_sparse_matrices(40, 2, 0.1, "leontief", seed=3)
+    d = [1.0 + (i % 5) for i in range(40)]
+    result = solve_leontief(A, d, method=method, tol=1e-10, max_iter=5000)
+    assert result.converged
+    produced = [xi - ai for xi, ai in zip(result.x, A.matvec(result.x))]
+    assert max(abs(p - di) for p, di in zip(produced, d)) < 1e-8
+
+
+def test_warm_start_reuses_previous_solution():
+    A, _ = generate_sparse_matrices(40, 2, 0.1, "leontief", seed=5)
+    solver = LeontiefSolver(A, method="neumann", tol=1e-8, implicit=False)
+    d = [1.0] * 40
+    cold = solver.solve(d)
+    warm = solver.solve([1.01] * 40)
+    assert warm.converged and warm.iterations < cold.iterations
+    assert solver.solve(d, x0=[0.0] * 40).iterations == cold.iterations
+    with pytest.raises(ValueError):
+        solver.solve([1.0])
+    with pytest.raises(ValueError):
+        LeontiefSolver(A, method="lu")
+
+
+def test_benders_solves_leontief_blocks():
+    from bendersx_engine import BendersConfig
+    from bendersx_engine.algorithm import benders_decomposition
+    from bendersx_engine.executor import SubproblemExecutor
+
+    n, m0 = 30, 3
+    A, B = generate_sparse_matrices(n, m0, 0.1, "leontief", seed=11)
+    total_r = [1.0, 2.0, 0.5]
+    cfg = BendersConfig(verbose=False, leontief_tol=1e-12)
+    _, x, _, _ = benders_decomposition(
+        n, m0, total_r, A, B, cfg, "leontief", blocks_metadata=[("block_0", 0, n)]
+    )
+    # one block receives all of total_r: (I - A) x = B^T r
+    produced = [xi - ai for xi, ai in zip(x, A.matvec(x))]
+    demand = B.rmatvec(total_r)
+    assert max(abs(p - d) for p, d in zip(produced, demand)) < 1e-9
+
+    executor = SubproblemExecutor.from_matrices(A, B, cfg)
+    try:
+        with pytest.raises(ValueError):
+            benders_decomposition(n, m0, total_r, A, B, cfg, "leontief", executor=executor)
+    finally:
+        executor.close()
@@ -0,0 +1,78 @@
+from bendersx_engine.lp import SimplexBackend, make_lp_backend
+
+
+def test_simplex_optimum_and_warm_start():
+    lp = SimplexBackend([3.0, 2.0])
+    lp.add_rows([({0: 1, 1: 1}, "<=", 4), ({0: 1, 1: 3}, "<=", 6), ({0: 1}, "<=", 3)])
+    res = lp.solve()
+    assert res.status == "optimal"
+    assert res.x == [3.0, 1.0] and res.objective == 11.0
+    lp.add_rows([({1: 1}, ">=", 2)])
+    res = lp.solve()
+    assert res.status == "optimal"
+    assert abs(res.objective - 4.0) < 1e-9
+
+
+def test_simplex_equality_and_infeasible():
+    lp = SimplexBackend([1.0, 1.0])
+    lp.add_rows([({0: 1, 1: 1}, "=", 1), ({0: 1, 1: -1}, "=", 0.5)])
+    res = lp.solve()
+    assert res.status == "optimal"
+    assert abs(res.x[0] - 0.75) < 1e-9
+
+    lp = SimplexBackend([1.0])
+    lp.add_rows([({0: 1}, ">=", 3), ({0: 1}, "<=", 2)])
+    assert lp.solve().status == "infeasible"
+
+
+def test_auto_backend_falls_back_to_simplex():
+    import bendersx_engine.env_detection as env
+
+    lp = make_lp_backend("auto", [1.0])
+    if not env.probe_capabilities().highs:
+        assert lp.name == "simplex"
+
+
+def test_simplex_set_rhs_and_remove_rows_match_fresh_model():
+    rows = [({0: 1, 1: 1}, "<=", 4), ({0: 1, 1: 3}, "<=", 6), ({0: 1}, "<=", 3), ({1: 1}, ">=", 0.5)]
+    lp = SimplexBackend([3.0, 2.0])
+    handles = lp.add_rows(rows)
+    assert lp.solve().objective == 11.0
+    lp.set_rhs(handles[2], 1.0)
+    lp.set_rhs(handles[3], 2.0)  # with x0 + 3 x1 <= 6 this forces x0 = 0
+    res = lp.solve()
+    assert res.status == "optimal"
+    assert abs(res.x[0]) < 1e-9 and abs(res.objective - 4.0) < 1e-9
+
+    lp.remove_rows([handles[1], handles[2]])  # only x0 + x1 <= 4 and x1 >= 2 remain
+    assert lp.n_rows == 2
+    res = lp.solve()
+    fresh = SimplexBackend([3.0, 2.0])
+    fresh.add_rows([rows[0], ({1: 1}, ">=", 2.0)])
+    assert res.status == "optimal"
+    assert abs(res.objective - fresh.solve().objective) < 1e-9
+    assert abs(res.x[0] - 2.0) < 1e-9 and abs(res.x[1] - 2.0) < 1e-9
+
+    eq = lp.add_rows([({0: 1, 1: -1}, "=", 1.0)])[0]
+    lp.set_rhs(eq, -0.5)
+    res = lp.solve()
+    assert abs(res.x[0] - 1.75) < 1e-9 and abs(res.objective - 9.75) < 1e-9
+    lp.remove_rows([eq])
+    assert abs(lp.solve().objective - 10.0) < 1e-9
+
+
+def test_simplex_upper_bounds_match_rows():
+    lp = SimplexBackend([3.0, 2.0], upper=[3.0, float("inf")])
+    lp.add_rows([({0: 1, 1: 1}, "<=", 4), ({0: 1, 1: 3}, "<=", 6)])
+    res = lp.solve()
+    assert res.status == "optimal" and abs(res.objective - 11.0) < 1e-9
+    lp.set_upper(0, 1.0)
+    res = lp.solve()
+    fresh = SimplexBackend([3.0, 2.0])
+    fresh.add_rows([({0: 1, 1: 1}, "<=", 4), ({0: 1, 1: 3}, "<=", 6), ({0: 1}, "<=", 1)])
+    assert res.status == "optimal"
+    assert abs(res.objective - fresh.solve().objective) < 1e-9
+    assert abs(res.x[0] - 1.0) < 1e-9
+    lp.set_upper(1, 0.5)
+    res = lp.solve()
+    assert abs(res.x[1] - 0.5) < 1e-9 and abs(res.objective - 4.0) < 1e-9
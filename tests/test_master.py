@@ -36,3 +36,112 @@ def test_min_block_allocations():
     r_vars, _ = solve_master_problem(blocks, m0, total_r, cuts, cfg)
     assert r_vars[0][0] >= 6.0
     assert abs(r_vars[0][0] + r_vars[1][0] - 10.0) < 1e-9
+
+
+def test_master_consumes_cuts_incrementally():
+    from bendersx_engine.master import MasterProblem
+
+    cfg = BendersConfig(verbose=False, master_backend="simplex")
+    blocks = [("b0", 0, 1), ("b1", 1, 2)]
+    master = MasterProblem(1, cfg)
+    r_vars, theta = master.solve(blocks, [10.0], [])
+    assert theta == [cfg.big_m_cap, cfg.big_m_cap]
+    assert r_vars[0][0] == r_vars[1][0] == 5.0
+
+    # b0 gains 1.0 per unit of allocation, b1 is capped at 4.0
+    cuts = [("opt", "b0", [1.0], 0.0), ("opt", "b1", [0.0], 4.0)]
+    r_vars, theta = master.solve(blocks, [10.0], cuts)
+    assert master.status == "optimal"
+    assert master.rebuilds == 1 and master.cut_rows == 2
+    assert abs(r_vars[0][0] - 10.0) < 1e-9
+    assert abs(theta[0] - 10.0) < 1e-9 and abs(theta[1] - 4.0) < 1e-9
+
+    cuts.append(("feas", "b0", [1.0], 7.0))
+    r_vars, theta = master.solve(blocks, [10.0], cuts)
+    assert master.rebuilds == 1 and master.cut_rows == 3
+    assert abs(r_vars[0][0] - 7.0) < 1e-9
+    assert abs(r_vars[0][0] + r_vars[1][0] - 10.0) < 1e-9
+    assert abs(theta[0] - 7.0) < 1e-9
+
+
+def test_default_master_without_highs_moves_with_cuts(monkeypatch):
+    import bendersx_engine.env_detection as env
+    from bendersx_engine.master import MasterProblem
+
+    no_highs = {"highs": False, "highs_version": None, "highs_threading": False}
+    monkeypatch.setattr(env, "_highs_values", no_highs)
+    cfg = BendersConfig(verbose=False)
+    blocks = [("b0", 0, 1), ("b1", 1, 2)]
+    master = MasterProblem(1, cfg)
+    assert master.backend_name == "simplex"
+    r_vars, _ = master.solve(blocks, [10.0], [])
+    assert r_vars[0][0] == r_vars[1][0] == 5.0
+
+    r_vars, theta = master.solve(blocks, [10.0], [("opt", "b0", [1.0], 0.0), ("opt", "b1", [0.0], 4.0)])
+    assert master.status == "optimal"
+    assert abs(r_vars[0][0] - 10.0) < 1e-9 and abs(r_vars[1][0]) < 1e-9
+    assert abs(theta[0] - 10.0) < 1e-9 and abs(theta[1] - 4.0) < 1e-9
+
+
+def test_default_master_without_highs_is_fast_at_moderate_size(monkeypatch):
+    import time
+    import bendersx_engine.env_detection as env
+    from bendersx_engine.master import MasterProblem
+
+    no_highs = {"highs": False, "highs_version": None, "highs_threading": False}
+    monkeypatch.setattr(env, "_highs_values", no_highs)
+    cfg = BendersConfig(verbose=False)
+    m0, nb = 50, 8
+    blocks = [(f"b{b}", b, b + 1) for b in range(nb)]
+    total_r = [1.0 + j % 3 for j in range(m0)]
+    cuts = [
+        ("opt", f"b{b}", [((b + k + j) % 5) / 5.0 for j in range(m0)], 1.0 + k)
+        for b in range(nb)
+        for k in range(4)
+    ]
+    master = MasterProblem(m0, cfg)
+    t0 = time.perf_counter()
+    for i in range(3):
+        r_vars, theta = master.solve(blocks, total_r, cuts[: 8 * (i + 2)])
+    assert time.perf_counter() - t0 < 5.0
+    assert master.status == "optimal"
+    for j in range(m0):
+        assert abs(sum(r[j] for r in r_vars) - total_r[j]) < 1e-6
+    assert all(t < cfg.big_m_cap for t in theta)
+    ref = [total_r[j] / nb for j in range(m0)]
+    assert any(abs(r_vars[0][j] - ref[j]) > 1e-3 for j in range(m0))
+    # theta is the tightest cut at the returned allocation
+    for b in range(nb):
+        bound = min(
+            alpha + sum(c * r for c, r in zip(coeffs, r_vars[b]))
+            for _, bid, coeffs, alpha in cuts
+            if bid == f"b{b}"
+        )
+        assert abs(theta[b] - bound) < 1e-6
+
+
+def test_master_drops_evicted_cuts_and_moves_reference_in_place():
+    from bendersx_engine.master import MasterProblem
+
+    cfg = BendersConfig(verbose=False, master_backend="simplex")
+    blocks = [("b0", 0, 1), ("b1", 1, 2)]
+    master = MasterProblem(1, cfg)
+    cuts = [("opt", "b0", [1.0], 0.0), ("opt", "b1", [0.0], 4.0), ("feas", "b0", [1.0], 7.0)]
+    master.solve(blocks, [10.0], cuts)
+    rows = master.lp.n_rows
+
+    # the feasibility cut is evicted: its row leaves the LP
+    r_vars, _ = master.solve(blocks, [10.0], cuts[:2])
+    assert master.cut_rows_removed == 1 and master.lp.n_rows == rows - 1
+    assert abs(r_vars[0][0] - 10.0) < 1e-9
+
+    # a new demand moves the reference allocation without a rebuild
+    cfg.matrix_gen_params["block_distribution"] = [3.0, 1.0]
+    for total in ([12.0], [6.0]):
+        r_vars, theta = master.solve(blocks, total, cuts)
+        fresh = MasterProblem(1, cfg)
+        r_fresh, theta_fresh = fresh.solve(blocks, total, cuts)
+        assert master.status == fresh.status == "optimal"
+        assert all(abs(a - b) < 1e-9 for a, b in zip(theta, theta_fresh))
+        assert abs(r_vars[0][0] - r_fresh[0][0]) < 1e-9
+    assert master.rebuilds == 1 and master.ref_updates == 2
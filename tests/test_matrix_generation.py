@@ -3,25 +3,25 @@ from bendersx_engine import BendersConfig, PlanwirtschaftParams
 
 
 def test_matrix_shapes():
-    A, B = generate_sparse_matrices(10, 3)
+    A, B = generate_sparse_matrices(10, 3, seed=1)
     assert A.shape[0] == 10
     assert B.shape[0] == 3
 
 
 def test_planwirtschaft_problem_type():
-    A, B = generate_sparse_matrices(5, 2, problem_type="planwirtschaft")
+    A, B = generate_sparse_matrices(5, 2, problem_type="planwirtschaft", seed=2)
     assert A.shape[0] == 5
-    diag_vals = [A.data[i][i] for i in range(5)]
+    diag_vals = [A[i, i] for i in range(5)]
     assert all(v > 0 for v in diag_vals)
 
     # Column sums should remain below one for input-output models
     for j in range(5):
-        col_sum = sum(A.data[i][j] for i in range(5))
+        col_sum = sum(A[i, j] for i in range(5))
         assert col_sum < 0.96
 
     # Each row of B should have at least one non-zero entry
-    for row in B.data:
-        assert any(val != 0 for val in row)
+    for i in range(B.shape[0]):
+        assert any(val != 0 for val in B.getrow(i))
 
 
 def test_planwirtschaft_row_targets_and_limits():
@@ -29,9 +29,9 @@ def test_planwirtschaft_row_targets_and_limits():
         "B_row_targets": {0: {1: 0.5}},
         "A_column_limits": {0: 0.1},
     })
-    A, B = generate_sparse_matrices(3, 2, problem_type="planwirtschaft", config=cfg)
-    assert B.data[0][1] == 0.5
-    col_sum = sum(A.data[i][0] for i in range(3))
+    A, B = generate_sparse_matrices(3, 2, problem_type="planwirtschaft", config=cfg, seed=3)
+    assert B[0, 1] == 0.5
+    col_sum = sum(A[i, 0] for i in range(3))
     assert col_sum <= 0.1 + 1e-9
 
 
@@ -41,19 +41,20 @@ def test_capacity_limits_and_tech_factor():
         "priority_sector_tech_factor": 0.5,
         "sector_capacity_limits": {1: 0.05},
     })
-    A, B = generate_sparse_matrices(4, 3, problem_type="planwirtschaft", config=cfg)
-    row_sum = sum(B.data[1])
+    A, B = generate_sparse_matrices(4, 3, problem_type="planwirtschaft", config=cfg, seed=0)
+    row_sum = sum(B.getrow(1))
     assert row_sum <= 0.05 + 1e-9
-    avg_row0 = sum(A.data[1]) / len(A.data[1])
-    avg_other = sum(A.data[0]) / len(A.data[0])
-    assert avg_row0 <= avg_other
+    # the tech factor caps the priority row at the mean of the other rows
+    avg = [sum(A.getrow(i)) / A.shape[1] for i in range(A.shape[0])]
+    assert avg[1] <= sum(avg[i] for i in (0, 2, 3)) / 3 + 1e-12
+    assert avg[1] <= avg[0]
 
 
 def test_row_total_targets_dataclass():
     params = PlanwirtschaftParams(B_row_total_targets={0: 2.0})
     cfg = BendersConfig(verbose=False, matrix_gen_params=params)
-    A, B = generate_sparse_matrices(3, 1, problem_type="planwirtschaft", config=cfg)
-    assert abs(sum(B.data[0]) - 2.0) < 1e-6
+    A, B = generate_sparse_matrices(3, 1, problem_type="planwirtschaft", config=cfg, seed=4)
+    assert abs(sum(B.getrow(0)) - 2.0) < 1e-6
 
 
 def test_priority_levels_and_seasonal_weights():
@@ -64,8 +65,8 @@ def test_priority_levels_and_seasonal_weights():
         B_row_targets={0: {0: 0.5}},
     )
     cfg = BendersConfig(verbose=False, matrix_gen_params=params)
-    _, B = generate_sparse_matrices(3, 1, problem_type="planwirtschaft", config=cfg)
-    assert abs(B.data[0][0] - 1.2) < 1e-6
+    _, B = generate_sparse_matrices(3, 1, problem_type="planwirtschaft", config=cfg, seed=5)
+    assert abs(B[0, 0] - 1.2) < 1e-6
 
 
 def test_production_and_trade_limits():
@@ -74,9 +75,67 @@ def test_production_and_trade_limits():
         import_export_limits={"import": {0: 0.1}, "export": {0: 0.3}},
     )
     cfg = BendersConfig(verbose=False, matrix_gen_params=params)
-    A, B = generate_sparse_matrices(2, 1, problem_type="planwirtschaft", config=cfg)
-    assert B.data[0][0] <= 0.2 + 1e-9
-    col_sum = sum(A.data[i][0] for i in range(2))
+    A, B = generate_sparse_matrices(2, 1, problem_type="planwirtschaft", config=cfg, seed=6)
+    assert B[0, 0] <= 0.2 + 1e-9
+    col_sum = sum(A[i, 0] for i in range(2))
     assert col_sum <= 0.1 + 1e-9
-    row_sum = sum(B.data[0])
+    row_sum = sum(B.getrow(0))
     assert row_sum <= 0.3 + 1e-9
+
+
+def test_generated_matrices_are_sparse():
+    A, B = generate_sparse_matrices(50, 4, sparsity=0.02, problem_type="leontief", seed=7)
+    assert len(A.indptr) == 51
+    assert A.nnz == len(A.indices) <= 50 + 50 * 50 * 0.2
+    assert all(A[i, i] > 0 for i in range(50))
+
+
+def test_seed_makes_generation_reproducible():
+    A1, B1 = generate_sparse_matrices(30, 4, sparsity=0.1, problem_type="planwirtschaft", seed=7)
+    A2, B2 = generate_sparse_matrices(30, 4, sparsity=0.1, problem_type="planwirtschaft", seed=7)
+    assert list(A1.data) == list(A2.data) and list(A1.indices) == list(A2.indices)
+    assert list(B1.data) == list(B2.data) and list(B1.indptr) == list(B2.indptr)
+    A3, _ = generate_sparse_matrices(30, 4, sparsity=0.1, seed=8)
+    assert list(A3.data) != list(A1.data)
+
+
+def test_large_generation_scales_with_nnz():
+    n = 20000
+    A, B = generate_sparse_matrices(n, 2, sparsity=1e-4, problem_type="leontief", seed=1)
+    assert A.shape == (n, n)
+    # diagonal plus roughly two off-diagonal entries per row
+    assert n <= A.nnz < 4 * n
+    for i in (0, n // 2, n - 1):
+        cols = [j for j, _ in A.row_items(i)]
+        assert cols == sorted(cols)
+
+
+def test_row_fixes_are_batched(monkeypatch):
+    from bendersx_engine.matrix_generation import _apply_planwirtschaft_modifiers
+    from bendersx_engine.simple_matrix import CSRMatrix
+
+    calls = {"scale_rows": 0, "set_rows": 0}
+    for name in calls:
+        orig = getattr(CSRMatrix, name)
+
+        def counted(self, *args, _orig=orig, _name=name):
+            calls[_name] += 1
+            return _orig(self, *args)
+
+        monkeypatch.setattr(CSRMatrix, name, counted)
+
+    m0, n = 200, 10
+    A = CSRMatrix([[0.1] * n for _ in range(n)])
+    B = CSRMatrix.from_rows([[(0, 1.0)] if i % 2 else [] for i in range(m0)], (m0, n))
+    params = {
+        "B_row_targets": {i: {1: 0.5} for i in range(0, m0, 3)},
+        "B_row_total_targets": {i: 2.0 for i in range(m0)},
+        "priority_sectors": list(range(0, m0, 5)),
+        "priority_sector_demand_factor": 1.5,
+    }
+    _apply_planwirtschaft_modifiers(A, B, params)
+    # one rebuild and one scaling pass for the row fixes, one more for priorities
+    assert calls == {"scale_rows": 2, "set_rows": 1}
+    sums = B.row_sums()
+    assert all(B.row_nnz(i) > 0 for i in range(m0))
+    assert abs(sums[1] - 2.0) < 1e-9 and abs(sums[5] - 3.0) < 1e-9
@@ -0,0 +1,66 @@
+import pytest
+
+from bendersx_engine import BendersConfig, kernels
+from bendersx_engine.config import SubproblemSettings
+from bendersx_engine.objective import PlanwirtschaftObjective, TierTable, compile_objective
+
+
+def test_tier_table_matches_sequential_tiers():
+    table = TierTable.from_tiers([(1.0, 1.0), (2.0, 2.0)])
+    assert table.cost(0.0) == 0.0
+    assert table.cost(0.5) == 0.5
+    assert table.cost(1.5) == 2.0
+    assert table.cost(3.0) == 5.0
+
+
+def test_compiled_objective_terms():
+    cfg = BendersConfig(
+        verbose=False,
+        matrix_gen_params={
+            "planwirtschaft_objective": True,
+            "underproduction_penalties": [2.0, 1.0],
+            "overproduction_penalty": 0.5,
+            "production_bonus": 0.1,
+            "priority_sectors": [1],
+            "priority_sector_bonus_factor": 2.0,
+            "co2_penalties": {0: 0.25},
+            "inventory_cost": 0.5,
+        },
+    )
+    model = PlanwirtschaftObjective.compile(SubproblemSettings.from_config(cfg), 2)
+    # row 0 under-produces by 1, row 1 over-produces by 1
+    value = model.evaluate([1.0, 3.0], [2.0, 2.0])
+    row0 = 1.0 + 0.1 * 1.0 - 2.0 * 1.0 - 0.25 * 1.0
+    row1 = 3.0 + 0.2 * 2.0 - (0.5 + 0.5) * 1.0
+    assert abs(value - (row0 + row1)) < 1e-12
+
+
+def test_compile_objective_cached():
+    settings = SubproblemSettings(planwirtschaft_objective=True)
+    assert compile_objective(settings, 3) is compile_objective(settings, 3)
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+def test_evaluate_many_matches_evaluate(monkeypatch, compiled):
+    if compiled:
+        monkeypatch.setattr(kernels, "_jit_requested", True)
+        monkeypatch.setattr(kernels, "_jit_available", True)
+        monkeypatch.setattr(kernels, "_compiled", dict(kernels._SOURCES))
+    else:
+        monkeypatch.setattr(kernels, "_jit_requested", False)
+    settings = SubproblemSettings(
+        planwirtschaft_objective=True,
+        production_bonus=0.1,
+        priority_sectors=frozenset({2}),
+        tiered_underproduction_penalties=((1.0, 1.0), (2.0, 3.0)),
+        overproduction_penalties=(0.5, 0.25, 1.0),
+        inventory_cost=0.1,
+    )
+    model = PlanwirtschaftObjective.compile(settings, 3)
+    produced = [[1.0, 3.0, 0.0], [2.0, 2.0, 2.0], [0.0, 5.0, 4.5]]
+    planned = [[2.0, 2.0, 4.0], [2.0, 1.0, 3.0], [3.5, 0.0, 4.0]]
+    batch = model.evaluate_many(produced, planned)
+    assert len(batch) == 3
+    for value, p, r in zip(batch, produced, planned):
+        assert abs(value - model.evaluate(p, r)) < 1e-12
+    assert model.evaluate_many([], []) == []
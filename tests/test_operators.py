@@ -0,0 +1,65 @@
+from bendersx_engine.operators import (
+    DiagonalOperator,
+    IdentityOperator,
+    aslinearoperator,
+    leontief_operator,
+)
+from bendersx_engine.optimizations import create_identity_optimized
+from bendersx_engine.simple_matrix import CSRMatrix, as_csr
+
+
+def test_identity_and_diagonal_are_implicit():
+    I = create_identity_optimized(4, format="operator")
+    assert isinstance(I, IdentityOperator)
+    assert I.matvec([1.0, 2.0, 3.0, 4.0]) == [1.0, 2.0, 3.0, 4.0]
+    assert (2 * I).matvec([1.0, 2.0, 3.0, 4.0]) == [2.0, 4.0, 6.0, 8.0]
+    D = DiagonalOperator([1.0, 0.0, 3.0, 4.0])
+    assert D.rmatvec([1.0, 1.0, 1.0, 1.0]) == [1.0, 0.0, 3.0, 4.0]
+    assert (I + D).diagonal() == [2.0, 1.0, 4.0, 5.0]
+    assert as_csr(I - D).nnz == 3
+
+
+def test_leontief_operator_matches_assembled_matrix():
+    A = CSRMatrix([[0.1, 0.2, 0.0], [0.0, 0.3, 0.4], [0.5, 0.0, 0.0]])
+    op = leontief_operator(A)
+    dense = [[1.0 - 0.1, -0.2, 0.0], [0.0, 1.0 - 0.3, -0.4], [-0.5, 0.0, 1.0]]
+    assert op.to_csr().toarray() == dense
+    x = [1.0, 2.0, 3.0]
+    assert op.matvec(x) == leontief_operator(A, implicit=False).matvec(x)
+    assert all(abs(a - b) < 1e-12 for a, b in zip(op.rmatvec(x), as_csr(dense).rmatvec(x)))
+    assert op.diagonal() == [0.9, 0.7, 1.0]
+    # nested sums stay flat and shapes are checked
+    assert len((op + IdentityOperator(3)).terms) == 3
+    try:
+        op + aslinearoperator(CSRMatrix([[1.0]]))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("shape mismatch not detected")
+
+
+def test_leontief_subproblems_keep_i_minus_a_implicit():
+    from bendersx_engine import BendersConfig
+    from bendersx_engine.algorithm import benders_decomposition
+    from bendersx_engine.executor import SubproblemExecutor
+    from bendersx_engine.matrix_generation import generate_sparse_matrices
+    from bendersx_engine.operators import MatrixOperator, SumOperator
+
+    n, m0 = 12, 2
+    A, B = generate_sparse_matrices(n, m0, 0.2, "leontief", seed=4)
+    blocks = [("block_0", 0, 6), ("block_1", 6, n)]
+    for implicit, kind in ((True, SumOperator), (False, MatrixOperator)):
+        cfg = BendersConfig(verbose=False, use_identity_fast=implicit)
+        executor = SubproblemExecutor.from_matrices(A, B, cfg, "leontief")
+        try:
+            benders_decomposition(
+                n, m0, [1.0, 1.0], A, B, cfg, "leontief", executor=executor, blocks_metadata=blocks
+            )
+            solvers = executor._state["leontief"]
+            ops = [solvers.get(start, end).operator for _, start, end in blocks]
+        finally:
+            executor.close()
+        assert len(solvers) == 2
+        assert all(isinstance(op, kind) for op in ops)
+        if implicit:
+            assert all(isinstance(op.terms[0][1], IdentityOperator) for op in ops)
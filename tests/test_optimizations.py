@@ -1,7 +1,62 @@
 import numpy as np
-from bendersx_engine.optimizations import create_identity_optimized
+import pytest
+from bendersx_engine.optimizations import create_identity_optimized, sparse_matvec_optimized
+from bendersx_engine.simple_matrix import CSRMatrix
 
 
 def test_identity():
     I = create_identity_optimized(3)
     assert I.shape == (3, 3)
+
+
+def test_sparse_matvec_on_csr():
+    A = CSRMatrix([[1.0, 0.0, 2.0], [0.0, 3.0, 0.0]])
+    assert A.nnz == 3
+    assert sparse_matvec_optimized(A.data, A.indices, A.indptr, [1.0, 1.0, 1.0]) == [3.0, 3.0]
+    assert A.matvec([1.0, 2.0, 3.0]) == [7.0, 6.0]
+    assert A.rmatvec([1.0, 1.0]) == [1.0, 3.0, 2.0]
+
+
+def test_csr_setdiag_and_access():
+    A = CSRMatrix([[0.0, 1.0], [2.0, 0.0]])
+    A.setdiag([5.0, 6.0])
+    assert A.toarray() == [[5.0, 1.0], [2.0, 6.0]]
+    A[0, 1] = 0.0
+    assert A.getcol(1) == [0.0, 6.0]
+    assert A.row_sums(0, 1) == [5.0, 2.0]
+    assert A.column_slice(1, 2).toarray() == [[0.0], [6.0]]
+
+
+def test_csr_tuple_of_rows_is_dense_input():
+    A = CSRMatrix(((1.0, 0.0), (0.0, 2.0), (3.0, 0.0)))
+    assert A.shape == (3, 2)
+    assert A.toarray() == [[1.0, 0.0], [0.0, 2.0], [3.0, 0.0]]
+
+
+def test_csr_edits_on_view_buffers():
+    from array import array
+
+    A = CSRMatrix([[1.0, 0.0, 2.0], [0.0, 3.0, 0.0]])
+    raw = [bytes(memoryview(buf)) for buf in (A.data, A.indices, A.indptr)]
+    frozen = CSRMatrix.from_buffers(
+        memoryview(raw[0]).cast("d"), memoryview(raw[1]).cast("i"),
+        memoryview(raw[2]).cast("i"), A.shape,
+    )
+    with pytest.raises(ValueError):
+        frozen[0, 0] = 5.0
+    with pytest.raises(ValueError):
+        frozen.scale_rows([2.0, 1.0])
+    # structural edits copy the views into private arrays
+    frozen[1, 0] = 4.0
+    frozen.set_row(0, [1], [7.0])
+    assert isinstance(frozen.data, array)
+    assert frozen.toarray() == [[0.0, 7.0, 0.0], [4.0, 3.0, 0.0]]
+    frozen[1, 1] = 1.0
+    assert frozen.row_sums() == [7.0, 5.0]
+
+
+def test_csr_set_rows_rebuilds_once():
+    A = CSRMatrix([[1.0, 0.0, 2.0], [0.0, 3.0, 0.0], [0.0, 0.0, 0.0], [4.0, 0.0, 5.0]])
+    A.set_rows({3: [(1, 6.0), (1, 7.0)], 0: [], 2: [(2, 8.0), (0, 0.0)]})
+    assert A.toarray() == [[0.0, 0.0, 0.0], [0.0, 3.0, 0.0], [0.0, 0.0, 8.0], [0.0, 7.0, 0.0]]
+    assert list(A.indptr) == [0, 0, 1, 2, 3]
@@ -1,7 +1,65 @@
-from bendersx_engine.partitioning import repartition_blocks
+def test_uniform_blocks_cover_columns():
+    from bendersx_engine.partitioning import uniform_blocks
 
+    blocks = uniform_blocks(10, 3)
+    assert [b[1:] for b in blocks] == [(0, 3), (3, 6), (6, 10)]
+    assert uniform_blocks(2, 5) == [("block_0", 0, 1), ("block_1", 1, 2)]
 
-def test_partitioning_simple():
-    blocks = [("b", 0, 10)]
-    new = repartition_blocks(blocks, {"b": 2.0}, 5)
-    assert len(new) == 2
+
+def test_balanced_blocks_follow_cost():
+    from bendersx_engine.partitioning import balanced_blocks
+
+    costs = [10.0] + [1.0] * 10
+    blocks = balanced_blocks(costs, 2)
+    assert blocks == [("block_0", 0, 1), ("block_1", 1, 11)]
+    assert len(balanced_blocks([1.0] * 3, 8)) == 3
+
+
+def test_column_costs_count_nnz():
+    import scipy.sparse as sp
+    from bendersx_engine.partitioning import column_costs
+
+    A = sp.identity(3, format="csr")
+    B = sp.csr_matrix([[1.0, 1.0, 0.0]])
+    assert column_costs(A, B) == [3.0, 3.0, 2.0]
+
+
+def test_cost_partitioner_splits_slow_and_merges_fast_blocks():
+    from bendersx_engine.partitioning import CostPartitioner
+
+    part = CostPartitioner([1.0] * 40, n_workers=4, tolerance=0.25)
+    blocks = part.initial()
+    assert [(s, e) for _, s, e in blocks] == [(0, 10), (10, 20), (20, 30), (30, 40)]
+    # nothing measured yet: keep the partition
+    assert part.rebalance(blocks) is blocks
+
+    times = {blocks[0][0]: 4.0, blocks[1][0]: 0.5, blocks[2][0]: 0.5, blocks[3][0]: 1.0}
+    new = part.rebalance(blocks, times)
+    assert new[0][1] == 0 and new[-1][2] == 40
+    assert all(a[2] == b[1] for a, b in zip(new, new[1:]))
+    assert part.splits >= 1 and part.merges >= 1
+    assert part.imbalance(new) < part.imbalance(blocks)
+    # balanced partitions are left alone
+    assert part.rebalance(new) is new or part.imbalance(new) > 1.25
+
+
+def test_split_blocks_stay_unmeasured_until_timed():
+    from bendersx_engine.partitioning import BlockCostModel, CostPartitioner
+
+    model = BlockCostModel([1.0] * 10)
+    model.observe(0, 10, 5.0)
+    mid = model.split(0, 10)
+    assert not model.measured(0, mid) and not model.measured(mid, 10)
+    assert model.cost(0, mid) + model.cost(mid, 10) == 5.0
+    model.observe(0, mid, 1.0)
+    assert model.measured(0, mid) and model.cost(0, mid) == 1.0
+
+    part = CostPartitioner([1.0] * 40, n_workers=4, tolerance=0.25)
+    blocks = part.initial()
+    times = {blocks[0][0]: 8.0, blocks[1][0]: 1.0, blocks[2][0]: 1.0, blocks[3][0]: 1.0}
+    new = part.rebalance(blocks, times)
+    splits = part.splits
+    assert splits >= 1
+    # the split blocks have no timings of their own yet: no further splits
+    assert part.rebalance(new) is new
+    assert part.splits == splits
@@ -0,0 +1,70 @@
+import multiprocessing as mp
+
+import pytest
+
+from bendersx_engine import BendersConfig, PlanwirtschaftParams
+from bendersx_engine.algorithm import benders_decomposition
+from bendersx_engine.executor import SubproblemExecutor
+from bendersx_engine.matrix_generation import generate_sparse_matrices
+from bendersx_engine.problem_io import load_problem, save_problem
+from bendersx_engine.shared_memory import csr_from_shared, release_shared
+
+
+def _nnz_in_worker(meta):
+    A = csr_from_shared(meta)
+    try:
+        return type(A.data).__name__, A.nnz, A.row_sums()
+    finally:
+        release_shared(meta)
+
+
+def test_save_load_roundtrip(tmp_path):
+    A, B = generate_sparse_matrices(12, 3, 0.2, "leontief", seed=3)
+    params = PlanwirtschaftParams(priority_sectors=[1], A_column_limits={0: 0.5})
+    blocks = [("block_0", 0, 6), ("block_1", 6, 12)]
+    path = tmp_path / "problem.bxp"
+    save_problem(str(path), A, B, [1.0, 2.0, 3.0], blocks, params)
+
+    with load_problem(str(path)) as prob:
+        assert isinstance(prob.A.data, memoryview)
+        assert (prob.n, prob.m0) == (12, 3)
+        assert prob.A.toarray() == A.toarray()
+        assert prob.B.toarray() == B.toarray()
+        assert prob.total_r == [1.0, 2.0, 3.0]
+        assert prob.blocks_metadata == blocks
+        assert prob.params == params
+        with pytest.raises(TypeError):
+            prob.A.data[0] = 1.0
+
+
+def test_load_rejects_foreign_files(tmp_path):
+    path = tmp_path / "junk.bxp"
+    path.write_bytes(b"not a problem file at all")
+    with pytest.raises(ValueError):
+        load_problem(str(path))
+
+
+def test_workers_map_problem_file(tmp_path):
+    A, B = generate_sparse_matrices(8, 2, 0.3, seed=5)
+    path = tmp_path / "problem.bxp"
+    save_problem(str(path), A, B, [1.0, 1.0])
+    with load_problem(str(path)) as prob:
+        with mp.get_context("spawn").Pool(1) as pool:
+            kind, nnz, sums = pool.apply(_nnz_in_worker, (prob.A_meta,))
+        assert kind == "memoryview"
+        assert nnz == A.nnz
+        assert all(abs(a - b) < 1e-12 for a, b in zip(sums, A.row_sums()))
+
+
+def test_solve_from_loaded_problem(tmp_path):
+    cfg = BendersConfig(verbose=False, use_parallel_subproblems=False)
+    A, B = generate_sparse_matrices(6, 2, 0.3, seed=11)
+    path = tmp_path / "problem.bxp"
+    save_problem(str(path), A, B, [1.0, 1.0])
+    expected = benders_decomposition(6, 2, [1.0, 1.0], A, B, cfg)[0]
+    with load_problem(str(path)) as prob:
+        with SubproblemExecutor.from_problem(prob, cfg) as ex:
+            obj = benders_decomposition(
+                prob.n, prob.m0, prob.total_r, prob.A, prob.B, cfg, executor=ex
+            )[0]
+    assert abs(obj - expected) < 1e-9
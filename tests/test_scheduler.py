@@ -0,0 +1,57 @@
+from bendersx_engine.scheduler import TaskScheduler
+
+
+def _task(block_id, start, end):
+    return (block_id, start, end, [1.0])
+
+
+def test_lpt_order_uses_measured_times():
+    sched = TaskScheduler(2)
+    tasks = [_task("a", 0, 10), _task("b", 10, 12), _task("c", 12, 40)]
+    # before any measurement larger blocks go first
+    assert sched.order(tasks) == [2, 0, 1]
+    sched.record("a", 0.1, 10)
+    sched.record("b", 0.9, 2)
+    sched.record("c", 0.2, 28)
+    assert sched.order(tasks) == [1, 2, 0]
+    # unseen blocks are estimated from the time per column
+    assert sched.estimate(_task("d", 0, 5)) > 0
+
+
+def test_assign_balances_and_pins():
+    sched = TaskScheduler(2, pin_tolerance=0.1)
+    tasks = [_task(b, 0, 1) for b in "abcd"]
+    for b, t in zip("abcd", (4.0, 3.0, 2.0, 1.0)):
+        sched.record(b, t)
+    plan = sched.assign(tasks)
+    loads = [sum((4.0, 3.0, 2.0, 1.0)[i] for i in idxs) for idxs in plan]
+    assert loads == [5.0, 5.0]
+    # the same blocks land on the same workers next time
+    assert sched.assign(tasks) == plan
+    # a pinned block moves when keeping it would overload its worker
+    sched.record("d", 6.0)
+    sched.record("d", 6.0)
+    new = sched.assign(tasks)
+    assert max(sum(sched.expected[tasks[i][0]] for i in idxs) for idxs in new) < 8.0
+
+
+def test_chunksize_grows_for_tiny_tasks():
+    sched = TaskScheduler(2)
+    tasks = [_task(f"b{i}", i, i + 1) for i in range(100)]
+    assert sched.chunksize(tasks) == 1
+    for t in tasks:
+        sched.record(t[0], 1e-6, 1)
+    assert sched.chunksize(tasks) > 1
+    for t in tasks:
+        sched.record(t[0], 1.0, 1)
+        sched.record(t[0], 1.0, 1)
+    assert sched.chunksize(tasks) == 1
+
+
+def test_batch_stats():
+    sched = TaskScheduler(2)
+    sched.record_batch(1.0, {1: 1.0, 2: 0.5}, 4)
+    stats = sched.stats()
+    assert stats["makespan"] == 1.0
+    assert stats["worker_utilization"] == 0.75
+    assert sched.stats(since=1)["makespan"] == 0.0
@@ -1,15 +1,45 @@
+import multiprocessing as mp
+import os
+
 import numpy as np
 import scipy.sparse as sp
 from bendersx_engine.shared_memory import (
     csr_to_shared,
     csr_from_shared,
     cleanup_shared_memory,
+    release_shared,
 )
 
 
+def _row_sums_in_worker(meta):
+    A = csr_from_shared(meta)
+    return type(A.data).__name__, A.row_sums()
+
+
 def test_shared_roundtrip():
     A = sp.identity(4, format="csr")
     meta = csr_to_shared("test", A)
     B = csr_from_shared(meta)
     cleanup_shared_memory()
     assert (A != B).nnz == 0
+
+
+def test_shared_across_processes():
+    A = sp.csr_matrix([[1.0, 0.0, 2.0], [0.0, 3.0, 0.0]])
+    meta = csr_to_shared("A", A)
+    with mp.get_context("spawn").Pool(1) as pool:
+        kind, sums = pool.apply(_row_sums_in_worker, (meta,))
+    cleanup_shared_memory()
+    assert kind == "memoryview"
+    assert sums == [3.0, 3.0]
+
+
+def test_release_unlinks_segment():
+    meta = csr_to_shared("A", sp.identity(3, format="csr"))
+    path = os.path.join("/dev/shm", meta["shm_name"].lstrip("/"))
+    csr_from_shared(meta)
+    release_shared(meta)
+    if os.path.isdir("/dev/shm"):
+        assert os.path.exists(path)
+    release_shared(meta)
+    assert not os.path.exists(path)
@@ -0,0 +1,68 @@
+import scipy.sparse as sp
+
+from bendersx_engine import BendersConfig
+from bendersx_engine.algorithm import benders_decomposition
+from bendersx_engine.simple_matrix import CSRMatrix
+from bendersx_engine.structural import (
+    boundary_crossings,
+    connected_components,
+    reverse_cuthill_mckee,
+    structural_partition,
+    symmetric_adjacency,
+)
+
+
+def _two_chains():
+    # sectors 0,2,4 and 1,3,5 form two interleaved chains
+    rows = [[] for _ in range(6)]
+    for a, b in ((0, 2), (2, 4), (1, 3), (3, 5)):
+        rows[a].append((b, 0.1))
+    for i in range(6):
+        rows[i].append((i, 0.5))
+        rows[i].sort()
+    return CSRMatrix.from_rows(rows, (6, 6))
+
+
+def test_components_and_rcm():
+    adj = symmetric_adjacency(_two_chains())
+    comps = connected_components(adj)
+    assert sorted(map(sorted, comps)) == [[0, 2, 4], [1, 3, 5]]
+    order = reverse_cuthill_mckee(adj, comps[0])
+    assert sorted(order) == sorted(comps[0])
+    # a chain is ordered end to end: every edge joins neighbouring positions
+    pos = {u: p for p, u in enumerate(order)}
+    assert all(abs(pos[u] - pos[v]) == 1 for u in order for v in adj[u])
+
+
+def test_partition_separates_components():
+    part = structural_partition(_two_chains(), 2)
+    assert part.n_components == 2
+    assert part.edge_cut == 0
+    assert [b[1:] for b in part.blocks_metadata] == [(0, 3), (3, 6)]
+    assert sorted(part.perm) == list(range(6))
+    cross = boundary_crossings(part.perm, symmetric_adjacency(_two_chains()))
+    assert cross[3] == 0
+    assert part.to_original([float(i) for i in range(6)])[part.perm[4]] == 4.0
+
+
+def test_permuted_matrix():
+    M = CSRMatrix([[1.0, 2.0, 0.0], [0.0, 3.0, 4.0], [5.0, 0.0, 6.0]])
+    P = M.permuted([2, 0, 1], [2, 0, 1])
+    dense = M.toarray()
+    assert P.toarray() == [[dense[r][c] for c in (2, 0, 1)] for r in (2, 0, 1)]
+    assert M.permuted(None, [1, 0, 2]).toarray()[0] == [2.0, 1.0, 0.0]
+
+
+def test_driver_maps_solution_back():
+    A = _two_chains()
+    B = sp.csr_matrix([[1.0, 2.0, 3.0, 4.0, 5.0, 6.0]])
+    cfg = BendersConfig(verbose=False, structural_partitioning=True, n_processes=2)
+    obj, x, _, info = benders_decomposition(6, 1, [1.0], A, B, cfg)
+    assert info["edge_cut"] == 0 and info["components"] == 2
+    assert len(x) == 6
+    assert abs(sum(x) - obj) < 1e-9
+    part = structural_partition(A, 2)
+    # every block assigns one value to all of its sectors, now in original order
+    for _, start, end in part.blocks_metadata:
+        vals = {x[part.perm[p]] for p in range(start, end)}
+        assert len(vals) == 1
@@ -224,3 +224,30 @@ def test_inventory_cost():
     cleanup_shared_memory()
 
     assert obj_inv < obj_base
+
+
+def test_batched_blocks_match_single_solves(monkeypatch):
+    from bendersx_engine.config import SubproblemSettings
+    from bendersx_engine.objective import PlanwirtschaftObjective
+    from bendersx_engine.simple_matrix import CSRMatrix
+    from bendersx_engine.subproblem import SubproblemInput, solve_subproblem, solve_subproblems
+
+    settings = SubproblemSettings(
+        planwirtschaft_objective=True, underproduction_penalty=2.0, production_bonus=0.1
+    )
+    A = CSRMatrix.identity(4)
+    B = CSRMatrix([[1.0, 0.0, 2.0, 1.0], [0.0, 3.0, 1.0, 0.0]])
+    inps = [
+        SubproblemInput("b0", 0, 2, {}, {}, (), (), [1.0, 4.0], settings),
+        SubproblemInput("b1", 2, 4, {}, {}, (), (), [3.0, 0.5], settings),
+    ]
+    single = [solve_subproblem(inp, A, B) for inp in inps]
+    calls = []
+    evaluate_many = PlanwirtschaftObjective.evaluate_many
+    monkeypatch.setattr(
+        PlanwirtschaftObjective, "evaluate_many",
+        lambda self, p, r: calls.append(len(p)) or evaluate_many(self, p, r),
+    )
+    seconds = []
+    assert solve_subproblems(inps, A, B, seconds=seconds) == single
+    assert calls == [2] and len(seconds) == 2
@@ -0,0 +1,51 @@
+import numpy as np
+import scipy.sparse as sp
+from bendersx_engine import BendersConfig
+from bendersx_engine.algorithm import benders_decomposition
+from bendersx_engine.subproblem_cache import SubproblemCache
+
+
+def test_cache_quantized_keys_and_lru():
+    cache = SubproblemCache(max_size=2, tolerance=1e-3)
+    k1 = cache.key("b0", 0, 2, [1.0, 2.0])
+    assert cache.key("b0", 0, 2, [1.0001, 2.0]) == k1
+    assert cache.key("b0", 0, 3, [1.0, 2.0]) != k1
+    cache.put(k1, "r1")
+    cache.put(cache.key("b1", 2, 4, [1.0]), "r2")
+    assert cache.get(k1) == "r1"
+    cache.put(cache.key("b2", 4, 6, [1.0]), "r3")
+    assert cache.get(cache.key("b1", 2, 4, [1.0])) is None
+    assert cache.hits == 1 and cache.misses == 1
+    assert cache.hit_rate == 0.5
+
+
+def test_cache_zero_tolerance_uses_exact_keys():
+    import pytest
+
+    cache = SubproblemCache(tolerance=0.0)
+    k1 = cache.key("b0", 0, 2, [1.0, 2.0])
+    assert cache.key("b0", 0, 2, [1.0, 2.0]) == k1
+    assert cache.key("b0", 0, 2, [1.0 + 1e-12, 2.0]) != k1
+    with pytest.raises(ValueError):
+        BendersConfig(verbose=False, subproblem_cache_tolerance=-1e-9)
+
+    cfg = BendersConfig(
+        verbose=False,
+        subproblem_cache_tolerance=0.0,
+        max_iterations_per_phase=3,
+        convergence_tolerance=-1.0,
+    )
+    A = sp.identity(4, format="csr")
+    B = sp.csr_matrix(np.ones((1, 4)))
+    _, _, _, info = benders_decomposition(4, 1, [1.0], A, B, cfg)
+    assert info["cache_hits"] == 2
+
+
+def test_driver_reports_cache_hits():
+    cfg = BendersConfig(verbose=False, max_iterations_per_phase=3, convergence_tolerance=-1.0)
+    n, m0 = 4, 1
+    A = sp.identity(n, format="csr")
+    B = sp.csr_matrix(np.ones((m0, n)))
+    _, _, _, info = benders_decomposition(n, m0, [1.0], A, B, cfg)
+    assert info["cache_hits"] == 2
+    assert info["cache_hit_rate"] > 0.5